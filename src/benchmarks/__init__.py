@@ -0,0 +1 @@
+# Ce fichier marque le dossier comme un package Python
\ No newline at end of file
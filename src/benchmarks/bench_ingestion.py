@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmark de l'ingestion VTT (parsing + nettoyage des transcriptions).
+
+Compare l'ancien parser (regex non compilées, ligne par ligne, trois passes de nettoyage)
+au tokenizer actuel en une passe, sur le fichier VTT fourni dans data/input (≈ 4 700 lignes).
+
+Lancer depuis src/ :
+    python -m benchmarks.bench_ingestion [--repeat 50] [--file chemin.vtt]
+"""
+
+import argparse
+import re
+import timeit
+from pathlib import Path
+from typing import List
+
+from core.ingestion_pipeline import parse_vtt, IncrementalCaptionParser
+
+# Fichier de référence fourni avec le dépôt
+DEFAULT_VTT = next((Path(__file__).resolve().parents[2] / "data" / "input").glob("*.vtt"), None)
+
+# =============================================
+# IMPLÉMENTATION DE RÉFÉRENCE (Parser v2, avant optimisation)
+# =============================================
+
+def legacy_clean_transcript(text: str) -> List[str]:
+    """Nettoyage d'origine : trois passes regex sur tout le texte."""
+    text = re.sub(r'\[.*?\]', '', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    sentences = re.split(r'(?<=[.?!;])\s+', text)
+    return [s.strip() for s in sentences if s.strip()]
+
+def legacy_parse_vtt(vtt_content: str) -> List[str]:
+    """Parser d'origine : re.match / re.sub non compilés sur chaque ligne."""
+    dialogue_lines = []
+    last_line_added = ""
+    in_header = True
+    for line in vtt_content.splitlines():
+        if line.startswith("WEBVTT") or line.startswith("Kind:") or line.startswith("Language:"):
+            continue
+        if not line.strip():
+            in_header = False
+            continue
+        if in_header:
+            continue
+        if re.match(r'\d{2}:\d{2}:\d{2}\.\d{3}', line.strip()):
+            continue
+        cleaned_line = re.sub(r'<[^>]+>', '', line).strip()
+        if cleaned_line and cleaned_line != last_line_added:
+            dialogue_lines.append(cleaned_line)
+            last_line_added = cleaned_line
+    return legacy_clean_transcript(" ".join(dialogue_lines))
+
+# =============================================
+# BENCHMARK
+# =============================================
+
+def incremental_parse(vtt_content: str) -> List[str]:
+    """Parsing du mode live (avec horodatages), en un seul morceau."""
+    parser = IncrementalCaptionParser()
+    sentences = parser.feed(vtt_content) + parser.flush()
+    return [s["text"] for s in sentences]
+
+def run(file_path: Path, repeat: int) -> None:
+    """
+    Mesure le temps moyen de chaque implémentation et vérifie qu'elles donnent le même résultat.
+
+    Args:
+        file_path: Fichier VTT à parser
+        repeat: Nombre de répétitions par implémentation
+    """
+    content = file_path.read_text(encoding="utf-8")
+    print(f"Fichier : {file_path.name} ({len(content.splitlines())} lignes, {len(content) / 1024:.0f} Ko)")
+
+    reference = legacy_parse_vtt(content)
+    candidates = {
+        "legacy_parse_vtt": legacy_parse_vtt,
+        "parse_vtt": parse_vtt,
+        "IncrementalCaptionParser": incremental_parse,
+    }
+    baseline = None
+    for name, func in candidates.items():
+        same = func(content) == reference
+        elapsed_ms = timeit.timeit(lambda: func(content), number=repeat) / repeat * 1000
+        baseline = baseline or elapsed_ms
+        print(f"{name:<26} {elapsed_ms:8.2f} ms  x{baseline / elapsed_ms:5.1f}  {'identique' if same else 'DIFFÉRENT'}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de l'ingestion VTT")
+    parser.add_argument("--file", type=Path, default=DEFAULT_VTT, help="Fichier VTT à parser")
+    parser.add_argument("--repeat", type=int, default=50, help="Nombre de répétitions")
+    args = parser.parse_args()
+    run(args.file, args.repeat)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark du retard de la boucle d'événements pendant les sauvegardes de résultats.
+
+Une tâche "sonde" se réveille toutes les millisecondes et mesure son retard : c'est le temps
+pendant lequel les coroutines d'appel API en cours n'auraient pas pu avancer. Pendant ce temps,
+on sauvegarde plusieurs fois un gros fichier de résultats et on journalise dans un fichier :
+- "synchrone" : `json.dump` et `FileHandler` appelés directement dans la boucle (ancien code) ;
+- "arrière-plan" : `BackgroundWriter` et `QueueHandler` (voir core/background_io.py).
+
+Lancer depuis src/ :
+    python -m benchmarks.bench_io_lag [--results 2000] [--saves 10]
+"""
+
+import json
+import time
+import queue
+import asyncio
+import argparse
+import logging
+import logging.handlers
+import statistics
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List
+
+from core.background_io import BackgroundWriter, write_json_atomic
+
+PROBE_INTERVAL = 0.001
+
+# =============================================
+# DONNÉES ET SONDE
+# =============================================
+
+def make_results(count: int) -> List[Dict[str, Any]]:
+    """Résultats factices de la taille d'une longue session (analyse de ~2 Ko chacun)."""
+    analyse = "Analyse détaillée de l'affirmation, sources et raisonnement. " * 32
+    return [
+        {"status": "success", "affirmation": f"Affirmation numéro {i}", "result": {
+            "category": "Fait vérifiable", "analyse": analyse, "start": i * 4.0, "end": i * 4.0 + 3.5
+        }}
+        for i in range(count)
+    ]
+
+async def probe(lags: List[float], stop: asyncio.Event) -> None:
+    """Mesure le retard de chaque réveil par rapport à l'intervalle demandé."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(PROBE_INTERVAL)
+        lags.append(max(0.0, time.perf_counter() - start - PROBE_INTERVAL))
+
+# =============================================
+# SCÉNARIOS
+# =============================================
+
+async def scenario(results: List[Dict[str, Any]], saves: int, directory: Path, background: bool) -> List[float]:
+    """
+    Sauvegarde `saves` fois les résultats (un message journalisé par résultat) pendant que la sonde tourne.
+
+    Returns:
+        List[float]: Retards mesurés par la sonde (secondes)
+    """
+    bench_logger = logging.getLogger(f"bench_io_lag.{'background' if background else 'sync'}")
+    bench_logger.propagate = False
+    bench_logger.setLevel(logging.INFO)
+    file_handler = logging.FileHandler(directory / "bench.log")
+    listener = None
+    writer = BackgroundWriter()
+    if background:
+        log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue()
+        listener = logging.handlers.QueueListener(log_queue, file_handler)
+        listener.start()
+        bench_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    else:
+        bench_logger.addHandler(file_handler)
+
+    lags: List[float] = []
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(probe(lags, stop))
+    await asyncio.sleep(0.05)  # Mesure de référence avant les écritures
+    for i in range(saves):
+        for j in range(0, len(results), 10):
+            bench_logger.info(f"Résultat {j} traité")
+        path = directory / f"resultats_{i}.json"
+        if background:
+            writer.write_json(path, list(results))
+        else:
+            write_json_atomic(path, results)
+        await asyncio.sleep(0.02)  # Le reste du traitement (attente des réponses API)
+    await asyncio.to_thread(writer.flush)
+    stop.set()
+    await probe_task
+
+    writer.close()
+    if listener:
+        listener.stop()
+    bench_logger.handlers.clear()
+    file_handler.close()
+    return lags
+
+def summarize(name: str, lags: List[float]) -> None:
+    """Affiche le retard médian, le 99e centile et le maximum."""
+    lags_ms = sorted(lag * 1000 for lag in lags)
+    p99 = lags_ms[min(len(lags_ms) - 1, int(len(lags_ms) * 0.99))]
+    print(
+        f"{name:<14} réveils {len(lags_ms):5d}  médiane {statistics.median(lags_ms):6.2f} ms  "
+        f"p99 {p99:7.2f} ms  max {lags_ms[-1]:7.2f} ms  bloqué au total {sum(lags_ms):7.1f} ms"
+    )
+
+async def run(count: int, saves: int) -> None:
+    results = make_results(count)
+    size_kb = len(json.dumps(results, indent=2, ensure_ascii=False).encode("utf-8")) / 1024
+    print(f"{saves} sauvegardes de {count} résultats ({size_kb:.0f} Ko chacune)\n")
+    with tempfile.TemporaryDirectory() as tmp:
+        summarize("synchrone", await scenario(results, saves, Path(tmp), background=False))
+        summarize("arrière-plan", await scenario(results, saves, Path(tmp), background=True))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark du retard de la boucle d'événements pendant les écritures")
+    parser.add_argument("--results", type=int, default=2000, help="Nombre de résultats par fichier")
+    parser.add_argument("--saves", type=int, default=10, help="Nombre de sauvegardes")
+    args = parser.parse_args()
+    asyncio.run(run(args.results, args.saves))
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark du temps de démarrage des points d'entrée (imports et `--help`).
+
+Chaque mesure est faite dans un nouveau processus Python, comme au lancement réel :
+- temps d'import de chaque module (`python -X importtime`), avec les imports les plus coûteux ;
+- temps total de `python live_fact_checker.py --help` (médiane de plusieurs lancements).
+
+Lancer depuis src/ :
+    python -m benchmarks.bench_startup [--repeat 5] [--top 8]
+"""
+
+import sys
+import argparse
+import subprocess
+import statistics
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+SRC_DIR = Path(__file__).resolve().parents[1]
+
+# Modules mesurés : points d'entrée et modules importés au démarrage
+MODULES = [
+    "live_fact_checker",
+    "main",
+    "core.analyse_critique",
+    "core.fact_checker",
+    "core.prompts_templates",
+]
+
+# =============================================
+# MESURES
+# =============================================
+
+def import_profile(module: str) -> Tuple[float, List[Tuple[float, str]]]:
+    """
+    Importe un module dans un processus neuf avec `-X importtime`.
+
+    Args:
+        module: Nom du module à importer
+
+    Returns:
+        Tuple[float, List[Tuple[float, str]]]: (temps total en ms, [(temps cumulé en ms, sous-module importé)])
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SRC_DIR, capture_output=True, text=True
+    )
+    entries = []
+    for line in completed.stderr.splitlines():
+        # Format : "import time:  self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        entries.append((int(cumulative) / 1000, name.rstrip()))
+    # Les sous-modules sont listés avant leur parent : on remonte depuis la ligne du module
+    # jusqu'à l'import de premier niveau précédent (indentation d'un seul espace)
+    end = next((i for i in range(len(entries) - 1, -1, -1) if entries[i][1] == f" {module}"), None)
+    if end is None:
+        return 0.0, []
+    start = end
+    while start > 0 and entries[start - 1][1].startswith("  "):
+        start -= 1
+    return entries[end][0], entries[start:end]
+
+def time_command(args: List[str], repeat: int) -> float:
+    """
+    Mesure le temps médian d'une commande (processus complet, interpréteur compris).
+
+    Args:
+        args: Commande à lancer
+        repeat: Nombre de lancements
+
+    Returns:
+        float: Temps médian en millisecondes
+    """
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(args, cwd=SRC_DIR, capture_output=True)
+        durations.append((time.perf_counter() - start) * 1000)
+    return statistics.median(durations)
+
+def run(repeat: int, top: int) -> None:
+    """
+    Affiche les temps d'import des modules et le temps de `--help`.
+
+    Args:
+        repeat: Nombre de lancements pour la mesure de `--help`
+        top: Nombre d'imports coûteux affichés par module
+    """
+    baseline = time_command([sys.executable, "-c", "pass"], repeat)
+    print(f"Interpréteur seul : {baseline:7.1f} ms\n")
+
+    for module in MODULES:
+        total, entries = import_profile(module)
+        print(f"import {module:<26} {total:7.1f} ms")
+        # Imports directs de premier niveau (indentation de deux espaces) les plus coûteux
+        direct = sorted((e for e in entries if e[1].startswith("   ") and not e[1].startswith("    ")), reverse=True)
+        for ms, name in direct[:top]:
+            print(f"    {name.strip():<32} {ms:7.1f} ms")
+
+    help_ms = time_command([sys.executable, "live_fact_checker.py", "--help"], repeat)
+    print(f"\nlive_fact_checker.py --help : {help_ms:7.1f} ms (dont {help_ms - baseline:.1f} ms au-delà de l'interpréteur)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark du temps de démarrage")
+    parser.add_argument("--repeat", type=int, default=5, help="Nombre de lancements par mesure")
+    parser.add_argument("--top", type=int, default=5, help="Nombre d'imports coûteux affichés par module")
+    args = parser.parse_args()
+    run(args.repeat, args.top)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Test de charge du service HTTP de fact-checking (core/fact_check_service.py).
+
+Par défaut, le service est démarré dans ce processus avec le client Mistral simulé
+(benchmarks/mock_llm.py) : aucune clé API, aucun appel réseau. Les requêtes `POST /check`
+sont envoyées en parallèle, avec des affirmations répétées (comme des outils de rédaction qui
+vérifient la même phrase) pour mesurer le regroupement des analyses identiques. Un lot
+(`POST /batch`) et un flux (`POST /stream`) sont aussi vérifiés.
+
+Avec `--url`, la charge est envoyée à un service déjà lancé (`live_fact_checker.py --serve`).
+
+Lancer depuis src/ :
+    python -m benchmarks.load_test_service [--requests 300] [--concurrency 50] [--unique 30]
+"""
+
+import json
+import time
+import random
+import asyncio
+import argparse
+import statistics
+from collections import Counter
+from typing import List, Optional
+
+import httpx
+
+from core.fact_check_service import FactCheckService
+from benchmarks.mock_llm import build_mock_analyzer
+
+CLAIM_TEMPLATES = [
+    "Le taux de chômage en France est de {n},3% selon l'Insee.",
+    "La dette publique a augmenté de {n} milliards d'euros l'an dernier.",
+    "La loi de {n} interdit désormais ce type de contrat.",
+    "Depuis {n} ans, la criminalité a augmenté dans les grandes villes.",
+]
+
+def make_claims(unique: int) -> List[str]:
+    """Affirmations distinctes utilisées pour la charge."""
+    return [CLAIM_TEMPLATES[i % len(CLAIM_TEMPLATES)].format(n=10 + i) for i in range(unique)]
+
+def percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+async def run_load(base_url: str, total: int, concurrency: int, claims: List[str]) -> None:
+    """
+    Envoie `total` requêtes /check (au plus `concurrency` en même temps) puis un lot et un flux.
+    """
+    rng = random.Random(0)
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    gate = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=120, limits=limits) as client:
+        async def one() -> None:
+            async with gate:
+                start = time.perf_counter()
+                response = await client.post("/check", json={"affirmation": rng.choice(claims)})
+                latencies.append(time.perf_counter() - start)
+                statuses[response.status_code] += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        elapsed = time.perf_counter() - start
+
+        print(f"/check : {total} requêtes, {concurrency} simultanées, {len(claims)} affirmations distinctes")
+        print(f"  débit {total / elapsed:7.1f} req/s en {elapsed:.2f}s — codes {dict(statuses)}")
+        print(f"  latence médiane {statistics.median(latencies) * 1000:7.1f} ms, p95 {percentile(latencies, 0.95) * 1000:7.1f} ms, "
+              f"p99 {percentile(latencies, 0.99) * 1000:7.1f} ms, max {max(latencies) * 1000:7.1f} ms")
+
+        start = time.perf_counter()
+        batch = await client.post("/batch", json={"affirmations": claims[:10] + ["court"]})
+        results = batch.json()["results"]
+        ok = sum(1 for r in results if r["status"] == "success")
+        print(f"/batch : {len(results)} résultats ({ok} succès) en {(time.perf_counter() - start) * 1000:.0f} ms")
+
+        start = time.perf_counter()
+        first_token: Optional[float] = None
+        kinds: Counter = Counter()
+        async with client.stream("POST", "/stream", json={"affirmation": claims[0]}) as response:
+            async for line in response.aiter_lines():
+                if not line:
+                    continue
+                event = json.loads(line)
+                kinds[event["event"]] += 1
+                if event["event"] == "token" and first_token is None:
+                    first_token = time.perf_counter() - start
+        print(f"/stream : événements {dict(kinds)}, premier fragment à {(first_token or 0) * 1000:.0f} ms, "
+              f"total {(time.perf_counter() - start) * 1000:.0f} ms")
+
+        health = (await client.get("/health")).json()
+        print(f"\nRegroupement (service) : {health['coalescing']}")
+        print(f"Regroupement (analyseur) : {health['analyzer_coalescing']}")
+        print(f"Connexions HTTP sortantes : {health['connections']}")
+
+async def main(args: argparse.Namespace) -> None:
+    claims = make_claims(args.unique)
+    if args.url:
+        await run_load(args.url, args.requests, args.concurrency, claims)
+        return
+
+    analyzer = build_mock_analyzer(latency_s=args.latency, concurrency=args.api_concurrency)
+    service = FactCheckService(analyzer)
+    await service.start("127.0.0.1", 0)
+    print(f"Service simulé sur le port {service.port} (latence LLM {args.latency}s, {args.api_concurrency} appels simultanés)\n")
+    try:
+        await run_load(f"http://127.0.0.1:{service.port}", args.requests, args.concurrency, claims)
+        print(f"Appels LLM simulés : {analyzer.client.calls}")
+    finally:
+        await service.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Test de charge du service HTTP de fact-checking")
+    parser.add_argument("--requests", type=int, default=300, help="Nombre de requêtes /check")
+    parser.add_argument("--concurrency", type=int, default=50, help="Requêtes simultanées")
+    parser.add_argument("--unique", type=int, default=30, help="Nombre d'affirmations distinctes")
+    parser.add_argument("--latency", type=float, default=0.2, help="Latence d'un appel LLM simulé (s)")
+    parser.add_argument("--api-concurrency", type=int, default=4, help="Appels LLM simultanés (ordonnanceur de l'analyseur)")
+    parser.add_argument("--url", default=None, help="Service déjà lancé (ex: http://127.0.0.1:8765) au lieu du service simulé")
+    asyncio.run(main(parser.parse_args()))
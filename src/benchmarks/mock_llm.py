@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Client Mistral simulé pour les benchmarks (aucun appel réseau, aucune clé API).
+
+Reproduit l'interface utilisée par `CritiqueAnalyzer` (`chat.complete_async`,
+`chat.stream_async`, `models.list_async`) avec une latence configurable. La catégorie
+renvoyée en Phase 1 est celle devinée par `heuristics.guess_category` (STATISTIQUE par défaut),
+en JSON {"category": ...} si une sortie contrainte ("json_schema") est demandée, sinon "[CATÉGORIE]".
+"""
+
+import json
+import random
+import asyncio
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from core.heuristics import guess_category
+from core.context_window import estimate_tokens
+
+def _response(content: str, messages: List[Dict[str, str]]) -> SimpleNamespace:
+    """Réponse au format du SDK : `response.choices[0].message.content`, avec `usage` (tokens estimés)."""
+    usage = SimpleNamespace(
+        prompt_tokens=estimate_tokens("".join(m["content"] for m in messages)),
+        completion_tokens=estimate_tokens(content)
+    )
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))], usage=usage)
+
+def _stream_event(content: str) -> SimpleNamespace:
+    """Événement de flux au format du SDK : `event.data.choices[0].delta.content`."""
+    return SimpleNamespace(data=SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content))]))
+
+class _MockChat:
+    def __init__(self, owner: "MockMistralClient"):
+        self.owner = owner
+
+    async def complete_async(self, model: str, messages: List[Dict[str, str]], **kwargs) -> SimpleNamespace:
+        await self.owner._wait()
+        user_prompt = messages[-1]["content"]
+        category = self.owner.category_for(user_prompt)
+        response_type = (kwargs.get("response_format") or {}).get("type")
+        if "AFFIRMATION À CLASSER" in user_prompt:
+            if response_type == "json_schema":
+                return _response(json.dumps({"category": category}), messages)
+            return _response(f"[{category}]", messages)
+        verdict = f"VRAI : verdict simulé ({category}) [Source: simulation]"
+        if response_type == "json_object":
+            return _response(json.dumps({"category": category, "analyse": verdict}, ensure_ascii=False), messages)
+        return _response(verdict, messages)
+
+    async def stream_async(self, model: str, messages: List[Dict[str, str]], **kwargs) -> AsyncIterator[SimpleNamespace]:
+        await self.owner._wait()
+        category = self.owner.category_for(messages[-1]["content"])
+
+        async def events() -> AsyncIterator[SimpleNamespace]:
+            for fragment in ("VRAI", " : ", f"verdict simulé ({category})", " [Source: simulation]"):
+                await asyncio.sleep(self.owner.latency_s / 20)
+                yield _stream_event(fragment)
+        return events()
+
+class _MockModels:
+    async def list_async(self) -> List[str]:
+        return []
+
+class MockMistralClient:
+    """
+    Client simulé : chaque appel attend `latency_s` secondes (± `jitter` en proportion)
+    """
+
+    def __init__(self, latency_s: float = 0.2, jitter: float = 0.2, seed: Optional[int] = 0):
+        """
+        Initialise le client simulé
+
+        Args:
+            latency_s: Latence moyenne d'un appel
+            jitter: Variation relative de la latence (0.2 = ±20 %)
+            seed: Graine du générateur aléatoire (reproductibilité)
+        """
+        self.latency_s = latency_s
+        self.jitter = jitter
+        self.calls = 0
+        self._random = random.Random(seed)
+        self.chat = _MockChat(self)
+        self.models = _MockModels()
+
+    async def _wait(self) -> None:
+        self.calls += 1
+        await asyncio.sleep(self.latency_s * (1 + self._random.uniform(-self.jitter, self.jitter)))
+
+    @staticmethod
+    def category_for(prompt: str) -> str:
+        """Catégorie simulée : celle des indices lexicaux, sinon STATISTIQUE."""
+        guess, _ = guess_category(prompt)
+        return guess or "STATISTIQUE"
+
+def build_mock_analyzer(latency_s: float = 0.2, concurrency: int = 4, **kwargs: Any):
+    """
+    Crée un `CritiqueAnalyzer` branché sur le client simulé
+
+    Args:
+        latency_s: Latence moyenne d'un appel simulé
+        concurrency: Appels API simultanés autorisés (ordonnanceur de l'analyseur)
+        **kwargs: Options de `CritiqueAnalyzer` (analysis_mode, speculative, ledger)
+
+    Returns:
+        CritiqueAnalyzer: Analyseur prêt à l'emploi
+    """
+    from core.analyse_critique import CritiqueAnalyzer
+    from core.scheduler import PriorityScheduler
+    return CritiqueAnalyzer(MockMistralClient(latency_s=latency_s), PriorityScheduler(concurrency), **kwargs)
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Banc de régression et de performance rejouable (core/replay.py).
+
+- `record` : analyse un lot avec la vraie API (clé nécessaire) : les affirmations par défaut
+  de `live_fact_checker.py`, ou les phrases vérifiables d'un fichier VTT/SRT (`--vtt`).
+  Chaque réponse est enregistrée dans une cassette, avec les résultats de référence. Avec
+  `--search`, les recherches web du Module 4 sont enregistrées aussi.
+- `replay` : rejoue le même lot sans réseau ni clé API, instantanément ou avec les latences
+  d'origine (`--latency 1`). La durée est mesurée et chaque verdict est comparé à la
+  référence. Le code de sortie est 1 en cas d'écart, ou si une requête manque dans la
+  cassette (prompt modifié).
+
+Lancer depuis src/ :
+    MISTRAL_API_KEY=... python -m benchmarks.replay_batch record --cassette ../data/cassettes/defaut.json [--vtt debat.vtt] [--search]
+    python -m benchmarks.replay_batch replay --cassette ../data/cassettes/defaut.json [--latency 1] [--api-concurrency 4]
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from core.utils import Config, validate_text
+from core.replay import Cassette, RecordingMistralClient, ReplayMistralClient, recording_search, replay_search
+from core.scheduler import PriorityScheduler
+from core.claim_extraction import score_check_worthiness
+from core.ingestion_pipeline import parse_vtt_timed
+
+# Champs d'un résultat comparés entre la référence et le rejeu
+COMPARED_FIELDS = ("status", "category", "analyse")
+
+def load_claims(vtt_path: Optional[Path]) -> List[Union[str, Dict[str, Any]]]:
+    """Affirmations du lot : phrases vérifiables du VTT (horodatées), sinon les affirmations par défaut."""
+    if vtt_path is None:
+        from live_fact_checker import DEFAULT_AFFIRMATIONS
+        return list(DEFAULT_AFFIRMATIONS)
+    sentences = parse_vtt_timed(vtt_path.read_text(encoding='utf-8'))
+    return [
+        {"affirmation": s["text"], "start": s["start"], "end": s["end"]}
+        for s in sentences
+        if validate_text(s["text"]) and score_check_worthiness(s["text"]) >= Config.CLAIM_MIN_SCORE
+    ]
+
+def summarize(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Partie comparable des résultats de `process_batch`."""
+    return [
+        {"status": r.get("result", r).get("status"), "category": r.get("result", {}).get("category"),
+         "analyse": r.get("result", {}).get("analyse", r.get("error_message"))}
+        for r in results
+    ]
+
+async def run_batch(client: Any, claims: List[Union[str, Dict[str, Any]]], api_concurrency: int) -> Dict[str, Any]:
+    """
+    Analyse le lot avec le client donné (enregistreur ou rejoueur)
+
+    Returns:
+        Dict[str, Any]: {"results": résultats comparables, "elapsed_s": durée du lot}
+    """
+    from core.analyse_critique import CritiqueAnalyzer
+    from live_fact_checker import AffirmationProcessor
+    analyzer = CritiqueAnalyzer(client, PriorityScheduler(api_concurrency), speculative=False)
+    processor = AffirmationProcessor(analyzer, deadline_s=0, token_budget=0)
+    start = time.perf_counter()
+    results = await processor.process_batch(claims, run_id="replay_batch")
+    return {"results": summarize(results), "elapsed_s": round(time.perf_counter() - start, 3)}
+
+def search_evidence(claims: List[Union[str, Dict[str, Any]]], moteur: Any) -> List[List[str]]:
+    """URLs trouvées par le Module 4 pour chaque affirmation (sans cache, pour enregistrer chaque recherche)."""
+    from core.fact_checker import fact_check_affirmations
+    from core.utils import format_affirmation
+    found = fact_check_affirmations([format_affirmation(c) for c in claims], 'fr', utiliser_cache=False, moteur=moteur)
+    return [[p["href"] for p in item["preuves"]] for item in found]
+
+async def record(args: argparse.Namespace) -> int:
+    from core.analyse_critique import get_mistral_client
+    from core.client_registry import close_clients
+    claims = load_claims(args.vtt)
+    cassette = Cassette(args.cassette)
+    try:
+        run = await run_batch(RecordingMistralClient(get_mistral_client(), cassette), claims, args.api_concurrency)
+    finally:
+        await close_clients()
+    baseline: Dict[str, Any] = {"claims": claims, "api_concurrency": args.api_concurrency, **run}
+    if args.search:
+        baseline["search"] = await asyncio.to_thread(search_evidence, claims, recording_search(cassette))
+    cassette.data["baseline"] = baseline
+    cassette.save()
+    print(f"{len(claims)} affirmations analysées en {run['elapsed_s']}s, "
+          f"{cassette.stats['recorded']} réponses enregistrées dans {args.cassette}")
+    return 0
+
+async def replay(args: argparse.Namespace) -> int:
+    cassette = Cassette.load(args.cassette)
+    baseline = cassette.data.get("baseline")
+    if not baseline:
+        print(f"Pas de résultats de référence dans {args.cassette} (enregistrer avec la commande record)")
+        return 1
+    claims = baseline["claims"]
+    run = await run_batch(ReplayMistralClient(cassette, args.latency), claims, args.api_concurrency or baseline["api_concurrency"])
+
+    differences = [
+        (i, field, expected[field], actual[field])
+        for i, (expected, actual) in enumerate(zip(baseline["results"], run["results"]), 1)
+        for field in COMPARED_FIELDS
+        if expected[field] != actual[field]
+    ]
+    if "search" in baseline:
+        urls = await asyncio.to_thread(search_evidence, claims, replay_search(cassette, args.latency))
+        differences += [(i, "preuves", e, a) for i, (e, a) in enumerate(zip(baseline["search"], urls), 1) if e != a]
+
+    print(f"Rejeu de {len(claims)} affirmations : {run['elapsed_s']}s (enregistrement : {baseline['elapsed_s']}s, "
+          f"latences x{args.latency})")
+    print(f"Cassette : {cassette.stats['replayed']} réponses rejouées, {cassette.stats['missed']} requêtes absentes")
+    for i, field, expected, actual in differences:
+        print(f"  ÉCART affirmation {i} ({field}) :\n    référence : {str(expected)[:120]}\n    rejeu     : {str(actual)[:120]}")
+    ok = not differences and not cassette.stats["missed"]
+    print("Aucune régression" if ok else f"{len(differences)} écarts")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Banc de régression rejouable (enregistrement / rejeu des appels API)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    record_cmd = commands.add_parser("record", help="Analyse le lot avec la vraie API et enregistre la cassette")
+    record_cmd.add_argument("--vtt", type=Path, default=None, help="Transcription VTT/SRT (par défaut : affirmations par défaut)")
+    record_cmd.add_argument("--search", action="store_true", help="Enregistre aussi les recherches web du Module 4")
+    replay_cmd = commands.add_parser("replay", help="Rejoue le lot hors ligne et le compare à la référence")
+    replay_cmd.add_argument("--latency", type=float, default=0.0, help="Facteur des latences enregistrées (0 : immédiat, 1 : d'origine)")
+    for command in (record_cmd, replay_cmd):
+        command.add_argument("--cassette", type=Path, required=True, help="Fichier JSON de la cassette")
+        command.add_argument("--api-concurrency", type=int, default=None if command is replay_cmd else Config.API_CONCURRENCY,
+                             help="Appels API simultanés (rejeu : comme à l'enregistrement par défaut)")
+    cli_args = parser.parse_args()
+    sys.exit(asyncio.run(record(cli_args) if cli_args.command == "record" else replay(cli_args)))
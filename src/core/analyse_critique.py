@@ -17,17 +17,38 @@ import os
 import sys
 import logging
 import asyncio
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Union, Tuple, Callable, Deque
 import re
+import json
+import time
+import difflib
+import unicodedata
+from collections import deque
 from functools import wraps
+from types import SimpleNamespace
 
 # Imports depuis notre nouveau module utilitaire
 from .utils import (
     Config, AnalysisError, validate_text,
-    format_affirmation, format_response
+    format_affirmation, format_response, format_stream_chunk, media_timing
 )
 # Import des prompts pour la logique en deux phases
-from .prompts_templates import get_system_prompt_classify, get_specialized_system_prompt
+from .prompts_templates import (
+    get_system_prompt_classify, get_specialized_system_prompt,
+    get_system_prompt_fused, get_classify_response_format, get_prompts_version, CATEGORIES_VALIDES
+)
+from .heuristics import guess_category, local_category
+from .evidence import format_evidence_context
+from .client_registry import get_shared_mistral_client, start_warmup
+from .search_cache import normalize_query
+from .single_flight import SingleFlight
+from .scheduler import PriorityScheduler
+from .degradation import (
+    LEVEL_FULL, LEVEL_NO_EVIDENCE, LEVEL_CHEAP_MODEL, LEVEL_CATEGORY_ONLY, LEVEL_NAMES,
+    RunBudget, budgeting, charge_budget, step_timeout
+)
+from .usage_ledger import UsageLedger, get_usage_ledger, usage_counts
+from .replay import ReplayMiss
 
 # Configuration du logging
 logging.basicConfig(
@@ -46,7 +67,8 @@ MistralAnalysisError = AnalysisError
 # =============================================
 # DÉCORATEURS
 # =============================================
-def retry(max_attempts: int = Config.MAX_RETRIES, delay: int = Config.RETRY_DELAY):
+def retry(max_attempts: int = Config.MAX_RETRIES, delay: int = Config.RETRY_DELAY,
+          permanent: Tuple[type, ...] = (ReplayMiss,)):
     """
     Décorateur pour implémenter une logique de réessai
 
@@ -56,6 +78,8 @@ def retry(max_attempts: int = Config.MAX_RETRIES, delay: int = Config.RETRY_DELA
     Args:
         max_attempts: Nombre maximal de tentatives
         delay: Délai entre les tentatives en secondes
+        permanent: Erreurs qui se reproduiraient à l'identique (requête absente d'une cassette...) :
+            pas de réessai, y compris quand elles sont la cause de l'erreur levée
 
     Returns:
         function: Décorateur pour les fonctions asynchrones
@@ -69,6 +93,8 @@ def retry(max_attempts: int = Config.MAX_RETRIES, delay: int = Config.RETRY_DELA
                     return await func(*args, **kwargs)
                 except Exception as e:
                     last_exception = e
+                    if isinstance(e, permanent) or isinstance(e.__cause__ or e.__context__, permanent):
+                        raise
                     if attempt < max_attempts:
                         logger.warning(f"Tentative {attempt} échouée. Réessai dans {delay} secondes...")
                         await asyncio.sleep(delay)
@@ -80,7 +106,10 @@ def retry(max_attempts: int = Config.MAX_RETRIES, delay: int = Config.RETRY_DELA
 
 # =============================================
 def get_mistral_client(api_key: Optional[str] = None) -> Any:
-    """Initialise et retourne un client Mistral
+    """Retourne le client Mistral partagé par tout le processus (voir `client_registry`)
+
+    Le client n'est créé qu'une fois par clé API : ses connexions (keep-alive, HTTP/2 si
+    disponible) sont réutilisées par tous les appels, quel que soit le point d'entrée.
 
     Args:
         api_key: Clé API MistralAI (optionnelle)
@@ -92,21 +121,138 @@ def get_mistral_client(api_key: Optional[str] = None) -> Any:
         MistralAnalysisError: Si l'initialisation échoue ou si la clé API est manquante.
     """
     try:
-        # LA VRAIE CORRECTION FINALE : L'import se fait depuis la racine du package, pas depuis .client
-        from mistralai import Mistral
-    except ImportError as e:
-        raise MistralAnalysisError(f"Erreur critique: Impossible de charger mistralai: {str(e)}")
+        return get_shared_mistral_client(api_key)
+    except AnalysisError:
+        raise
+    except Exception as e:
+        raise MistralAnalysisError(f"Erreur d'initialisation du client: {str(e)}")
 
-    api_key = api_key or os.getenv("MISTRAL_API_KEY")
-    if not api_key:
-        raise MistralAnalysisError("Clé API MistralAI non configurée")
+# =============================================
+# VALIDATION DE LA CATÉGORIE
+# =============================================
+# Étiquettes approchantes renvoyées par le modèle (après normalisation, voir `match_category`)
+CATEGORY_ALIASES = {
+    "STATISTIQUES": "STATISTIQUE", "STAT": "STATISTIQUE", "CHIFFRE": "STATISTIQUE",
+    "CHIFFRES": "STATISTIQUE", "ECONOMIE": "STATISTIQUE",
+    "LOI": "JURIDIQUE", "LEGAL": "JURIDIQUE", "DROIT": "JURIDIQUE",
+    "SCIENCE": "CONSENSUS_SCIENCE", "SCIENTIFIQUE": "CONSENSUS_SCIENCE", "CONSENSUS_SCIENTIFIQUE": "CONSENSUS_SCIENCE",
+    "SANTE": "CONSENSUS_SCIENCE", "PSEUDOSCIENCE": "CONSENSUS_SCIENCE",
+    "HISTOIRE": "CONSENSUS_HISTO", "HISTORIQUE": "CONSENSUS_HISTO", "CONSENSUS_HISTORIQUE": "CONSENSUS_HISTO",
+    "GEOGRAPHIE": "CONSENSUS_HISTO",
+    "OPINION": "DOCTRINE", "IDEOLOGIE": "DOCTRINE", "PHILOSOPHIE": "DOCTRINE", "MORALE": "DOCTRINE",
+    "SOPHISME": "LOGIQUE", "BIAIS": "LOGIQUE",
+    "FUTUR": "NON_FAIT", "PROMESSE": "NON_FAIT", "PROJET": "NON_FAIT", "INTENTION": "NON_FAIT",
+    "SALUTATION": "POLITESSE", "COURTOISIE": "POLITESSE",
+    "INVERIFIABLE": "NON_VERIFIABLE", "NON_SOURCABLE": "NON_VERIFIABLE",
+    "NON_SENS": "HUMOUR", "ABSURDE": "HUMOUR",
+}
+
+def match_category(label: str) -> Optional[str]:
+    """
+    Rattache une étiquette à l'une des CATEGORIES_VALIDES.
+
+    Dans l'ordre : égalité après normalisation (accents, casse, séparateurs), alias connu,
+    catégorie citée dans l'étiquette (ex: "Catégorie : STATISTIQUE."), puis étiquette
+    approchante (`Config.CATEGORY_MATCH_CUTOFF`, ex: "NON_VERIFIABE").
+
+    Args:
+        label: Étiquette renvoyée par le modèle
 
+    Returns:
+        Optional[str]: Catégorie reconnue, ou None
+    """
+    ascii_label = unicodedata.normalize("NFKD", label).encode("ascii", "ignore").decode("ascii")
+    normalized = re.sub(r"[^A-Z]+", "_", ascii_label.upper()).strip("_")
+    if not normalized:
+        return None
+    if normalized in CATEGORIES_VALIDES:
+        return normalized
+    if normalized in CATEGORY_ALIASES:
+        return CATEGORY_ALIASES[normalized]
+    # Catégorie citée dans une phrase : la plus longue l'emporte (CONSENSUS_SCIENCE avant SCIENCE)
+    cited = [c for c in CATEGORIES_VALIDES if f"_{c}_" in f"_{normalized}_"]
+    if cited:
+        return max(cited, key=len)
+    close = difflib.get_close_matches(
+        normalized, list(CATEGORIES_VALIDES) + list(CATEGORY_ALIASES), n=1, cutoff=Config.CATEGORY_MATCH_CUTOFF
+    )
+    if close:
+        return CATEGORY_ALIASES.get(close[0], close[0])
+    return None
+
+def parse_category(raw: str, formatted_aff: str) -> Tuple[str, str]:
+    """
+    Extrait la catégorie de la réponse de la Phase 1, sans jamais relancer d'appel.
+
+    La réponse peut être l'objet JSON de la sortie contrainte ({"category": ...}) ou le format
+    historique "[CATÉGORIE]". Une étiquette inconnue est rattachée par `match_category` ;
+    à défaut, la catégorie est estimée localement (`heuristics.local_category`).
+
+    Args:
+        raw: Texte brut renvoyé par le modèle
+        formatted_aff: Affirmation classée (pour l'estimation locale)
+
+    Returns:
+        Tuple[str, str]: (catégorie, provenance : "exact", "fuzzy" ou "fallback")
+    """
+    label = raw.strip()
     try:
-        client = Mistral(api_key=api_key)
-        logger.info("Client Mistral initialisé avec succès")
-        return client
-    except Exception as e:
-        raise MistralAnalysisError(f"Erreur d'initialisation du client: {str(e)}")
+        data = json.loads(re.sub(r'^```(?:json)?\s*|\s*```$', '', label))
+        if isinstance(data, dict) and isinstance(data.get("category"), str):
+            label = data["category"]
+    except json.JSONDecodeError:
+        # Format historique : extrait la catégorie, ex: de "RÉPONSE UNIQUE : [STATISTIQUE]" à "STATISTIQUE"
+        match = re.search(r'\[\s*([^\]]+?)\s*\]', label)
+        if match:
+            label = match.group(1)
+    if label.strip().upper() in CATEGORIES_VALIDES:
+        return label.strip().upper(), "exact"
+    category = match_category(label) or (match_category(raw) if label != raw.strip() else None)
+    if category:
+        logger.warning(f"Phase 1: étiquette '{label[:40]}' rattachée à {category}")
+        return category, "fuzzy"
+    category = local_category(formatted_aff)
+    logger.warning(f"Phase 1: étiquette '{label[:40]}' non reconnue, catégorie estimée localement -> {category}")
+    return category, "fallback"
+
+# =============================================
+# VALIDATION DE LA SORTIE DU MODE FUSIONNÉ
+# =============================================
+def parse_fused_response(raw: str) -> Tuple[str, str]:
+    """
+    Valide la réponse JSON du mode fusionné et en extrait la catégorie et l'analyse.
+
+    Schéma attendu : {"category": <une des CATEGORIES_VALIDES (voir `match_category`)>, "analyse": <texte non vide>}
+
+    Args:
+        raw: Texte brut renvoyé par le modèle
+
+    Returns:
+        Tuple[str, str]: (catégorie, analyse)
+
+    Raises:
+        ValueError: Si le JSON est invalide ou ne respecte pas le schéma
+    """
+    # Certains modèles entourent le JSON de balises ```json ... ``` : on les retire
+    text = re.sub(r'^```(?:json)?\s*|\s*```$', '', raw.strip())
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"JSON invalide: {e}")
+
+    if not isinstance(data, dict):
+        raise ValueError("La réponse n'est pas un objet JSON")
+
+    category = data.get("category")
+    analyse = data.get("analyse")
+    # Étiquette approchante acceptée (ex: "Statistiques") : l'analyse rédigée reste valable
+    matched = match_category(category) if isinstance(category, str) else None
+    if matched is None:
+        raise ValueError(f"Catégorie inconnue: {category!r}")
+    if not isinstance(analyse, str) or not analyse.strip():
+        raise ValueError("Champ 'analyse' manquant ou vide")
+
+    return matched, analyse.strip()
 
 # =============================================
 # CLASSE PRINCIPALE D'ANALYSE
@@ -119,7 +265,14 @@ class CritiqueAnalyzer:
     une interface simple pour l'analyse des affirmations.
     """
 
-    def __init__(self, client: Any, semaphore: asyncio.Semaphore):
+    def __init__(
+        self,
+        client: Any,
+        scheduler: PriorityScheduler,
+        analysis_mode: Optional[str] = None,
+        speculative: Optional[bool] = None,
+        ledger: Optional[UsageLedger] = None
+    ):
         """
         Initialise l'analyseur avec un client déjà créé.
         Le constructeur est maintenant privé et ne doit pas être appelé directement.
@@ -127,27 +280,72 @@ class CritiqueAnalyzer:
 
         Args:
             client: Une instance du client Mistral.
-            semaphore: Un sémaphore pour limiter les appels API concurrents.
+            scheduler: Ordonnanceur qui limite les appels API concurrents et sert le direct avant le backlog.
+            analysis_mode: "two_phase" ou "fused" (par défaut : `Config.ANALYSIS_MODE`).
+            speculative: Active la Phase 2 spéculative (par défaut : `Config.SPECULATIVE`).
+            ledger: Registre où inscrire la consommation de chaque appel (None : aucune inscription).
         """
         self.client = client
-        self.semaphore = semaphore
+        self.scheduler = scheduler
+        self.analysis_mode = analysis_mode or Config.ANALYSIS_MODE
+        self.speculative = Config.SPECULATIVE if speculative is None else speculative
+        if self.speculative and scheduler.capacity < 2:
+            # Avec une seule place, l'appel spéculatif passerait avant la classification et la retarderait
+            logger.warning("Spéculation désactivée : elle demande au moins 2 appels API simultanés (API_CONCURRENCY >= 2)")
+            self.speculative = False
+        # Compteurs de l'exécution spéculative ("wasted" = appels lancés pour une mauvaise catégorie,
+        # "suspended" = devinettes non lancées car trop de devinettes récentes étaient fausses)
+        self.speculation_stats = {"launched": 0, "hits": 0, "wasted": 0, "suspended": 0}
+        # Dernières devinettes confiantes (True = fausse), lancées ou non : fenêtre glissante du plafond
+        self._speculation_window: Deque[bool] = deque(maxlen=Config.SPECULATION_WINDOW)
+        # Préchauffage de la connexion en tâche de fond (voir `create`)
+        self.warmup_task: Optional[asyncio.Task] = None
+        # Appels identiques simultanés (doublons d'un lot, requêtes du service HTTP) : un seul appel API,
+        # les autres appelants attendent le même résultat ("suppressed" = appels évités)
+        self.single_flight = SingleFlight()
+        self.ledger = ledger
+        # Phase 1 : sortie contrainte aux catégories connues, et provenance des catégories retenues
+        # ("fuzzy" = étiquette approchante rattachée, "fallback" = estimée localement)
+        self.constrained_classification = Config.CLASSIFY_CONSTRAINED
+        self.classification_stats = {"exact": 0, "fuzzy": 0, "fallback": 0}
 
     @classmethod
-    async def create(cls, api_key: Optional[str] = None) -> "CritiqueAnalyzer":
+    async def create(
+        cls,
+        api_key: Optional[str] = None,
+        analysis_mode: Optional[str] = None,
+        speculative: Optional[bool] = None
+    ) -> "CritiqueAnalyzer":
         """
         Méthode de fabrique asynchrone pour créer une instance de CritiqueAnalyzer.
         C'est la méthode publique à utiliser pour l'instanciation.
 
         Args:
             api_key: Clé API MistralAI (optionnelle).
+            analysis_mode: Mode d'analyse ("two_phase" ou "fused"), optionnel.
+            speculative: Active la Phase 2 spéculative, optionnel.
 
         Returns:
             Une nouvelle instance de CritiqueAnalyzer.
         """
-        client = await asyncio.to_thread(get_mistral_client, api_key)
-        # Le sémaphore est créé ici et partagé par toutes les méthodes de l'instance
-        semaphore = asyncio.Semaphore(1) # SOLUTION FINALE : On force le traitement séquentiel des appels API pour éviter le rate limiting.
-        analyzer = cls(client, semaphore)
+        if Config.LLM_CASSETTE:
+            # Banc d'essai : réponses enregistrées / rejouées (voir `replay`)
+            from .replay import cassette_client
+            client = await asyncio.to_thread(cassette_client, api_key)
+        else:
+            client = await asyncio.to_thread(get_mistral_client, api_key)
+        # L'ordonnanceur est créé ici et partagé par toutes les méthodes de l'instance
+        # SOLUTION FINALE : Par défaut (API_CONCURRENCY=1) on force le traitement séquentiel des appels API pour éviter le rate limiting.
+        # La spéculation n'apporte un gain que si au moins deux appels peuvent partir en même temps.
+        # Les appels en attente sont servis par priorité (direct avant backlog), pas dans l'ordre d'arrivée.
+        scheduler = PriorityScheduler(Config.API_CONCURRENCY)
+        # Consommation (tokens, coût) de chaque appel inscrite dans le registre partagé du processus
+        ledger = await asyncio.to_thread(get_usage_ledger)
+        analyzer = cls(client, scheduler, analysis_mode=analysis_mode, speculative=speculative, ledger=ledger)
+        if Config.CLIENT_WARMUP:
+            # Ouvre la connexion (TCP + TLS) en tâche de fond, pendant que l'utilisateur choisit un mode :
+            # le démarrage n'attend pas le réseau, la première affirmation trouve la connexion prête
+            analyzer.warmup_task = start_warmup(client)
         logger.info("CritiqueAnalyzer initialisé avec succès")
         return analyzer
 
@@ -158,6 +356,12 @@ class CritiqueAnalyzer:
         1. Classification pour déterminer la catégorie de l'affirmation.
         2. Analyse spécialisée basée sur la catégorie trouvée.
 
+        En mode "fused" (voir `Config.ANALYSIS_MODE`), les deux phases sont demandées en un seul
+        appel JSON ; si la réponse ne respecte pas le schéma, on repasse en mode deux phases.
+
+        Les analyses identiques simultanées (même affirmation normalisée, même contexte, même
+        modèle) ne sont exécutées qu'une fois (voir `single_flight`).
+
         Args:
             affirmation: Affirmation à analyser
             history: Liste des affirmations précédentes pour le contexte.
@@ -174,62 +378,517 @@ class CritiqueAnalyzer:
         formatted_aff = format_affirmation(affirmation)
         
         # Préparation du contexte pour le prompt
-        history_context = ""
-        if history:
-            history_text = "\n".join([f"- {h}" for h in history])
-            history_context = f"CONTEXTE DE LA CONVERSATION PRÉCÉDENTE (pour référence uniquement) :\n{history_text}\n\n---\n\n"
+        history_context = self._build_history_context(history)
+        # Les extraits de preuves web ne servent qu'à la Phase 2 (la classification n'en a pas besoin)
+        phase2_context = history_context + self._build_evidence_context(affirmation)
+
+        key = ("analyze", normalize_query(formatted_aff), Config.DEFAULT_MODEL, self.analysis_mode, phase2_context)
+        result = await self.single_flight.do(
+            key, lambda: self._run_analysis(formatted_aff, history_context, phase2_context)
+        )
+        # Résultat partagé entre appelants : chacun reçoit sa copie, avec son texte et son horodatage
+        return {**result, "affirmation": formatted_aff, **media_timing(affirmation)}
+
+    async def _run_analysis(self, formatted_aff: str, history_context: str, phase2_context: str) -> Dict[str, Any]:
+        """
+        Exécute l'analyse (fusionnée ou en deux phases) d'une affirmation déjà validée.
+
+        Args:
+            formatted_aff: Affirmation formatée
+            history_context: Contexte de conversation (Phase 1)
+            phase2_context: Contexte de conversation et preuves web (Phase 2)
+
+        Returns:
+            Dict[str, Any]: Résultat de l'analyse
 
+        Raises:
+            MistralAnalysisError: Si l'analyse échoue
+        """
         try:
-            # --- PHASE 1: CLASSIFICATION ---
-            logger.info(f"Phase 1: Classification de '{formatted_aff[:30]}...'")
-            classification_messages = [
-                {"role": "system", "content": get_system_prompt_classify()},
-                {"role": "user", "content": f"{history_context}AFFIRMATION À CLASSER : \"{formatted_aff}\""}
-            ]
-            
-            async with self.semaphore: # Attend une place dans le sémaphore
-                logger.info(f"-> Appel API (Classification) pour '{formatted_aff[:20]}...'")
-                classification_response = await self.client.chat.complete_async(
-                    model=Config.DEFAULT_MODEL,
-                    messages=classification_messages,
-                    temperature=0.0
-                )
-            
-            category_raw = format_response(classification_response)
-            # Extrait la catégorie, ex: de "[LOGIQUE]" à "LOGIQUE"
-            # Correction pour gérer les réponses "sales" de l'IA (ex: "RÉPONSE UNIQUE : [STATISTIQUE]")
-            match = re.search(r'\[\s*([^\]]+?)\s*\]', category_raw)
-            category = match.group(1).strip() if match else category_raw.strip()
+            # --- MODE FUSIONNÉ (optionnel) : un seul aller-retour ---
+            if self.analysis_mode == "fused":
+                try:
+                    category, analyse = await self._analyze_fused(formatted_aff, phase2_context)
+                    return self._build_result(formatted_aff, category, analyse, mode="fused")
+                except ValueError as e:
+                    # Réponse hors schéma : on ne relance pas tout `analyze`, on bascule en deux phases
+                    logger.warning(f"Mode fusionné invalide ({e}). Repli sur le mode deux phases.")
 
-            logger.info(f"Phase 1: Catégorie déterminée -> {category}")
+            # --- PHASE 2 SPÉCULATIVE (optionnelle) : lancée en même temps que la classification ---
+            speculation = self._start_speculation(formatted_aff, phase2_context)
+
+            try:
+                # --- PHASE 1: CLASSIFICATION ---
+                category = await self._classify(formatted_aff, history_context)
+            except Exception:
+                # La classification a échoué : le résultat spéculatif ne servira pas
+                self._discard_speculation(speculation)
+                raise
 
             # --- PHASE 2: ANALYSE SPÉCIALISÉE ---
-            logger.info(f"Phase 2: Lancement de l'analyse spécialisée pour la catégorie '{category}'")
-            system_prompt = get_specialized_system_prompt(category)
-            user_prompt = f"{history_context}Affirmation à analyser: \"{formatted_aff}\""
+            analyse = await self._resolve_speculation(speculation, category)
+            if analyse is None:
+                analyse = await self._analyze_specialized(formatted_aff, category, phase2_context)
+
+            return self._build_result(formatted_aff, category, analyse, mode="two_phase")
+
+        except Exception as e:
+            raise MistralAnalysisError(f"Erreur d'analyse: {str(e)}")
+
+    async def analyze_within(
+        self,
+        affirmation: Union[str, Dict],
+        history: List[str] = None,
+        deadline: Optional[float] = None,
+        budget: Optional[RunBudget] = None
+    ) -> Dict[str, Any]:
+        """
+        Variante de `analyze` sous échéance et budget : dégrade l'analyse au lieu de la bloquer.
+
+        Chaque niveau (voir `degradation`) dispose d'une part du temps restant ; s'il échoue,
+        dépasse son délai, ou si le budget restant ne le permet plus, on passe au suivant.
+        La catégorie obtenue à un niveau est conservée pour les suivants. Le dernier niveau
+        ("category_only") ne fait aucun appel : un résultat est toujours renvoyé à l'échéance.
+
+        Pas de décorateur @retry ici : le niveau suivant tient lieu de nouvel essai, en moins coûteux.
+
+        Args:
+            affirmation: Affirmation à analyser
+            history: Liste des affirmations précédentes pour le contexte.
+            deadline: Échéance absolue (`time.time()`), None pour aucune
+            budget: Budget de tokens du lot (décompté par chaque appel), None pour aucun
+
+        Returns:
+            Dict[str, Any]: Résultat de l'analyse, avec le niveau atteint dans "degradation"
+
+        Raises:
+            MistralAnalysisError: Si l'affirmation est invalide
+        """
+        if not validate_text(affirmation):
+            raise MistralAnalysisError("Affirmation invalide ou vide")
+
+        formatted_aff = format_affirmation(affirmation)
+        history_context = self._build_history_context(history)
+        evidence_context = self._build_evidence_context(affirmation)
+        category: Optional[str] = None
+        level = LEVEL_FULL
+
+        with budgeting(budget):
+            while level < LEVEL_CATEGORY_ONLY:
+                if budget is not None:
+                    level = max(level, budget.floor_level())
+                if level == LEVEL_NO_EVIDENCE and not evidence_context:
+                    level = LEVEL_CHEAP_MODEL  # Sans preuves jointes, ce niveau serait identique au précédent
+                timeout = step_timeout(deadline, level)
+                if level >= LEVEL_CATEGORY_ONLY or timeout == 0:
+                    break
+
+                model = Config.CHEAP_MODEL if level >= LEVEL_CHEAP_MODEL else Config.DEFAULT_MODEL
+                phase2_context = history_context + (evidence_context if level == LEVEL_FULL else "")
+                step_end = None if timeout is None else time.time() + timeout
+                try:
+                    if category is None:
+                        category = await asyncio.wait_for(self._classify(formatted_aff, history_context, model), timeout)
+                    analyse = await asyncio.wait_for(
+                        self._analyze_specialized(formatted_aff, category, phase2_context, model),
+                        None if step_end is None else max(0.0, step_end - time.time())
+                    )
+                    result = self._build_result(formatted_aff, category, analyse, mode="two_phase", model=model)
+                    return {**result, "degradation": LEVEL_NAMES[level], **media_timing(affirmation)}
+                except asyncio.TimeoutError:
+                    logger.warning(f"Échéance: niveau '{LEVEL_NAMES[level]}' trop lent pour '{formatted_aff[:20]}...'")
+                except Exception as e:
+                    logger.warning(f"Niveau '{LEVEL_NAMES[level]}' en échec ({e}) pour '{formatted_aff[:20]}...'")
+                level += 1
+
+        # Dernier recours, sans appel : catégorie de la Phase 1 si elle a abouti, sinon indices lexicaux
+        if category is None:
+            category = local_category(formatted_aff)
+        analyse = "NON ANALYSÉ : échéance ou budget dépassé, seule la catégorie est disponible."
+        result = self._build_result(formatted_aff, category, analyse, mode="category_only", model="", status="degraded")
+        return {**result, "degradation": LEVEL_NAMES[LEVEL_CATEGORY_ONLY], **media_timing(affirmation)}
+
+    async def analyze_stream(
+        self,
+        affirmation: Union[str, Dict],
+        history: List[str] = None,
+        on_category: Optional[Callable[[str], None]] = None,
+        on_token: Optional[Callable[[str], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Variante de `analyze` pour les modes interactifs : la Phase 2 utilise l'API de streaming.
+
+        La catégorie est transmise à `on_category` dès le retour de la Phase 1, puis chaque
+        fragment du verdict est transmis à `on_token` au fil de l'eau. Le temps jusqu'au
+        premier fragment (TTFT) est mesuré et renvoyé dans `timings`.
+
+        Pas de décorateur @retry ici : un réessai réafficherait un verdict déjà partiellement imprimé.
+        Le mode fusionné n'est pas utilisé (un JSON partiel n'est pas affichable).
+
+        Args:
+            affirmation: Affirmation à analyser
+            history: Liste des affirmations précédentes pour le contexte.
+            on_category: Fonction appelée avec la catégorie dès qu'elle est connue
+            on_token: Fonction appelée avec chaque fragment de texte du verdict
+
+        Returns:
+            Dict[str, Any]: Résultat de l'analyse, avec les mesures de temps dans `timings`
+
+        Raises:
+            MistralAnalysisError: Si l'analyse échoue
+        """
+        if not validate_text(affirmation):
+            raise MistralAnalysisError("Affirmation invalide ou vide")
+
+        formatted_aff = format_affirmation(affirmation)
+        history_context = self._build_history_context(history)
+        phase2_context = history_context + self._build_evidence_context(affirmation)
+        start = time.perf_counter()
 
+        try:
+            # --- PHASE 1: CLASSIFICATION (appel classique, réponse courte) ---
+            category = await self._classify(formatted_aff, history_context)
+            phase1_time = time.perf_counter() - start
+            if on_category:
+                on_category(category)
+
+            # --- PHASE 2: ANALYSE SPÉCIALISÉE EN STREAMING ---
             messages = [
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt}
+                {"role": "system", "content": get_specialized_system_prompt(category)},
+                {"role": "user", "content": f"{phase2_context}Affirmation à analyser: \"{formatted_aff}\""}
             ]
-
-            async with self.semaphore: # Attend une place dans le sémaphore
-                logger.info(f"-> Appel API (Analyse) pour '{formatted_aff[:20]}...'")
-                response = await self.client.chat.complete_async(
+            fragments = []
+            ttft = None
+            usage = None
+            async with self.scheduler.slot(): # Attend une place (priorité et échéance du contexte, voir `scheduling`)
+                logger.info(f"-> Appel API (Analyse streaming) pour '{formatted_aff[:20]}...'")
+                phase2_start = time.perf_counter()
+                stream = await self.client.chat.stream_async(
                     model=Config.DEFAULT_MODEL,
                     messages=messages,
                 )
-
-            return {
-                "affirmation": formatted_aff,
-                "analyse": format_response(response),
-                "category": category, # On retourne la catégorie !
-                "model": Config.DEFAULT_MODEL,
-                "status": "success"
+                async for chunk in stream:
+                    # Le dernier événement du flux porte la consommation de l'appel
+                    usage = getattr(getattr(chunk, 'data', chunk), 'usage', None) or usage
+                    text = format_stream_chunk(chunk)
+                    if not text:
+                        continue
+                    if ttft is None:
+                        # Temps jusqu'au premier fragment, mesuré depuis l'envoi de la requête de Phase 2
+                        ttft = time.perf_counter() - phase2_start
+                    fragments.append(text)
+                    if on_token:
+                        on_token(text)
+
+            self._account(SimpleNamespace(usage=usage) if usage else "".join(fragments), messages, "stream", Config.DEFAULT_MODEL, category)
+            result = self._build_result(
+                formatted_aff, category, "".join(fragments).strip(), mode="stream", timing=media_timing(affirmation)
+            )
+            result["timings"] = {
+                "phase1_s": round(phase1_time, 3),
+                "ttft_s": round(ttft, 3) if ttft is not None else None,
+                "total_s": round(time.perf_counter() - start, 3)
             }
+            logger.info(f"Streaming terminé : TTFT={result['timings']['ttft_s']}s, total={result['timings']['total_s']}s")
+            return result
 
         except Exception as e:
-            raise MistralAnalysisError(f"Erreur d'analyse: {str(e)}")
+            raise MistralAnalysisError(f"Erreur d'analyse (streaming): {str(e)}")
+
+    def _speculation_suspended(self) -> bool:
+        """Vrai si la part de devinettes fausses sur la fenêtre glissante dépasse le plafond."""
+        window = self._speculation_window
+        return len(window) == window.maxlen and sum(window) / len(window) > Config.SPECULATION_MAX_WASTED_RATIO
+
+    def _start_speculation(
+        self, formatted_aff: str, history_context: str
+    ) -> Optional[Tuple[str, Optional[asyncio.Task]]]:
+        """
+        Lance la Phase 2 sur la catégorie devinée localement, si les indices sont nets.
+
+        La spéculation est ignorée si elle est désactivée ou si l'heuristique n'est pas assez
+        confiante. Elle est suspendue tant que trop de devinettes récentes étaient fausses
+        (`Config.SPECULATION_MAX_WASTED_RATIO` sur `Config.SPECULATION_WINDOW`) : la devinette
+        est alors seulement comparée à la Phase 1, ce qui fait glisser la fenêtre sans appel perdu.
+
+        Args:
+            formatted_aff: Affirmation formatée
+            history_context: Contexte de conversation (et preuves web) déjà mis en forme
+
+        Returns:
+            Optional[Tuple[str, Optional[asyncio.Task]]]: (catégorie devinée, tâche de Phase 2,
+            None si suspendue) ou None
+        """
+        if not self.speculative:
+            return None
+
+        guess, confidence = guess_category(formatted_aff)
+        if guess is None or confidence < Config.SPECULATION_MIN_CONFIDENCE:
+            return None
+        if self._speculation_suspended():
+            self.speculation_stats["suspended"] += 1
+            return guess, None
+
+        logger.info(f"Spéculation: Phase 2 '{guess}' lancée en parallèle (confiance {confidence})")
+        self.speculation_stats["launched"] += 1
+        task = asyncio.create_task(self._analyze_specialized(formatted_aff, guess, history_context))
+        return guess, task
+
+    async def _resolve_speculation(self, speculation: Optional[Tuple[str, asyncio.Task]], category: str) -> Optional[str]:
+        """
+        Conserve le résultat spéculatif si la catégorie devinée est la bonne, sinon l'annule.
+
+        Args:
+            speculation: Valeur renvoyée par `_start_speculation`
+            category: Catégorie réellement déterminée par la Phase 1
+
+        Returns:
+            Optional[str]: Texte du verdict spéculatif, ou None s'il faut relancer la Phase 2
+        """
+        if speculation is None:
+            return None
+
+        guess, task = speculation
+        if task is None:
+            # Devinette non lancée : elle ne sert qu'à mesurer la justesse de l'heuristique
+            self._speculation_window.append(guess != category.strip().upper())
+            return None
+        if guess != category.strip().upper():
+            logger.info(f"Spéculation: '{guess}' ≠ '{category}', appel annulé")
+            self._discard_speculation(speculation)
+            return None
+
+        try:
+            analyse = await task
+        except Exception as e:
+            # L'appel spéculatif a échoué : on relance simplement la Phase 2 normale
+            logger.warning(f"Spéculation: échec de l'appel spéculatif ({e})")
+            return None
+        self.speculation_stats["hits"] += 1
+        self._speculation_window.append(False)
+        return analyse
+
+    def _discard_speculation(self, speculation: Optional[Tuple[str, asyncio.Task]]) -> None:
+        """
+        Annule une Phase 2 spéculative devenue inutile et la compte comme dépense perdue.
+
+        Args:
+            speculation: Valeur renvoyée par `_start_speculation`
+        """
+        if speculation is None or speculation[1] is None:
+            return
+        _, task = speculation
+        task.cancel()
+        self.speculation_stats["wasted"] += 1
+        self._speculation_window.append(True)
+
+    @staticmethod
+    def _build_history_context(history: Optional[List[str]]) -> str:
+        """
+        Met en forme l'historique de conversation pour l'insérer en tête du prompt utilisateur.
+
+        Args:
+            history: Liste des affirmations précédentes (optionnelle)
+
+        Returns:
+            str: Bloc de contexte (chaîne vide sans historique)
+        """
+        if not history:
+            return ""
+        history_text = "\n".join([f"- {h}" for h in history])
+        return f"CONTEXTE DE LA CONVERSATION PRÉCÉDENTE (pour référence uniquement) :\n{history_text}\n\n---\n\n"
+
+    @staticmethod
+    def _build_evidence_context(affirmation: Union[str, Dict]) -> str:
+        """
+        Met en forme les extraits de preuves web joints à l'affirmation (clé "passages",
+        voir `evidence.EvidenceFetcher.collect`) pour la Phase 2.
+
+        Args:
+            affirmation: Affirmation à analyser (texte, ou dictionnaire issu du Module 4)
+
+        Returns:
+            str: Bloc de preuves (chaîne vide si aucune preuve n'est jointe)
+        """
+        if not isinstance(affirmation, dict):
+            return ""
+        return format_evidence_context(affirmation.get("passages"))
+
+    def _build_result(
+        self,
+        formatted_aff: str,
+        category: str,
+        analyse: str,
+        mode: str,
+        timing: Optional[Dict[str, Optional[float]]] = None,
+        model: str = Config.DEFAULT_MODEL,
+        status: str = "success"
+    ) -> Dict[str, Any]:
+        """
+        Construit le dictionnaire de résultat commun aux deux modes d'analyse.
+
+        Args:
+            formatted_aff: Affirmation formatée
+            category: Catégorie déterminée
+            analyse: Texte du verdict
+            mode: Mode d'analyse utilisé ("two_phase", "fused" ou "stream")
+            timing: Position dans la vidéo {"start", "end"} (voir `media_timing`), recopiée dans le résultat
+            model: Modèle qui a produit le verdict
+            status: "success", ou "degraded" quand aucun verdict n'a été produit (catégorie seule)
+
+        Returns:
+            Dict[str, Any]: Résultat au format historique {"category", "analyse", "status", "model", "prompts", ...}
+        """
+        return {
+            "affirmation": formatted_aff,
+            "analyse": analyse,
+            "category": category, # On retourne la catégorie !
+            "model": model,
+            "prompts": get_prompts_version(),  # Empreinte des prompts (voir `result_stats`)
+            "mode": mode,
+            "status": status,
+            **(timing or {})
+        }
+
+    def _account(self, response: Any, messages: List[Dict[str, str]], phase: str, model: str, category: Optional[str]) -> None:
+        """
+        Décompte la consommation d'un appel : budget du lot (voir `degradation`) et registre (voir `usage_ledger`).
+
+        Args:
+            response: Réponse de l'API (champ `usage`), ou texte du verdict si l'API n'en a pas renvoyé
+            messages: Messages envoyés
+            phase: "classify", "phase2", "fused" ou "stream"
+            model: Modèle appelé
+            category: Catégorie de l'affirmation
+        """
+        prompt_tokens, completion_tokens, estimated = usage_counts(response, messages)
+        charge_budget(prompt_tokens + completion_tokens)
+        if self.ledger is not None:
+            self.ledger.record(phase, model, prompt_tokens, completion_tokens, estimated, category)
+
+    async def _classify(self, formatted_aff: str, history_context: str = "", model: str = Config.DEFAULT_MODEL) -> str:
+        """
+        Phase 1 : demande au modèle la catégorie de l'affirmation.
+
+        Args:
+            formatted_aff: Affirmation formatée
+            history_context: Contexte de conversation déjà mis en forme
+            model: Modèle à utiliser
+
+        Returns:
+            str: Catégorie validée (l'une des CATEGORIES_VALIDES, voir `parse_category`)
+        """
+        key = ("classify", normalize_query(formatted_aff), model, history_context)
+        return await self.single_flight.do(key, lambda: self._classify_uncoalesced(formatted_aff, history_context, model))
+
+    async def _classify_uncoalesced(self, formatted_aff: str, history_context: str, model: str) -> str:
+        """Appel de classification lui-même (voir `_classify`)."""
+        logger.info(f"Phase 1: Classification de '{formatted_aff[:30]}...'")
+        classification_messages = [
+            {"role": "system", "content": get_system_prompt_classify(self.constrained_classification)},
+            {"role": "user", "content": f"{history_context}AFFIRMATION À CLASSER : \"{formatted_aff}\""}
+        ]
+        # Sortie structurée : le modèle ne peut choisir qu'une des catégories connues
+        response_format = get_classify_response_format() if self.constrained_classification else None
+
+        async with self.scheduler.slot(): # Attend une place (priorité et échéance du contexte, voir `scheduling`)
+            logger.info(f"-> Appel API (Classification) pour '{formatted_aff[:20]}...'")
+            classification_response = await self.client.chat.complete_async(
+                model=model,
+                messages=classification_messages,
+                temperature=0.0,
+                response_format=response_format
+            )
+        # Catégorie validée : une réponse mal formée est corrigée localement, sans nouvel appel
+        category, provenance = parse_category(format_response(classification_response), formatted_aff)
+        self.classification_stats[provenance] += 1
+        self._account(classification_response, classification_messages, "classify", model, category)
+
+        logger.info(f"Phase 1: Catégorie déterminée -> {category}")
+        return category
+
+    async def _analyze_specialized(
+        self,
+        formatted_aff: str,
+        category: str,
+        history_context: str = "",
+        model: str = Config.DEFAULT_MODEL
+    ) -> str:
+        """
+        Phase 2 : analyse spécialisée selon la catégorie trouvée en Phase 1.
+
+        Un appel identique en cours (même affirmation, catégorie et modèle, par exemple une
+        Phase 2 spéculative qui a deviné juste) est partagé au lieu d'être relancé.
+
+        Args:
+            formatted_aff: Affirmation formatée
+            category: Catégorie de l'affirmation
+            history_context: Contexte de conversation (et preuves web) déjà mis en forme
+            model: Modèle à utiliser
+
+        Returns:
+            str: Texte du verdict
+        """
+        key = ("phase2", normalize_query(formatted_aff), category.strip().upper(), model, history_context)
+        return await self.single_flight.do(
+            key, lambda: self._analyze_specialized_uncoalesced(formatted_aff, category, history_context, model)
+        )
+
+    async def _analyze_specialized_uncoalesced(self, formatted_aff: str, category: str, history_context: str, model: str) -> str:
+        """Appel d'analyse spécialisée lui-même (voir `_analyze_specialized`)."""
+        logger.info(f"Phase 2: Lancement de l'analyse spécialisée pour la catégorie '{category}'")
+        system_prompt = get_specialized_system_prompt(category)
+        user_prompt = f"{history_context}Affirmation à analyser: \"{formatted_aff}\""
+
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": user_prompt}
+        ]
+
+        async with self.scheduler.slot(): # Attend une place (priorité et échéance du contexte, voir `scheduling`)
+            logger.info(f"-> Appel API (Analyse) pour '{formatted_aff[:20]}...'")
+            response = await self.client.chat.complete_async(
+                model=model,
+                messages=messages,
+            )
+        self._account(response, messages, "phase2", model, category)
+        return format_response(response)
+
+    async def _analyze_fused(self, formatted_aff: str, history_context: str = "") -> Tuple[str, str]:
+        """
+        Mode fusionné : classification et analyse spécialisée dans un seul appel JSON.
+
+        Args:
+            formatted_aff: Affirmation formatée
+            history_context: Contexte de conversation (et preuves web) déjà mis en forme
+
+        Returns:
+            Tuple[str, str]: (catégorie, analyse)
+
+        Raises:
+            ValueError: Si la réponse ne respecte pas le schéma attendu
+        """
+        logger.info(f"Mode fusionné: Classification + Analyse de '{formatted_aff[:30]}...'")
+        messages = [
+            {"role": "system", "content": get_system_prompt_fused()},
+            {"role": "user", "content": f"{history_context}Affirmation à analyser: \"{formatted_aff}\""}
+        ]
+
+        async with self.scheduler.slot(): # Attend une place (priorité et échéance du contexte, voir `scheduling`)
+            logger.info(f"-> Appel API (Fusionné) pour '{formatted_aff[:20]}...'")
+            response = await self.client.chat.complete_async(
+                model=Config.DEFAULT_MODEL,
+                messages=messages,
+                response_format={"type": "json_object"}
+            )
+        category = None
+        try:
+            category, analyse = parse_fused_response(format_response(response))
+        finally:
+            # Appel payé même si la réponse est hors schéma
+            self._account(response, messages, "fused", Config.DEFAULT_MODEL, category)
+        logger.info(f"Mode fusionné: Catégorie déterminée -> {category}")
+        return category, analyse
 
     async def batch_analyze(self, affirmations: List[Union[str, Dict]], mode: str = "GENERAL") -> List[Dict[str, Any]]:
         """
@@ -258,7 +917,8 @@ class CritiqueAnalyzer:
                     "affirmation": aff_text,
                     "analyse": error_msg,
                     "status": "error",
-                    "error": error_msg
+                    "error": error_msg,
+                    **media_timing(aff)
                 })
         return results
 
@@ -297,7 +957,8 @@ async def fact_checker_batch_async(
                 "affirmation": aff_text,
                 "analyse": error_msg,
                 "status": "error",
-                "error": error_msg
+                "error": error_msg,
+                **media_timing(aff)
             })
     return results
 
@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module d'écriture disque hors de la boucle d'événements.
+
+Sauvegarder un gros fichier de résultats (sérialisation JSON + écriture) directement dans
+une coroutine bloque la boucle asyncio : toutes les requêtes API en cours attendent.
+Ce module déporte ces écritures dans un thread dédié :
+- `BackgroundWriter` : file d'écritures JSON traitée par un thread unique. La sérialisation
+  et l'écriture se font dans ce thread ; l'écriture est atomique (fichier temporaire puis
+  renommage). Si plusieurs sauvegardes du même fichier attendent, seule la dernière est écrite
+  (l'historique, sauvegardé après chaque affirmation, n'est pas réécrit en rafale). `submit`
+  y exécute aussi les autres écritures (piste de verdicts), dans l'ordre des demandes ;
+- `setup_queue_logging` : les gestionnaires de journalisation lents (fichier) reçoivent les
+  messages via un `QueueHandler`, et un `QueueListener` les écrit depuis son propre thread.
+
+Les données passées à `write_json` ne doivent plus être modifiées ensuite : passer une copie
+(`list(self.history)`) pour une structure qui continue d'évoluer.
+"""
+
+import os
+import json
+import queue
+import atexit
+import logging
+import threading
+import logging.handlers
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Rappel appelé dans le thread d'écriture : None si l'écriture a réussi, l'exception sinon
+WriteCallback = Callable[[Optional[Exception]], None]
+
+# =============================================
+# ÉCRITURES JSON EN ARRIÈRE-PLAN
+# =============================================
+
+def write_json_atomic(path: Union[str, Path], data: Any) -> None:
+    """
+    Sérialise et écrit un fichier JSON de manière atomique (jamais de fichier à moitié écrit).
+
+    Args:
+        path: Fichier de sortie
+        data: Données sérialisables en JSON
+    """
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+class BackgroundWriter:
+    """
+    Thread d'écriture unique, alimenté par une file
+
+    `write_json` ne fait qu'enregistrer la demande : l'appelant (la boucle d'événements)
+    n'attend jamais le disque. `flush` attend que toutes les écritures demandées soient faites.
+    """
+
+    def __init__(self):
+        """
+        Initialise l'écrivain (le thread démarre à la première écriture)
+        """
+        # Fichier JSON à écrire, écriture quelconque (fonction, rappel) ou None (arrêt)
+        self._queue: "queue.Queue[Union[Path, Tuple[Callable[[], Any], Optional[WriteCallback]], None]]" = queue.Queue()
+        # Dernière demande en attente pour chaque fichier (les plus anciennes sont remplacées)
+        self._pending: Dict[Path, Tuple[Any, List[WriteCallback]]] = {}
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"requested": 0, "written": 0, "coalesced": 0, "failed": 0}
+
+    def _ensure_started(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="background-writer", daemon=True)
+            self._thread.start()
+
+    def write_json(self, path: Union[str, Path], data: Any, on_done: Optional[WriteCallback] = None) -> None:
+        """
+        Demande l'écriture d'un fichier JSON (retour immédiat)
+
+        Args:
+            path: Fichier de sortie
+            data: Données à écrire (ne plus les modifier après l'appel)
+            on_done: Rappel exécuté dans le thread d'écriture une fois le fichier écrit ou en échec
+        """
+        path = Path(path)
+        with self._lock:
+            self.stats["requested"] += 1
+            callbacks = [on_done] if on_done else []
+            if path in self._pending:
+                # Une écriture de ce fichier attend déjà : on remplace ses données, sa place dans la file est gardée
+                self.stats["coalesced"] += 1
+                self._pending[path] = (data, self._pending[path][1] + callbacks)
+                return
+            self._pending[path] = (data, callbacks)
+            self._ensure_started()
+        self._queue.put(path)
+
+    def submit(self, func: Callable[[], Any], on_done: Optional[WriteCallback] = None) -> None:
+        """
+        Demande une écriture quelconque (retour immédiat), exécutée dans l'ordre des demandes
+
+        Args:
+            func: Fonction d'écriture, appelée sans argument dans le thread d'écriture
+            on_done: Rappel exécuté dans le thread d'écriture une fois la fonction terminée ou en échec
+        """
+        with self._lock:
+            self.stats["requested"] += 1
+            self._ensure_started()
+        self._queue.put((func, on_done))
+
+    def _run_submitted(self, func: Callable[[], Any], on_done: Optional[WriteCallback]) -> None:
+        error: Optional[Exception] = None
+        try:
+            func()
+            self.stats["written"] += 1
+        except Exception as e:
+            error = e
+            self.stats["failed"] += 1
+            if on_done is None:
+                logger.error(f"Erreur lors d'une écriture en arrière-plan: {str(e)}")
+        if on_done is not None:
+            try:
+                on_done(error)
+            except Exception as e:
+                logger.error(f"Erreur dans le rappel d'écriture: {str(e)}")
+
+    def _run(self) -> None:
+        while True:
+            path = self._queue.get()
+            try:
+                if path is None:
+                    return
+                if isinstance(path, tuple):
+                    self._run_submitted(*path)
+                    continue
+                with self._lock:
+                    data, callbacks = self._pending.pop(path)
+                error: Optional[Exception] = None
+                try:
+                    write_json_atomic(path, data)
+                    self.stats["written"] += 1
+                except Exception as e:
+                    error = e
+                    self.stats["failed"] += 1
+                    if not callbacks:
+                        logger.error(f"Erreur lors de l'écriture de {path}: {str(e)}")
+                for callback in callbacks:
+                    try:
+                        callback(error)
+                    except Exception as e:
+                        logger.error(f"Erreur dans le rappel d'écriture de {path}: {str(e)}")
+            finally:
+                self._queue.task_done()
+
+    def flush(self) -> None:
+        """
+        Attend que toutes les écritures demandées soient terminées (bloquant : depuis une
+        coroutine, utiliser `await asyncio.to_thread(writer.flush)`).
+        """
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.join()
+
+    def close(self) -> None:
+        """
+        Termine les écritures en attente puis arrête le thread.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        self._thread = None
+
+_writer: Optional[BackgroundWriter] = None
+
+def get_background_writer() -> BackgroundWriter:
+    """
+    Renvoie l'écrivain partagé par le processus (ses écritures sont terminées à la sortie du programme).
+
+    Returns:
+        BackgroundWriter: Écrivain partagé
+    """
+    global _writer
+    if _writer is None:
+        _writer = BackgroundWriter()
+        atexit.register(_writer.close)
+    return _writer
+
+# =============================================
+# JOURNALISATION VIA UNE FILE
+# =============================================
+
+def setup_queue_logging(
+    handlers: List[logging.Handler],
+    level: int = logging.INFO,
+    fmt: str = '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    direct_handlers: Optional[List[logging.Handler]] = None
+) -> logging.handlers.QueueListener:
+    """
+    Configure la journalisation racine : `handlers` sont alimentés depuis un thread dédié.
+
+    Args:
+        handlers: Gestionnaires lents (fichier...), écrits par le `QueueListener`
+        level: Niveau de journalisation
+        fmt: Format des messages
+        direct_handlers: Gestionnaires appelés directement (console : garde l'ordre avec les `print`)
+
+    Returns:
+        logging.handlers.QueueListener: Écouteur démarré (arrêté automatiquement à la sortie)
+    """
+    formatter = logging.Formatter(fmt)
+    for handler in handlers + (direct_handlers or []):
+        handler.setFormatter(formatter)
+
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    for handler in direct_handlers or []:
+        root.addHandler(handler)
+    return listener
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module d'ingestion en masse des archives de sous-titres (VTT/SRT).
+
+Les fichiers d'un dossier (ou d'un motif glob) sont parsés en parallèle sur tous les
+cœurs avec un pool de processus. Chaque fichier produit un "shard" compact sur disque
+(JSON Lines compressé gzip, une phrase horodatée par ligne). Un manifeste garde
+l'empreinte SHA-256 de chaque fichier source : les fichiers inchangés depuis la
+dernière exécution ne sont pas reparsés.
+
+Lancer depuis src/ :
+    python -m core.bulk_ingestion "../data/input/*.vtt" --output ../data/shards --workers 4
+"""
+
+import os
+import sys
+import glob
+import gzip
+import json
+import hashlib
+import logging
+import argparse
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional
+
+from .ingestion_pipeline import IncrementalCaptionParser
+
+logger = logging.getLogger(__name__)
+
+# =============================================
+# CONSTANTES
+# =============================================
+CAPTION_EXTENSIONS = (".vtt", ".srt")
+MANIFEST_NAME = "manifest.json"
+DEFAULT_SHARD_DIR = Path(__file__).resolve().parents[2] / "data" / "shards"
+
+# =============================================
+# TRAVAIL D'UN PROCESSUS DU POOL
+# =============================================
+
+def file_sha256(data: bytes) -> str:
+    """Empreinte SHA-256 (hexadécimale) du contenu d'un fichier."""
+    return hashlib.sha256(data).hexdigest()
+
+def ingest_caption_file(source: str, output_dir: str, known_hash: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Parse un fichier VTT/SRT et écrit son shard (exécuté dans un processus du pool).
+
+    Args:
+        source: Chemin du fichier de sous-titres
+        output_dir: Dossier des shards
+        known_hash: Empreinte enregistrée lors de la dernière exécution (None si nouveau fichier)
+
+    Returns:
+        Dict[str, Any]: Entrée du manifeste {"source", "hash", "shard", "sentences", "status"}
+    """
+    try:
+        with open(source, 'rb') as f:
+            data = f.read()
+        digest = file_sha256(data)
+        shard_name = f"{digest[:16]}.jsonl.gz"
+        shard_path = os.path.join(output_dir, shard_name)
+        if digest == known_hash and os.path.exists(shard_path):
+            return {"source": source, "hash": digest, "shard": shard_name, "status": "skipped"}
+
+        parser = IncrementalCaptionParser()
+        sentences = parser.feed(data.decode("utf-8", errors="replace")) + parser.flush()
+
+        # Écriture atomique : fichier temporaire puis renommage
+        tmp_path = f"{shard_path}.tmp"
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            for sentence in sentences:
+                # Format compact : [début, fin, texte]
+                f.write(json.dumps([sentence["start"], sentence["end"], sentence["text"]], ensure_ascii=False))
+                f.write("\n")
+        os.replace(tmp_path, shard_path)
+        return {"source": source, "hash": digest, "shard": shard_name, "sentences": len(sentences), "status": "parsed"}
+
+    except Exception as e:
+        return {"source": source, "status": "error", "error": str(e)}
+
+# =============================================
+# ORCHESTRATION
+# =============================================
+
+def find_caption_files(pattern: str) -> List[str]:
+    """
+    Liste les fichiers de sous-titres désignés par un dossier ou un motif glob.
+
+    Args:
+        pattern: Dossier (parcouru récursivement) ou motif glob ("archives/**/*.vtt")
+
+    Returns:
+        List[str]: Chemins triés des fichiers .vtt/.srt
+    """
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, "**", "*")
+    return sorted(
+        path for path in glob.glob(pattern, recursive=True)
+        if os.path.isfile(path) and path.lower().endswith(CAPTION_EXTENSIONS)
+    )
+
+def load_manifest(output_dir: Path) -> Dict[str, Dict[str, Any]]:
+    """
+    Charge le manifeste des exécutions précédentes (vide s'il n'existe pas).
+
+    Args:
+        output_dir: Dossier des shards
+
+    Returns:
+        Dict[str, Dict[str, Any]]: Entrées du manifeste indexées par chemin source
+    """
+    manifest_path = output_dir / MANIFEST_NAME
+    if not manifest_path.exists():
+        return {}
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        logger.error(f"Manifeste illisible, réingestion complète: {str(e)}")
+        return {}
+
+def ingest_directory(
+    pattern: str,
+    output_dir: Path = DEFAULT_SHARD_DIR,
+    workers: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    Ingère en parallèle tous les fichiers de sous-titres d'un dossier ou d'un motif glob.
+
+    Args:
+        pattern: Dossier ou motif glob des fichiers à ingérer
+        output_dir: Dossier des shards et du manifeste
+        workers: Nombre de processus (par défaut : nombre de cœurs)
+
+    Returns:
+        List[Dict[str, Any]]: Une entrée par fichier (statut "parsed", "skipped" ou "error")
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = load_manifest(output_dir)
+    sources = [os.path.abspath(path) for path in find_caption_files(pattern)]
+    if not sources:
+        return []
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=min(workers, len(sources))) as pool:
+        futures = [
+            pool.submit(ingest_caption_file, source, str(output_dir), manifest.get(source, {}).get("hash"))
+            for source in sources
+        ]
+        entries = [future.result() for future in futures]
+
+    for entry in entries:
+        if entry["status"] == "parsed":
+            manifest[entry["source"]] = {key: entry[key] for key in ("hash", "shard", "sentences")}
+        elif entry["status"] == "error":
+            logger.error(f"Échec de l'ingestion de {entry['source']}: {entry['error']}")
+
+    tmp_path = output_dir / f"{MANIFEST_NAME}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, output_dir / MANIFEST_NAME)
+    return entries
+
+def read_shard(shard_path: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Relit un shard phrase par phrase (sans tout charger en mémoire).
+
+    Args:
+        shard_path: Chemin du fichier .jsonl.gz
+
+    Yields:
+        Dict[str, Any]: Phrase {"text", "start", "end"}
+    """
+    with gzip.open(shard_path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            start, end, text = json.loads(line)
+            yield {"text": text, "start": start, "end": end}
+
+# --- Exemple d'utilisation du module ---
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    cli = argparse.ArgumentParser(description="Ingestion en masse de sous-titres VTT/SRT")
+    cli.add_argument("pattern", help="Dossier ou motif glob (ex: 'archives/**/*.vtt')")
+    cli.add_argument("--output", type=Path, default=DEFAULT_SHARD_DIR, help="Dossier des shards")
+    cli.add_argument("--workers", type=int, default=None, help="Nombre de processus (défaut : nombre de cœurs)")
+    args = cli.parse_args()
+
+    results = ingest_directory(args.pattern, args.output, args.workers)
+    counts = {status: sum(1 for r in results if r["status"] == status) for status in ("parsed", "skipped", "error")}
+    print(f"{len(results)} fichiers : {counts['parsed']} parsés, {counts['skipped']} inchangés, {counts['error']} erreurs")
+    sys.exit(1 if counts["error"] else 0)
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module d'extraction des affirmations vérifiables (Modules 1 & 2).
+
+Remplace la simulation NLP : le texte est découpé en phrases avec des règles adaptées
+au français, puis chaque phrase reçoit un score de "vérifiabilité" (chiffres, entités
+nommées, vocabulaire juridique, comparatifs). Seules les meilleures phrases, dans la
+limite d'un budget, partent vers l'analyse IA. Tout tourne en local, sur CPU, sans réseau.
+"""
+
+import re
+from typing import Any, Dict, List, Union
+
+from .utils import Config
+from .heuristics import NUMBER_PATTERN, STAT_TERMS_PATTERN, LEGAL_TERMS_PATTERN, POLITENESS_PATTERN
+
+# =============================================
+# DÉCOUPAGE EN PHRASES (RÈGLES FRANÇAISES)
+# =============================================
+# Abréviations françaises suivies d'un point qui ne terminent pas une phrase
+ABREVIATIONS = {
+    "etc", "cf", "art", "av", "bd", "env", "ex", "fig", "vol", "chap",
+    "approx", "hab", "janv", "févr", "avr", "juil", "sept", "oct", "nov", "déc",
+}
+# Titres : abréviations seulement avec la majuscule ("M. Dupont", "Me Martin", mais "3 m." ou "il me.")
+TITLE_ABBREVIATIONS = {"M", "MM", "Mme", "Mmes", "Mlle", "Mlles", "Dr", "Pr", "Me", "Mgr", "St", "Ste"}
+# Mots courants qui ne sont des abréviations que devant un nombre ("p. 12", "n. 3", "max. 5 %")
+NUMBERED_ABBREVIATIONS = {"n", "no", "p", "pp", "min", "max"}
+# Fin de phrase candidate : ponctuation forte, guillemet fermant éventuel, puis espace
+SENTENCE_BOUNDARY_PATTERN = re.compile(r'([.?!…]+)([»”")]*)\s+')
+# Mot qui précède immédiatement la ponctuation (pour repérer les abréviations et les initiales)
+LAST_WORD_PATTERN = re.compile(r'([\wÀ-ÿ-]+)$')
+# Début de phrase plausible après un point : majuscule, chiffre, guillemet ou tiret de dialogue
+SENTENCE_START_PATTERN = re.compile(r'[«"“(—–-]?\s*[A-ZÀ-ÖØ-Þ0-9]')
+# Ponctuation forte en fin de texte (guillemet fermant éventuel)
+TRAILING_END_PATTERN = re.compile(r'([.?!…]+)([»”")]*)$')
+
+def _is_abbreviation(word: str, following: str = "") -> bool:
+    """Abréviation connue ou initiale d'un prénom (une seule majuscule), selon le texte qui suit le point."""
+    if word in TITLE_ABBREVIATIONS or word.lower() in ABREVIATIONS or (len(word) == 1 and word.isupper()):
+        return True
+    return word.lower() in NUMBERED_ABBREVIATIONS and following[:1].isdigit()
+
+def split_sentences_fr(text: str) -> List[str]:
+    """
+    Découpe un texte français en phrases.
+
+    Règles : pas de coupure après une abréviation (M., Mme, art., etc.), une initiale
+    (J. Dupont) ou à l'intérieur d'un nombre (3.5) ; après un point simple, la phrase
+    suivante doit commencer par une majuscule, un chiffre ou un guillemet.
+
+    Args:
+        text: Texte à découper
+
+    Returns:
+        List[str]: Phrases nettoyées, dans l'ordre
+    """
+    text = " ".join(text.split())
+    sentences = []
+    start = 0
+    for match in SENTENCE_BOUNDARY_PATTERN.finditer(text):
+        punctuation = match.group(1)
+        before = text[start:match.start()]
+        if punctuation == ".":
+            last_word = LAST_WORD_PATTERN.search(before)
+            if _is_abbreviation(last_word.group(1) if last_word else "", text[match.end():]):
+                continue
+            if not SENTENCE_START_PATTERN.match(text, match.end()):
+                continue
+        sentence = text[start:match.end()].strip()
+        if sentence:
+            sentences.append(sentence)
+        start = match.end()
+
+    remainder = text[start:].strip()
+    if remainder:
+        sentences.append(remainder)
+    return sentences
+
+def ends_sentence(text: str) -> bool:
+    """
+    Indique si un texte se termine par une fin de phrase (et non par une abréviation).
+
+    Sert au découpage incrémental des sous-titres (voir `IncrementalCaptionParser`) : un
+    morceau qui finit par "M." attend la cue suivante au lieu d'être émis seul.
+
+    Args:
+        text: Fin du texte en cours
+
+    Returns:
+        bool: True si la dernière phrase est complète
+    """
+    text = text.rstrip()
+    match = TRAILING_END_PATTERN.search(text)
+    if not match:
+        return False
+    if match.group(1) == ".":
+        last_word = LAST_WORD_PATTERN.search(text[:match.start()])
+        return not _is_abbreviation(last_word.group(1) if last_word else "")
+    return True
+
+# =============================================
+# SCORE DE VÉRIFIABILITÉ
+# =============================================
+# Comparatifs et superlatifs : "plus ... que", "le plus", "record", "deux fois plus"...
+COMPARATIVE_PATTERN = re.compile(
+    r"\b(?:plus|moins|davantage|autant|supérieur\w*|inférieur\w*|meilleur\w*|pire|record|jamais|"
+    r"premier|première|dernier|dernière|double|triple|moitié|fois)\b",
+    re.IGNORECASE
+)
+# Entités nommées approximatives : sigles (INSEE, RN) et mots capitalisés hors début de phrase
+ACRONYM_PATTERN = re.compile(r'\b[A-ZÀ-Þ]{2,}\b')
+CAPITALIZED_PATTERN = re.compile(r'(?<=\s)[A-ZÀ-ÖØ-Þ][a-zà-öø-ÿ]+')
+# Heures de l'émission ("il est 8h48") : ce sont des chiffres, mais pas des données à vérifier
+CLOCK_TIME_PATTERN = re.compile(r'\b\d{1,2}\s?h\s?\d{2}\b')
+# Phrases sans contenu vérifiable : politesse (voir `heuristics.POLITENESS_PATTERN`) et opinions à la première personne
+OPINION_PATTERN = re.compile(r"\b(?:je pense|je crois|à mon avis|selon moi|j'ai l'impression)\b", re.IGNORECASE)
+
+# Poids de chaque indice dans le score
+CLAIM_WEIGHTS = {
+    "number": 2.0,
+    "stat_term": 1.0,
+    "legal_term": 1.5,
+    "entity": 0.5,
+    "comparative": 1.0,
+}
+MAX_ENTITIES_COUNTED = 3
+
+def score_check_worthiness(sentence: str) -> float:
+    """
+    Calcule le score de vérifiabilité d'une phrase (0 = rien à vérifier).
+
+    Args:
+        sentence: Phrase à évaluer
+
+    Returns:
+        float: Score (plus il est élevé, plus la phrase mérite une vérification)
+    """
+    if POLITENESS_PATTERN.match(sentence):
+        return 0.0
+
+    entities = len(ACRONYM_PATTERN.findall(sentence)) + len(CAPITALIZED_PATTERN.findall(sentence))
+    numbers = len(NUMBER_PATTERN.findall(CLOCK_TIME_PATTERN.sub(' ', sentence)))
+    score = (
+        CLAIM_WEIGHTS["number"] * min(numbers, 2)
+        + CLAIM_WEIGHTS["stat_term"] * min(len(STAT_TERMS_PATTERN.findall(sentence)), 2)
+        + CLAIM_WEIGHTS["legal_term"] * min(len(LEGAL_TERMS_PATTERN.findall(sentence)), 2)
+        + CLAIM_WEIGHTS["entity"] * min(entities, MAX_ENTITIES_COUNTED)
+        + CLAIM_WEIGHTS["comparative"] * min(len(COMPARATIVE_PATTERN.findall(sentence)), 2)
+    )
+
+    # Pénalités : questions, phrases très courtes, opinions déclarées
+    if sentence.rstrip().endswith("?"):
+        score *= 0.3
+    if len(sentence.split()) < 6:
+        score *= 0.5
+    if OPINION_PATTERN.search(sentence):
+        score *= 0.5
+    return round(score, 3)
+
+def extract_claims(
+    sentences: List[Union[str, Dict[str, Any]]],
+    budget: int = Config.CLAIM_BUDGET,
+    min_score: float = Config.CLAIM_MIN_SCORE
+) -> List[Union[str, Dict[str, Any]]]:
+    """
+    Garde les phrases les plus vérifiables, dans la limite du budget.
+
+    Args:
+        sentences: Phrases (texte brut, ou dictionnaires avec une clé "text" comme ceux de l'ingestion)
+        budget: Nombre maximal de phrases conservées
+        min_score: Score minimal pour être conservée
+
+    Returns:
+        List[Union[str, Dict[str, Any]]]: Phrases retenues, dans leur ordre d'origine
+    """
+    scored = []
+    for index, item in enumerate(sentences):
+        text = item["text"] if isinstance(item, dict) else item
+        score = score_check_worthiness(text)
+        if score >= min_score:
+            scored.append((score, index))
+
+    # Tri par score décroissant (ordre d'origine en cas d'égalité), puis retour à l'ordre du texte
+    best = sorted(scored, key=lambda pair: (-pair[0], pair[1]))[:budget]
+    return [sentences[index] for _, index in sorted(best, key=lambda pair: pair[1])]
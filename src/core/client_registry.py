@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module de registre des clients HTTP partagés par tout le processus.
+
+Chaque point d'entrée créait son propre client `Mistral` (et donc ses propres connexions) :
+chaque nouvel appel pouvait payer une poignée de main TCP/TLS. Le registre garde un seul
+client Mistral par clé API et un seul client HTTP générique (preuves web), avec :
+- des connexions persistantes (keep-alive) et des tailles de pool configurables ;
+- HTTP/2 si le paquet optionnel `h2` est installé (`pip install httpx[http2]`), sinon HTTP/1.1 keep-alive ;
+- un appel de préchauffage au démarrage, qui ouvre la connexion avant la première affirmation ;
+- des compteurs de réutilisation des connexions (`connection_stats`).
+
+Les clients asynchrones sont liés à la boucle d'événements qui les utilise : appeler
+`close_clients()` avant la fin de `asyncio.run`.
+"""
+
+import os
+import time
+import asyncio
+import hashlib
+import logging
+from typing import Any, Dict, Optional, Set
+
+import httpx
+
+from .utils import Config, AnalysisError
+
+logger = logging.getLogger(__name__)
+
+# =============================================
+# STATISTIQUES DE RÉUTILISATION DES CONNEXIONS
+# =============================================
+# "requests" : requêtes envoyées ; "new_connections" : connexions TCP ouvertes ;
+# "handshake_s" : temps cumulé passé en connexion TCP + TLS
+_stats: Dict[str, float] = {"requests": 0, "new_connections": 0, "handshake_s": 0.0}
+
+# Étapes de l'ouverture d'une connexion (événements de trace de httpcore)
+HANDSHAKE_STEPS = ("connection.connect_tcp", "connection.start_tls")
+
+async def _on_request(request: httpx.Request) -> None:
+    """Crochet httpx : compte la requête et suit l'ouverture éventuelle d'une connexion."""
+    _stats["requests"] += 1
+    started: Dict[str, float] = {}
+
+    async def trace(event_name: str, info: Dict[str, Any]) -> None:
+        step, _, phase = event_name.rpartition(".")
+        if step not in HANDSHAKE_STEPS:
+            return
+        if phase == "started":
+            started[step] = time.perf_counter()
+            if step == "connection.connect_tcp":
+                _stats["new_connections"] += 1
+        elif phase == "complete" and step in started:
+            _stats["handshake_s"] += time.perf_counter() - started.pop(step)
+
+    request.extensions["trace"] = trace
+
+def connection_stats() -> Dict[str, Any]:
+    """
+    Renvoie les compteurs de réutilisation des connexions depuis le début du processus.
+
+    Returns:
+        Dict[str, Any]: {"requests", "new_connections", "reused", "reuse_rate", "handshake_s", "http2"}
+    """
+    requests = int(_stats["requests"])
+    new_connections = int(_stats["new_connections"])
+    reused = max(0, requests - new_connections)
+    return {
+        "requests": requests,
+        "new_connections": new_connections,
+        "reused": reused,
+        "reuse_rate": round(reused / requests, 3) if requests else 0.0,
+        "handshake_s": round(_stats["handshake_s"], 3),
+        "http2": http2_available(),
+    }
+
+# =============================================
+# CONSTRUCTION DES CLIENTS
+# =============================================
+
+def http2_available() -> bool:
+    """HTTP/2 nécessite le paquet optionnel `h2`."""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def _limits() -> httpx.Limits:
+    """Tailles du pool de connexions (voir `Config.HTTP_*`)."""
+    return httpx.Limits(
+        max_connections=Config.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=Config.HTTP_MAX_KEEPALIVE,
+        keepalive_expiry=Config.HTTP_KEEPALIVE_EXPIRY,
+    )
+
+def build_async_http_client(**kwargs) -> httpx.AsyncClient:
+    """
+    Crée un client HTTP asynchrone avec pool de connexions persistantes et suivi de réutilisation.
+
+    Args:
+        **kwargs: Options httpx supplémentaires (timeout, headers, follow_redirects...)
+
+    Returns:
+        httpx.AsyncClient: Client configuré
+    """
+    kwargs.setdefault("timeout", Config.TIMEOUT)
+    return httpx.AsyncClient(
+        http2=http2_available(),
+        limits=_limits(),
+        event_hooks={"request": [_on_request]},
+        **kwargs
+    )
+
+_mistral_clients: Dict[str, Any] = {}
+_http_client: Optional[httpx.AsyncClient] = None
+_warmup_tasks: Set[asyncio.Task] = set()
+
+def get_shared_mistral_client(api_key: Optional[str] = None) -> Any:
+    """
+    Renvoie le client Mistral partagé pour cette clé API (créé au premier appel).
+
+    Args:
+        api_key: Clé API MistralAI (par défaut : variable d'environnement MISTRAL_API_KEY)
+
+    Returns:
+        Any: Client `Mistral` dont les appels asynchrones passent par le pool partagé
+
+    Raises:
+        AnalysisError: Si mistralai est absent ou si la clé API est manquante
+    """
+    try:
+        from mistralai import Mistral
+    except ImportError as e:
+        raise AnalysisError(f"Erreur critique: Impossible de charger mistralai: {str(e)}")
+
+    api_key = api_key or os.getenv("MISTRAL_API_KEY")
+    if not api_key:
+        raise AnalysisError("Clé API MistralAI non configurée")
+
+    # La clé n'est jamais gardée en clair comme index du registre
+    key = hashlib.sha256(api_key.encode("utf-8")).hexdigest()
+    if key not in _mistral_clients:
+        _mistral_clients[key] = Mistral(
+            api_key=api_key,
+            client=httpx.Client(limits=_limits(), timeout=Config.TIMEOUT),
+            async_client=build_async_http_client(),
+        )
+        logger.info(f"Client Mistral partagé créé (HTTP/2: {http2_available()}, pool: {Config.HTTP_MAX_CONNECTIONS})")
+    return _mistral_clients[key]
+
+def get_shared_http_client() -> httpx.AsyncClient:
+    """
+    Renvoie le client HTTP générique partagé (téléchargement des preuves web).
+
+    Returns:
+        httpx.AsyncClient: Client partagé
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = build_async_http_client(
+            timeout=Config.EVIDENCE_FETCH_TIMEOUT,
+            follow_redirects=True,
+            headers={"User-Agent": "CodeCitoyen-FactChecker/1.0"},
+        )
+    return _http_client
+
+async def warmup(client: Any) -> bool:
+    """
+    Ouvre la connexion vers l'API avant la première affirmation (appel léger : liste des modèles).
+
+    Args:
+        client: Client Mistral
+
+    Returns:
+        bool: True si le préchauffage a réussi (un échec n'est jamais bloquant)
+    """
+    start = time.perf_counter()
+    try:
+        await client.models.list_async()
+        logger.info(f"Préchauffage de la connexion Mistral: {time.perf_counter() - start:.2f}s")
+        return True
+    except Exception as e:
+        logger.warning(f"Préchauffage de la connexion Mistral impossible: {str(e)}")
+        return False
+
+def start_warmup(client: Any) -> asyncio.Task:
+    """
+    Lance le préchauffage en tâche de fond : le démarrage n'attend pas le réseau.
+
+    Args:
+        client: Client Mistral
+
+    Returns:
+        asyncio.Task: Tâche de préchauffage (annulée par `close_clients` si elle n'est pas finie)
+    """
+    task = asyncio.create_task(warmup(client))
+    _warmup_tasks.add(task)
+    task.add_done_callback(_warmup_tasks.discard)
+    return task
+
+async def close_clients() -> None:
+    """
+    Ferme tous les clients partagés (à appeler avant la fin de la boucle d'événements).
+    """
+    global _http_client
+    for task in list(_warmup_tasks):
+        task.cancel()
+    for client in _mistral_clients.values():
+        await client.sdk_configuration.async_client.aclose()
+        client.sdk_configuration.client.close()
+    _mistral_clients.clear()
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module de contexte glissant (Rolling Context) pour les transcriptions live.
+
+Le paramètre `history` de `CritiqueAnalyzer.analyze` est recopié dans chaque prompt.
+Lui passer toute la transcription d'un débat ferait croître le coût de chaque appel
+linéairement. Ce module garde une fenêtre bornée (K dernières phrases et budget de
+tokens), sans doublons, et fige le préfixe de contexte entre deux rafraîchissements
+pour que des affirmations consécutives partagent exactement le même préfixe.
+"""
+
+from collections import deque
+from typing import Deque, List
+
+from .utils import Config
+
+# Approximation grossière du nombre de tokens pour le français (≈ 4 caractères par token)
+CHARS_PER_TOKEN = 4
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estime le nombre de tokens d'un texte sans tokenizer.
+
+    Args:
+        text: Texte à estimer
+
+    Returns:
+        int: Nombre de tokens estimé (au moins 1 pour un texte non vide)
+    """
+    return max(1, len(text) // CHARS_PER_TOKEN) if text else 0
+
+def _normalize(text: str) -> str:
+    """Clé de déduplication : minuscules, espaces compactés."""
+    return " ".join(text.lower().split())
+
+class RollingContext:
+    """
+    Fenêtre de contexte bornée pour le paramètre `history`
+
+    Cette classe gère :
+    - Les K dernières phrases prononcées, dédupliquées
+    - Un budget de tokens pour le contexte injecté
+    - Un préfixe figé, rafraîchi toutes les `refresh_every` nouvelles phrases
+    """
+
+    def __init__(
+        self,
+        max_sentences: int = Config.CONTEXT_MAX_SENTENCES,
+        max_tokens: int = Config.CONTEXT_MAX_TOKENS,
+        refresh_every: int = Config.CONTEXT_REFRESH_EVERY
+    ):
+        """
+        Initialise la fenêtre de contexte
+
+        Args:
+            max_sentences: Nombre maximal de phrases gardées (K)
+            max_tokens: Budget de tokens du contexte injecté
+            refresh_every: Nombre de nouvelles phrases avant de rafraîchir le préfixe figé
+        """
+        self.max_sentences = max_sentences
+        self.max_tokens = max_tokens
+        self.refresh_every = max(1, refresh_every)
+        self._window: Deque[str] = deque(maxlen=max_sentences)
+        self._frozen: List[str] = []
+        self._added_since_refresh = 0
+
+    def add(self, sentence: str) -> None:
+        """
+        Ajoute une phrase prononcée à la fenêtre (ignorée si déjà présente)
+
+        Args:
+            sentence: Phrase de la transcription
+        """
+        sentence = sentence.strip()
+        if not sentence:
+            return
+        key = _normalize(sentence)
+        if any(_normalize(existing) == key for existing in self._window):
+            return
+        self._window.append(sentence)
+        self._added_since_refresh += 1
+        if self._added_since_refresh >= self.refresh_every:
+            self.refresh()
+
+    def refresh(self) -> None:
+        """
+        Recalcule le préfixe figé : les phrases les plus récentes qui tiennent dans le budget
+        """
+        selected: List[str] = []
+        budget = self.max_tokens
+        for sentence in reversed(self._window):
+            cost = estimate_tokens(sentence)
+            if cost > self.max_tokens:
+                # Phrase trop longue pour tenir seule dans le budget : on la saute
+                continue
+            if cost > budget:
+                break
+            selected.append(sentence)
+            budget -= cost
+        self._frozen = list(reversed(selected))
+        self._added_since_refresh = 0
+
+    def get_context(self) -> List[str]:
+        """
+        Renvoie le contexte à passer en `history` (identique tant qu'il n'est pas rafraîchi)
+
+        Returns:
+            List[str]: Phrases du préfixe figé, de la plus ancienne à la plus récente
+        """
+        return list(self._frozen)
+
+    def clear(self) -> None:
+        """
+        Vide la fenêtre et le préfixe figé
+        """
+        self._window.clear()
+        self._frozen = []
+        self._added_since_refresh = 0
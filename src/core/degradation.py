@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module de dégradation progressive sous échéance et budget.
+
+En direct, un verdict qui arrive une minute trop tard ne sert plus à rien, et `analyze`
+avec ses réessais peut prendre `MAX_RETRIES × (TIMEOUT + RETRY_DELAY)`. Une affirmation
+peut donc recevoir une échéance (heure limite) et un lot un budget de tokens (`RunBudget`).
+Quand le temps ou le budget manque, l'analyse descend d'un niveau au lieu d'échouer :
+
+0. "full"          : analyse complète (preuves web comprises) avec le modèle par défaut ;
+1. "no_evidence"   : sans les extraits de preuves (prompt plus court) ;
+2. "cheap_model"   : sans preuves, avec le modèle économique (`Config.CHEAP_MODEL`) ;
+3. "category_only" : aucun appel de plus, catégorie seule (Phase 1 déjà obtenue, sinon heuristique locale).
+
+Le niveau atteint est recopié dans le résultat (clé "degradation").
+Voir `CritiqueAnalyzer.analyze_within`.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+from .utils import Config
+
+# =============================================
+# NIVEAUX DE DÉGRADATION
+# =============================================
+LEVEL_FULL = 0
+LEVEL_NO_EVIDENCE = 1
+LEVEL_CHEAP_MODEL = 2
+LEVEL_CATEGORY_ONLY = 3
+LEVEL_NAMES = {
+    LEVEL_FULL: "full",
+    LEVEL_NO_EVIDENCE: "no_evidence",
+    LEVEL_CHEAP_MODEL: "cheap_model",
+    LEVEL_CATEGORY_ONLY: "category_only",
+}
+
+# =============================================
+# BUDGET DE TOKENS D'UN LOT
+# =============================================
+
+class RunBudget:
+    """
+    Budget de tokens partagé par toutes les affirmations d'un lot
+    """
+
+    def __init__(self, max_tokens: int):
+        """
+        Initialise le budget
+
+        Args:
+            max_tokens: Tokens (prompt + réponse) autorisés pour tout le lot
+        """
+        self.max_tokens = max_tokens
+        self.used = 0
+
+    def charge(self, tokens: int) -> None:
+        """Décompte les tokens d'un appel."""
+        self.used += tokens
+
+    @property
+    def remaining_share(self) -> float:
+        """Part du budget encore disponible (entre 0 et 1)."""
+        return max(0.0, 1 - self.used / self.max_tokens) if self.max_tokens else 0.0
+
+    def floor_level(self) -> int:
+        """
+        Niveau de dégradation minimal imposé par le budget restant
+
+        Returns:
+            int: LEVEL_FULL tant que le budget est confortable, puis de plus en plus dégradé
+        """
+        share = self.remaining_share
+        if share <= 0:
+            return LEVEL_CATEGORY_ONLY
+        if share < Config.BUDGET_CHEAP_MODEL_BELOW:
+            return LEVEL_CHEAP_MODEL
+        if share < Config.BUDGET_NO_EVIDENCE_BELOW:
+            return LEVEL_NO_EVIDENCE
+        return LEVEL_FULL
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        État du budget
+
+        Returns:
+            Dict[str, Any]: {"max_tokens", "used", "remaining_share"}
+        """
+        return {"max_tokens": self.max_tokens, "used": self.used, "remaining_share": round(self.remaining_share, 3)}
+
+# Budget du travail en cours (porté par le contexte asyncio, comme la priorité de `scheduler`)
+_current_budget: ContextVar[Optional[RunBudget]] = ContextVar("run_budget", default=None)
+
+@contextmanager
+def budgeting(budget: Optional[RunBudget]) -> Iterator[None]:
+    """
+    Décompte les appels API lancés dans ce bloc (tâches filles comprises) sur `budget`
+
+    Args:
+        budget: Budget du lot (None : aucun décompte)
+    """
+    token = _current_budget.set(budget)
+    try:
+        yield
+    finally:
+        _current_budget.reset(token)
+
+def charge_budget(tokens: int) -> None:
+    """
+    Décompte les tokens d'un appel sur le budget du contexte courant (sans effet hors de `budgeting`)
+
+    Args:
+        tokens: Tokens du prompt et de la réponse (voir `usage_ledger.usage_counts`)
+    """
+    budget = _current_budget.get()
+    if budget is not None:
+        budget.charge(tokens)
+
+# =============================================
+# ÉCHÉANCE
+# =============================================
+
+def step_timeout(deadline: Optional[float], level: int) -> Optional[float]:
+    """
+    Temps accordé à un niveau avant de passer au suivant
+
+    Le dernier niveau avec appel API ("cheap_model") dispose de tout le temps restant ; les
+    précédents n'en prennent qu'une part (`Config.DEGRADATION_STEP_SHARE`) pour laisser
+    aux niveaux moins coûteux le temps d'aboutir.
+
+    Args:
+        deadline: Échéance absolue (`time.time()`), ou None
+        level: Niveau tenté
+
+    Returns:
+        Optional[float]: Délai en secondes (None : pas de limite), 0 si l'échéance est passée
+    """
+    if deadline is None:
+        return None
+    remaining = max(0.0, deadline - time.time())
+    return remaining if level >= LEVEL_CHEAP_MODEL else remaining * Config.DEGRADATION_STEP_SHARE
+
+def count_levels(results: List[Dict[str, Any]]) -> Dict[str, int]:
+    """
+    Compte les résultats par niveau de dégradation (ceux analysés sans échéance ni budget n'en ont pas)
+
+    Args:
+        results: Résultats (bruts, ou enveloppés dans "result" par `AffirmationProcessor`)
+
+    Returns:
+        Dict[str, int]: {nom du niveau: nombre}, niveaux absents omis
+    """
+    counts: Dict[str, int] = {}
+    for r in results:
+        level = r.get("result", r).get("degradation")
+        if level:
+            counts[level] = counts.get(level, 0) + 1
+    return counts
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module de récupération et d'extraction des preuves web (entre le Module 4 et la Phase 2).
+
+`fact_check_affirmations` ne renvoie que des URLs. Ce module télécharge les pages en
+parallèle (client HTTP mutualisé, nombre de connexions limité par domaine), retire le
+"bruit" des pages (menus, scripts, pieds de page), puis garde les passages les plus
+proches de l'affirmation dans la limite d'un budget de tokens. Les passages sont ajoutés
+à chaque résultat sous la clé "passages" : `CritiqueAnalyzer` les injecte dans la Phase 2.
+"""
+
+import asyncio
+import logging
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from .utils import Config
+from .context_window import estimate_tokens
+from .search_cache import claim_signature
+from .client_registry import get_shared_http_client
+
+logger = logging.getLogger(__name__)
+
+# =============================================
+# EXTRACTION DU TEXTE UTILE
+# =============================================
+# Balises dont le contenu n'est jamais du texte d'article
+SKIPPED_TAGS = {"script", "style", "noscript", "nav", "header", "footer", "aside", "form", "svg", "button", "iframe"}
+# Balises qui délimitent un bloc de texte (paragraphe)
+BLOCK_TAGS = {"p", "li", "blockquote", "h1", "h2", "h3", "h4", "td", "pre", "article", "section", "div"}
+# Un bloc plus court est considéré comme du bruit (boutons, légendes, liens de partage)
+MIN_BLOCK_WORDS = 8
+
+class _TextExtractor(HTMLParser):
+    """Parcourt le HTML et regroupe le texte visible en blocs, hors balises de navigation."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.blocks: List[str] = []
+        self._current: List[str] = []
+        self._skip_depth = 0
+
+    def _close_block(self) -> None:
+        text = " ".join(" ".join(self._current).split())
+        if len(text.split()) >= MIN_BLOCK_WORDS:
+            self.blocks.append(text)
+        self._current = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIPPED_TAGS:
+            self._skip_depth += 1
+        elif tag in BLOCK_TAGS or tag == "br":
+            self._close_block()
+
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in BLOCK_TAGS:
+            self._close_block()
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self._current.append(data)
+
+def extract_blocks(html: str) -> List[str]:
+    """
+    Extrait les paragraphes de texte utile d'une page HTML.
+
+    Args:
+        html: Contenu de la page
+
+    Returns:
+        List[str]: Blocs de texte, dans l'ordre de la page (doublons retirés)
+    """
+    extractor = _TextExtractor()
+    try:
+        extractor.feed(html)
+        extractor.close()
+    except Exception as e:
+        logger.warning(f"HTML mal formé, extraction partielle: {str(e)}")
+    extractor._close_block()
+    return list(dict.fromkeys(extractor.blocks))
+
+# =============================================
+# SÉLECTION DES PASSAGES
+# =============================================
+
+def select_passages(
+    claim: str,
+    documents: List[Dict[str, Any]],
+    token_budget: int = Config.EVIDENCE_TOKEN_BUDGET
+) -> List[Dict[str, Any]]:
+    """
+    Garde les passages qui partagent le plus de mots significatifs avec l'affirmation.
+
+    Args:
+        claim: Texte de l'affirmation
+        documents: Pages extraites [{"url", "blocks"}]
+        token_budget: Nombre maximal de tokens (estimés) pour l'ensemble des passages
+
+    Returns:
+        List[Dict[str, Any]]: Passages retenus [{"url", "text", "score"}], du plus pertinent au moins pertinent
+    """
+    claim_words = claim_signature(claim)
+    if not claim_words:
+        return []
+
+    candidates = []
+    for doc in documents:
+        for block in doc["blocks"]:
+            overlap = len(claim_words & claim_signature(block))
+            if overlap:
+                # Recouvrement rapporté à l'affirmation, légèrement pénalisé pour les blocs très longs
+                score = overlap / len(claim_words) / (1 + estimate_tokens(block) / 1000)
+                candidates.append((score, doc["url"], block))
+
+    selected = []
+    remaining = token_budget
+    for score, url, block in sorted(candidates, key=lambda c: -c[0]):
+        cost = estimate_tokens(block)
+        if cost > remaining:
+            continue  # Passage trop long pour ce qui reste du budget : on essaie les suivants
+        selected.append({"url": url, "text": block, "score": round(score, 3)})
+        remaining -= cost
+    return selected
+
+# =============================================
+# TÉLÉCHARGEMENT CONCURRENT
+# =============================================
+
+class EvidenceFetcher:
+    """
+    Télécharge les pages de preuves en parallèle
+
+    - le client HTTP partagé du processus (connexions réutilisées d'une page à l'autre) ;
+    - au plus `EVIDENCE_PER_DOMAIN` téléchargements simultanés par domaine (politesse, anti-blocage) ;
+    - délai et taille maximale par page ; un échec ne bloque jamais les autres pages.
+    """
+
+    def __init__(self, client: Optional[httpx.AsyncClient] = None, per_domain: int = Config.EVIDENCE_PER_DOMAIN):
+        """
+        Initialise le téléchargeur
+
+        Args:
+            client: Client HTTP à utiliser (par défaut : le client partagé, voir `client_registry`)
+            per_domain: Téléchargements simultanés maximum par domaine
+        """
+        self.client = client or get_shared_http_client()
+        self.per_domain = per_domain
+        self._domain_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.stats = {"fetched": 0, "failed": 0}
+
+    async def fetch(self, url: str) -> Optional[str]:
+        """
+        Télécharge une page HTML
+
+        Args:
+            url: Adresse de la page
+
+        Returns:
+            Optional[str]: Contenu HTML, ou None en cas d'échec ou de contenu non HTML
+        """
+        domain = urlsplit(url).netloc.lower()
+        semaphore = self._domain_semaphores.setdefault(domain, asyncio.Semaphore(self.per_domain))
+        async with semaphore:
+            try:
+                async with self.client.stream("GET", url) as response:
+                    response.raise_for_status()
+                    if "html" not in response.headers.get("content-type", "html"):
+                        raise ValueError(f"contenu non HTML ({response.headers.get('content-type')})")
+                    body = bytearray()
+                    async for chunk in response.aiter_bytes():
+                        body.extend(chunk)
+                        if len(body) >= Config.EVIDENCE_MAX_BYTES:
+                            break  # Page trop grande : le début suffit pour trouver les passages
+                    self.stats["fetched"] += 1
+                    return body.decode(response.encoding or "utf-8", errors="replace")
+            except Exception as e:
+                self.stats["failed"] += 1
+                logger.warning(f"Preuve inaccessible {url}: {str(e)}")
+                return None
+
+    async def collect(self, fact_check_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Ajoute les passages pertinents aux résultats de `fact_check_affirmations`
+
+        Toutes les URLs (sans doublons) sont téléchargées en même temps, puis les passages
+        sont sélectionnés affirmation par affirmation.
+
+        Args:
+            fact_check_results: Résultats [{"affirmation", "preuves": [{"title", "href"}]}]
+
+        Returns:
+            List[Dict[str, Any]]: Les mêmes résultats, complétés d'une clé "passages"
+        """
+        urls = list(dict.fromkeys(
+            preuve["href"] for item in fact_check_results for preuve in item.get("preuves", []) if preuve.get("href")
+        ))
+        pages = await asyncio.gather(*(self.fetch(url) for url in urls))
+        # L'extraction est du travail CPU : hors de la boucle d'événements
+        blocks_by_url = {}
+        for url, html in zip(urls, pages):
+            if html:
+                blocks_by_url[url] = await asyncio.to_thread(extract_blocks, html)
+
+        for item in fact_check_results:
+            documents = [
+                {"url": preuve["href"], "blocks": blocks_by_url[preuve["href"]]}
+                for preuve in item.get("preuves", []) if preuve.get("href") in blocks_by_url
+            ]
+            item["passages"] = select_passages(item["affirmation"], documents)
+        return fact_check_results
+
+def format_evidence_context(passages: Optional[List[Dict[str, Any]]]) -> str:
+    """
+    Met en forme les passages pour les insérer dans le prompt de la Phase 2.
+
+    Args:
+        passages: Passages sélectionnés (voir `select_passages`)
+
+    Returns:
+        str: Bloc de preuves (chaîne vide sans passage)
+    """
+    if not passages:
+        return ""
+    lines = [f"[{i}] {p['url']}\n« {p['text']} »" for i, p in enumerate(passages, 1)]
+    return "PREUVES WEB FOURNIES (extraits des sources) :\n" + "\n\n".join(lines) + "\n\n---\n\n"
+
+async def collect_evidence(fact_check_results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Raccourci : télécharge et sélectionne les passages avec le client HTTP partagé.
+
+    Args:
+        fact_check_results: Résultats de `fact_check_affirmations`
+
+    Returns:
+        List[Dict[str, Any]]: Résultats complétés d'une clé "passages"
+    """
+    return await EvidenceFetcher().collect(fact_check_results)
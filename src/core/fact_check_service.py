@@ -0,0 +1,402 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module du service HTTP de fact-checking (mode `--serve` de live_fact_checker.py).
+
+Expose `CritiqueAnalyzer` aux outils de la rédaction sans passer par le menu `input()` :
+- `POST /check`  : une affirmation  {"affirmation", "start"?, "end"?, "history"?, "evidence"?}
+- `POST /batch`  : plusieurs affirmations  {"affirmations": [...], "history"?, "evidence"?}
+- `POST /stream` : une affirmation, réponse en flux NDJSON (événements "category", "token", puis "result")
+- `GET /health`  : état du service et compteurs
+
+Un seul analyseur (donc un seul ordonnanceur d'appels API, qui sert de limiteur de débit), un
+seul cache de recherches et un seul pool de connexions sont partagés par toutes les requêtes.
+`/check` et `/stream` passent en priorité "live", `/batch` en "backlog" (voir `scheduler`).
+Les requêtes simultanées pour la même affirmation (même texte normalisé, même contexte)
+partagent une seule analyse en cours (`SingleFlight`). Le flux NDJSON n'est pas partagé :
+chaque client reçoit ses propres fragments.
+
+Serveur HTTP/1.1 minimal en asyncio (bibliothèque standard) : connexions persistantes,
+corps de requête à longueur connue (Content-Length), réponses en flux par morceaux (chunked).
+"""
+
+import json
+import time
+import asyncio
+import logging
+from http import HTTPStatus
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from .utils import Config, validate_text, format_affirmation, media_timing
+from .search_cache import SearchCache, normalize_query
+from .fact_checker import fact_check_affirmations
+from .evidence import collect_evidence
+from .single_flight import SingleFlight
+from .client_registry import connection_stats
+from .analyse_critique import CritiqueAnalyzer
+from .scheduler import scheduling, PRIORITY_LIVE, PRIORITY_BACKLOG
+
+logger = logging.getLogger(__name__)
+
+class RequestError(Exception):
+    """
+    Requête refusée par le service (renvoyée au client avec le code HTTP `status`).
+    """
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+# =============================================
+# SERVICE
+# =============================================
+
+class FactCheckService:
+    """
+    Service HTTP de fact-checking autour d'un `CritiqueAnalyzer` partagé
+    """
+
+    def __init__(self, analyzer: CritiqueAnalyzer, search_cache: Optional[SearchCache] = None):
+        """
+        Initialise le service
+
+        Args:
+            analyzer: Analyseur partagé par toutes les requêtes
+            search_cache: Cache des recherches de preuves (ouvert au premier besoin si absent)
+        """
+        self.analyzer = analyzer
+        self._search_cache = search_cache
+        # La recherche Google est synchrone et sa connexion SQLite ne supporte qu'un thread à la fois
+        self._search_lock = asyncio.Lock()
+        self.coalescer = SingleFlight()
+        self.started_at = time.time()
+        self.stats = {"requests": 0, "claims": 0, "errors": 0, "streams": 0}
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def search_cache(self) -> SearchCache:
+        """Cache des recherches, partagé par toutes les requêtes"""
+        if self._search_cache is None:
+            self._search_cache = SearchCache()
+        return self._search_cache
+
+    # --- Cycle de vie ---
+
+    async def start(self, host: str = Config.SERVICE_HOST, port: int = Config.SERVICE_PORT) -> asyncio.AbstractServer:
+        """
+        Démarre l'écoute
+
+        Args:
+            host: Adresse d'écoute
+            port: Port d'écoute (0 = port libre choisi par le système)
+
+        Returns:
+            asyncio.AbstractServer: Serveur démarré
+        """
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        address = self._server.sockets[0].getsockname()
+        logger.info(f"Service de fact-checking à l'écoute sur http://{address[0]}:{address[1]}")
+        return self._server
+
+    @property
+    def port(self) -> Optional[int]:
+        """Port effectivement utilisé (utile avec port=0)"""
+        return self._server.sockets[0].getsockname()[1] if self._server else None
+
+    async def serve_forever(self, host: str = Config.SERVICE_HOST, port: int = Config.SERVICE_PORT) -> None:
+        """
+        Démarre le service et traite les requêtes jusqu'à l'annulation (Ctrl+C)
+        """
+        server = await self.start(host, port)
+        async with server:
+            await server.serve_forever()
+
+    async def close(self) -> None:
+        """
+        Arrête l'écoute et ferme le cache des recherches
+        """
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._search_cache is not None:
+            self._search_cache.close()
+            self._search_cache = None
+
+    # --- Analyse ---
+
+    def _parse_claim(self, item: Union[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Valide une affirmation reçue (texte seul ou objet {"affirmation", "start"?, "end"?})
+
+        Raises:
+            RequestError: Si l'affirmation est absente, trop courte ou trop longue
+        """
+        claim = {"affirmation": item} if isinstance(item, str) else item
+        if not isinstance(claim, dict) or not validate_text(claim):
+            raise RequestError(
+                HTTPStatus.UNPROCESSABLE_ENTITY,
+                f"Affirmation invalide (texte de {Config.MIN_CLAIM_LENGTH} à {Config.MAX_CLAIM_LENGTH} caractères attendu)"
+            )
+        return {"affirmation": format_affirmation(claim), **media_timing(claim)}
+
+    @staticmethod
+    def _parse_history(payload: Dict[str, Any]) -> List[str]:
+        history = payload.get("history") or []
+        if not isinstance(history, list) or not all(isinstance(h, str) for h in history):
+            raise RequestError(HTTPStatus.BAD_REQUEST, "'history' doit être une liste de textes")
+        return history
+
+    async def _attach_evidence(self, claim: Dict[str, Any]) -> None:
+        """Recherche les preuves web de l'affirmation et joint les passages pertinents (clé "passages")."""
+        async with self._search_lock:
+            found = await asyncio.to_thread(fact_check_affirmations, [claim["affirmation"]], 'fr', self.search_cache)
+        found = await collect_evidence(found)
+        claim["passages"] = found[0].get("passages", []) if found else []
+
+    async def check(self, claim: Dict[str, Any], history: List[str], evidence: bool) -> Dict[str, Any]:
+        """
+        Analyse une affirmation validée ; les demandes identiques simultanées partagent la même analyse
+
+        Args:
+            claim: Affirmation validée (voir `_parse_claim`)
+            history: Contexte de conversation
+            evidence: Recherche et injecte les preuves web avant l'analyse
+
+        Returns:
+            Dict[str, Any]: Résultat de `CritiqueAnalyzer.analyze`, ou rapport d'erreur {"status": "error", ...}
+        """
+        self.stats["claims"] += 1
+        # Le contexte et les preuves changent le verdict : ils font partie de la clé
+        key = (normalize_query(claim["affirmation"]), self.analyzer.analysis_mode, tuple(history), evidence)
+
+        async def run() -> Dict[str, Any]:
+            if evidence:
+                await self._attach_evidence(claim)
+            return await self.analyzer.analyze(claim, history=history)
+
+        try:
+            result = await self.coalescer.do(key, run)
+        except Exception as e:
+            self.stats["errors"] += 1
+            return {
+                "affirmation": claim["affirmation"],
+                "status": "error",
+                "error_type": type(e).__name__,
+                "error_message": str(e),
+                **media_timing(claim)
+            }
+        # Le résultat partagé n'est jamais modifié : l'horodatage propre à cette demande est ajouté à une copie
+        return {**result, **media_timing(claim)}
+
+    # --- Points d'accès ---
+
+    async def _route_check(self, payload: Dict[str, Any]) -> Tuple[HTTPStatus, Dict[str, Any]]:
+        with scheduling(PRIORITY_LIVE):
+            result = await self.check(self._parse_claim(payload), self._parse_history(payload), bool(payload.get("evidence")))
+        return (HTTPStatus.OK if result["status"] in ("success", "degraded") else HTTPStatus.BAD_GATEWAY), result
+
+    async def _route_batch(self, payload: Dict[str, Any]) -> Tuple[HTTPStatus, Dict[str, Any]]:
+        items = payload.get("affirmations")
+        if not isinstance(items, list) or not items:
+            raise RequestError(HTTPStatus.BAD_REQUEST, "'affirmations' doit être une liste non vide")
+        if len(items) > Config.SERVICE_BATCH_MAX:
+            raise RequestError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"Lot limité à {Config.SERVICE_BATCH_MAX} affirmations")
+        history = self._parse_history(payload)
+        evidence = bool(payload.get("evidence"))
+
+        async def one(item: Any) -> Dict[str, Any]:
+            try:
+                claim = self._parse_claim(item)
+            except RequestError as e:
+                self.stats["errors"] += 1
+                return {"affirmation": str(item)[:100], "status": "error", "error_type": "RequestError", "error_message": str(e)}
+            return await self.check(claim, history, evidence)
+
+        with scheduling(PRIORITY_BACKLOG):
+            results = await asyncio.gather(*(one(item) for item in items))
+        return HTTPStatus.OK, {"results": [{"id": i, **res} for i, res in enumerate(results, 1)]}
+
+    async def _route_health(self, _payload: Dict[str, Any]) -> Tuple[HTTPStatus, Dict[str, Any]]:
+        return HTTPStatus.OK, {
+            "status": "ok",
+            "uptime_s": round(time.time() - self.started_at, 1),
+            "analysis_mode": self.analyzer.analysis_mode,
+            "requests": self.stats,
+            "coalescing": self.coalescer.snapshot(),
+            "analyzer_coalescing": self.analyzer.single_flight.snapshot(),
+            "speculation": self.analyzer.speculation_stats,
+            "classification": self.analyzer.classification_stats,
+            "scheduler_waits": self.analyzer.scheduler.wait_stats(),
+            "search_cache": self._search_cache.stats if self._search_cache else None,
+            "connections": connection_stats(),
+        }
+
+    async def _stream_check(self, payload: Dict[str, Any], writer: asyncio.StreamWriter, keep_alive: bool) -> None:
+        """Analyse en flux : un objet JSON par ligne, envoyé dès qu'il est disponible."""
+        claim = self._parse_claim(payload)
+        history = self._parse_history(payload)
+        self.stats["claims"] += 1
+        self.stats["streams"] += 1
+        if payload.get("evidence"):
+            await self._attach_evidence(claim)
+        # À partir d'ici la réponse est commencée : les erreurs sont envoyées comme événement "error"
+        await self._send_head(writer, HTTPStatus.OK, "application/x-ndjson", keep_alive, chunked=True)
+
+        events: asyncio.Queue = asyncio.Queue()
+        with scheduling(PRIORITY_LIVE):
+            # La tâche copie le contexte à sa création : elle garde la priorité "live"
+            task = asyncio.create_task(self.analyzer.analyze_stream(
+                claim,
+                history=history,
+                on_category=lambda category: events.put_nowait({"event": "category", "category": category}),
+                on_token=lambda text: events.put_nowait({"event": "token", "text": text}),
+            ))
+        task.add_done_callback(lambda _: events.put_nowait(None))
+        try:
+            while (event := await events.get()) is not None:
+                await self._send_chunk(writer, event)
+            try:
+                final = {"event": "result", **task.result()}
+            except Exception as e:
+                self.stats["errors"] += 1
+                final = {"event": "error", "status": "error", "error_type": type(e).__name__, "error_message": str(e)}
+            await self._send_chunk(writer, final)
+            writer.write(b"0\r\n\r\n")
+            await writer.drain()
+        finally:
+            # Client déconnecté en cours de flux : l'analyse n'a plus de destinataire
+            task.cancel()
+
+    ROUTES = {
+        ("POST", "/check"): "_route_check",
+        ("POST", "/batch"): "_route_batch",
+        ("GET", "/health"): "_route_health",
+    }
+
+    # --- Protocole HTTP ---
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Traite les requêtes d'une connexion (persistante en HTTP/1.1) jusqu'à sa fermeture."""
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), Config.SERVICE_KEEPALIVE_TIMEOUT)
+                except asyncio.TimeoutError:
+                    break
+                if request is None:
+                    break
+                method, path, payload, keep_alive = request
+                self.stats["requests"] += 1
+                try:
+                    if isinstance(payload, RequestError):
+                        raise payload
+                    if (method, path) == ("POST", "/stream"):
+                        await self._stream_check(payload, writer, keep_alive)
+                        if not keep_alive:
+                            break
+                        continue
+                    handler = self.ROUTES.get((method, path))
+                    if handler is None:
+                        raise RequestError(HTTPStatus.NOT_FOUND, f"Point d'accès inconnu: {method} {path}")
+                    status, body = await getattr(self, handler)(payload)
+                except RequestError as e:
+                    status, body = e.status, {"status": "error", "error_type": "RequestError", "error_message": str(e)}
+                except Exception as e:
+                    logger.error(f"Erreur interne du service sur {method} {path}: {str(e)}", exc_info=True)
+                    status, body = HTTPStatus.INTERNAL_SERVER_ERROR, {"status": "error", "error_type": type(e).__name__, "error_message": str(e)}
+                await self._send_json(writer, status, body, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass  # Client parti
+        finally:
+            writer.close()
+
+    async def _read_request(
+        self, reader: asyncio.StreamReader
+    ) -> Optional[Tuple[str, str, Union[Dict[str, Any], RequestError], bool]]:
+        """
+        Lit une requête HTTP/1.1
+
+        Returns:
+            Optional[Tuple]: (méthode, chemin, corps JSON ou erreur de requête, connexion persistante),
+            ou None si le client a fermé la connexion
+        """
+        try:
+            request_line = await reader.readline()
+        except ValueError:
+            # Ligne plus longue que la limite du StreamReader (LimitOverrunError, converti par readline)
+            return "", "", RequestError(HTTPStatus.BAD_REQUEST, "Ligne de requête trop longue"), False
+        if not request_line.strip():
+            return None
+        try:
+            method, target, version = request_line.decode("latin-1").split()
+        except ValueError:
+            return "", "", RequestError(HTTPStatus.BAD_REQUEST, "Ligne de requête invalide"), False
+
+        headers: Dict[str, str] = {}
+        while True:
+            try:
+                line = await reader.readline()
+            except ValueError:
+                # Reste de la ligne non lu : la connexion ne peut pas être réutilisée
+                return method, target.split("?", 1)[0], RequestError(HTTPStatus.BAD_REQUEST, "En-tête trop long"), False
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+        path = target.split("?", 1)[0]
+        if "transfer-encoding" in headers:
+            # Corps découpé (chunked) non pris en charge : ses octets seraient lus comme la requête suivante
+            error = RequestError(HTTPStatus.LENGTH_REQUIRED, "Transfer-Encoding non pris en charge, utiliser Content-Length")
+            return method, path, error, False
+        raw_length = headers.get("content-length", "0") or "0"
+        if not (raw_length.isascii() and raw_length.isdigit()):
+            # Longueur non numérique ou négative : impossible de savoir où s'arrête le corps
+            return method, path, RequestError(HTTPStatus.BAD_REQUEST, f"Content-Length invalide: {raw_length}"), False
+        length = int(raw_length)
+        if length > Config.SERVICE_MAX_BODY_BYTES:
+            # Corps non lu : la connexion ne peut pas être réutilisée
+            return method, path, RequestError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Requête trop volumineuse"), False
+        body = await reader.readexactly(length) if length else b""
+        if not body:
+            return method, path, {}, keep_alive
+        try:
+            payload = json.loads(body)
+        except (UnicodeDecodeError, json.JSONDecodeError) as e:
+            return method, path, RequestError(HTTPStatus.BAD_REQUEST, f"JSON invalide: {str(e)}"), keep_alive
+        if not isinstance(payload, dict):
+            return method, path, RequestError(HTTPStatus.BAD_REQUEST, "Le corps doit être un objet JSON"), keep_alive
+        return method, path, payload, keep_alive
+
+    @staticmethod
+    async def _send_head(
+        writer: asyncio.StreamWriter,
+        status: HTTPStatus,
+        content_type: str,
+        keep_alive: bool,
+        length: Optional[int] = None,
+        chunked: bool = False
+    ) -> None:
+        lines = [
+            f"HTTP/1.1 {status.value} {status.phrase}",
+            f"Content-Type: {content_type}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        lines.append("Transfer-Encoding: chunked" if chunked else f"Content-Length: {length or 0}")
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+
+    async def _send_json(self, writer: asyncio.StreamWriter, status: HTTPStatus, body: Dict[str, Any], keep_alive: bool) -> None:
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        await self._send_head(writer, status, "application/json; charset=utf-8", keep_alive, length=len(data))
+        writer.write(data)
+        await writer.drain()
+
+    @staticmethod
+    async def _send_chunk(writer: asyncio.StreamWriter, event: Dict[str, Any]) -> None:
+        data = (json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8")
+        writer.write(f"{len(data):x}\r\n".encode("latin-1") + data + b"\r\n")
+        await writer.drain()
@@ -1,7 +1,8 @@
-from googlesearch import search 
 import time
-import re
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Callable
+
+from .text_normalization import strip_quotes
+from .search_cache import SearchCache, ClaimClusters
 
 # Configuration du Fact-Checker
 MAX_RESULTS_PAR_RECHERCHE = 3 
@@ -14,20 +15,54 @@ DOMAINES_FACT_CHECK = [
 ] 
 
 
-def fact_check_affirmations(affirmations_a_verifier: List[str], langue: str = 'fr') -> List[Dict[str, Any]]:
+def rechercher_google(requete: str, langue: str) -> List[str]:
+    """
+    Exécute une recherche Google (les erreurs sont propagées : elles ne doivent pas être mises en cache).
+    """
+    # Import différé : googlesearch (requests + BeautifulSoup) coûte ~150 ms et n'est utile qu'ici
+    from googlesearch import search
+    # CORRECTION FINALE : pause=2 remplacé par sleep_interval=2
+    return list(search(requete, num_results=MAX_RESULTS_PAR_RECHERCHE, lang=langue, sleep_interval=2))
+
+def fact_check_affirmations(
+    affirmations_a_verifier: List[str],
+    langue: str = 'fr',
+    cache: Optional[SearchCache] = None,
+    utiliser_cache: bool = True,
+    moteur: Optional[Callable[[str, str], List[str]]] = None
+) -> List[Dict[str, Any]]:
     """
     Recherche des sources et des vérifications existantes pour chaque affirmation en utilisant Google.
+
+    Les recherches passent par un cache persistant (voir `search_cache`) : une requête déjà faite
+    n'est pas relancée tant que son résultat est frais, y compris quand il était vide. Les
+    affirmations quasi identiques partagent la même requête, donc les mêmes preuves.
+
+    `moteur` remplace Google (même signature que `rechercher_google`), par exemple par
+    l'enregistreur ou le rejoueur de `replay`.
     """
     
     print("\n--- Démarrage du Module 4 : Fact-Checking (V8 - Correction Finale Google) ---")
     
     resultats_bruts = []
+    cache_local = cache is None and utiliser_cache
+    if cache_local:
+        cache = SearchCache()
+    groupes = ClaimClusters(cache=cache)
+
+    moteur = moteur or rechercher_google
+
+    def rechercher(requete: str) -> List[str]:
+        if cache is None:
+            return moteur(requete, langue)
+        return cache.get_or_fetch(requete, langue, lambda: moteur(requete, langue))
     
     # 1. Préparation de la requête ciblée sur les sites de vérification
     requete_domaines = " OR ".join([f"site:{dom}" for dom in DOMAINES_FACT_CHECK])
 
     for affirmation in affirmations_a_verifier:
-        affirmation_nettoyee = re.sub(r'[«»“”"]', '', affirmation).strip()
+        # Les quasi-doublons (même signature, à la ponctuation ou la casse près) partagent la même requête
+        affirmation_nettoyee = strip_quotes(groupes.canonical(affirmation))
         
         print(f"\n🔍 Recherche de preuves pour : '{affirmation_nettoyee[:50]}...'")
         
@@ -37,8 +72,7 @@ def fact_check_affirmations(affirmations_a_verifier: List[str], langue: str = 'f
         requete_ciblee = f'"{affirmation_nettoyee}" {requete_domaines}'
         
         try:
-            # CORRECTION FINALE : pause=2 remplacé par sleep_interval=2
-            urls_ciblees = list(search(requete_ciblee, num_results=MAX_RESULTS_PAR_RECHERCHE, lang=langue, sleep_interval=2))
+            urls_ciblees = rechercher(requete_ciblee)
             
             for url in urls_ciblees:
                 resultats_web.append({"title": f"CIBLÉ: {url}", "href": url})
@@ -53,8 +87,7 @@ def fact_check_affirmations(affirmations_a_verifier: List[str], langue: str = 'f
             requete_simple = f'{affirmation_nettoyee} vérification' 
             
             try:
-                # CORRECTION FINALE : pause=2 remplacé par sleep_interval=2
-                urls_larges = list(search(requete_simple, num_results=MAX_RESULTS_PAR_RECHERCHE, lang=langue, sleep_interval=2))
+                urls_larges = rechercher(requete_simple)
                 
                 for url in urls_larges:
                     if not any(r['href'] == url for r in resultats_web):
@@ -74,6 +107,13 @@ def fact_check_affirmations(affirmations_a_verifier: List[str], langue: str = 'f
         # 🚨 CORRECTION : Temporisation supprimée pour accélérer le batch
         # time.sleep(1) 
 
+    if cache is not None:
+        stats = cache.stats
+        print(f"\n📦 Cache des recherches : {stats['hits']} résultats et {stats['negative_hits']} absences réutilisés, "
+              f"{stats['misses']} nouvelles recherches, {stats['refreshed']} rafraîchies, {stats['stale_served']} périmées servies.")
+        if cache_local:
+            cache.close()
+
     print("\n--- Fin du Fact-Checking. Résultats prêts pour l'analyse IA. ---")
     return resultats_bruts
 
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module d'heuristiques locales pour le projet Code Citoyen.
+
+Ces fonctions tournent sur CPU, sans appel réseau. Elles donnent une première
+estimation de la catégorie d'une affirmation à partir d'indices de surface
+(chiffres, vocabulaire juridique...). Elles ne remplacent pas la Phase 1 :
+elles servent à anticiper son résultat quand les indices sont nets.
+"""
+
+import re
+from typing import Dict, Optional, Tuple
+
+# =============================================
+# MOTIFS PRÉCOMPILÉS
+# =============================================
+# Chiffres, pourcentages et montants (ex: "10%", "7,3", "120 milliards")
+NUMBER_PATTERN = re.compile(r'\d+(?:[.,]\d+)?\s*(?:%|pour\s?cent|milliards?|millions?|euros?|€)?', re.IGNORECASE)
+# Quantités avec unité : un nombre seul (année, date) n'est pas à lui seul un indice statistique
+QUANTITY_PATTERN = re.compile(r'\d+(?:[.,]\d+)?\s*(?:%|pour\s?cent\b|milliards?\b|millions?\b|euros?\b|€)', re.IGNORECASE)
+# Vocabulaire statistique et économique
+STAT_TERMS_PATTERN = re.compile(
+    r"\b(?:taux|chômage|dette|pib|budget|inflation|croissance|déficit|pourcentage|moyenne|hausse|baisse|"
+    r"augment\w*|diminu\w*|milliards?|millions?|insee|eurostat)\b",
+    re.IGNORECASE
+)
+# Vocabulaire juridique
+LEGAL_TERMS_PATTERN = re.compile(
+    r"\b(?:lois?|droits?|légal\w*|illégal\w*|constitution\w*|article|décret|code|tribunal|juge\w*|"
+    r"pénal\w*|interdi\w*|autoris\w*|convention|traité|majorité\s+pénale|réglement\w*)\b",
+    re.IGNORECASE
+)
+
+# Salutations, remerciements, acquiescements et transitions en début de phrase
+# (partagé avec le score de vérifiabilité, voir `claim_extraction`)
+POLITENESS_PATTERN = re.compile(
+    r"^\W*(?:bonjour|bonsoir|salut|merci|d'accord|au revoir|bienvenue|excusez|pardon|bien sûr|tout à fait|"
+    r"oui|non|voilà)\b",
+    re.IGNORECASE
+)
+# Intentions, promesses et projets (futur de la première personne, verbes d'engagement)
+INTENTION_PATTERN = re.compile(
+    r"\b(?:je\s+\w+rai|nous\s+\w+rons|on\s+\w+ra|prévoi\w*|promet\w*|s'engage\w*|envisage\w*|"
+    r"(?:je|nous|on)\s+(?:vais|allons|va)\s+\w+)\b",
+    re.IGNORECASE
+)
+# Sujets scientifiques, médicaux et pseudoscientifiques
+SCIENCE_TERMS_PATTERN = re.compile(
+    r"\b(?:scientifi\w*|climat\w*|réchauffement|vaccin\w*|cancer\w*|virus|maladie\w*|santé|médec\w*|"
+    r"ovni|extraterrestres?|homéopathie|espèces?|évolution|terre\s+plate)\b",
+    re.IGNORECASE
+)
+# Sujets historiques, géographiques et culturels
+HISTORY_TERMS_PATTERN = re.compile(
+    r"\b(?:guerres?|siècles?|révolution\w*|rois?|reines?|empires?|histoire|historique\w*|capitale|"
+    r"colonisation|monarchie|moyen\s+âge)\b",
+    re.IGNORECASE
+)
+
+# Poids de chaque indice dans le score de la catégorie
+HEURISTIC_WEIGHTS = {
+    "number": 0.6,
+    "stat_term": 0.3,
+    "legal_term": 0.45,
+}
+
+# =============================================
+# FONCTIONS
+# =============================================
+
+def score_categories(text: str) -> Dict[str, float]:
+    """
+    Calcule un score (0 à 1) par catégorie à partir des indices de surface du texte.
+
+    Args:
+        text: Affirmation à évaluer
+
+    Returns:
+        Dict[str, float]: Score par catégorie (seules STATISTIQUE et JURIDIQUE sont estimées)
+    """
+    stat_terms = len(STAT_TERMS_PATTERN.findall(text))
+    legal_terms = len(LEGAL_TERMS_PATTERN.findall(text))
+    # Sans vocabulaire statistique, seuls les nombres avec unité comptent ("depuis 2020" ne suffit pas)
+    numbers = len(NUMBER_PATTERN.findall(text)) if stat_terms else len(QUANTITY_PATTERN.findall(text))
+
+    stat_score = min(1.0, HEURISTIC_WEIGHTS["number"] * min(numbers, 1) + HEURISTIC_WEIGHTS["stat_term"] * stat_terms)
+    legal_score = min(1.0, HEURISTIC_WEIGHTS["legal_term"] * legal_terms)
+    return {"STATISTIQUE": stat_score, "JURIDIQUE": legal_score}
+
+def guess_category(text: str) -> Tuple[Optional[str], float]:
+    """
+    Devine la catégorie la plus probable d'une affirmation.
+
+    Quand deux catégories ont des indices, la confiance est réduite de l'écart
+    entre les deux scores (ex: "la majorité pénale est fixée à 18 ans").
+
+    Args:
+        text: Affirmation à évaluer
+
+    Returns:
+        Tuple[Optional[str], float]: (catégorie devinée ou None, confiance entre 0 et 1)
+    """
+    scores = score_categories(text)
+    ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    (best, best_score), (_, second_score) = ranked[0], ranked[1]
+    if best_score <= 0:
+        return None, 0.0
+    return best, round(best_score - second_score, 3)
+
+def local_category(text: str) -> str:
+    """
+    Classe une affirmation sans appel réseau, parmi les neuf catégories de la Phase 1.
+
+    Sert de solution de secours quand la réponse du modèle ne contient aucune catégorie
+    reconnaissable (voir `analyse_critique.parse_category`) ou quand le temps manque pour
+    la Phase 1 (voir `degradation`). Moins précise que le modèle, elle évite un aller-retour.
+
+    Args:
+        text: Affirmation à classer
+
+    Returns:
+        str: Catégorie estimée (NON_VERIFIABLE faute d'indice)
+    """
+    if POLITENESS_PATTERN.search(text) and len(text) < 80:
+        return "POLITESSE"
+    if INTENTION_PATTERN.search(text):
+        return "NON_FAIT"
+    guess, _ = guess_category(text)
+    if guess:
+        return guess
+    if SCIENCE_TERMS_PATTERN.search(text):
+        return "CONSENSUS_SCIENCE"
+    if HISTORY_TERMS_PATTERN.search(text):
+        return "CONSENSUS_HISTO"
+    return "NON_VERIFIABLE"
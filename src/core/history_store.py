@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module d'historique des affirmations, sur disque et sans limite de taille.
+
+L'ancien historique (`results/history.json`) gardait les 100 dernières affirmations et
+réécrivait tout le fichier à chaque ajout. Ici, chaque résultat est ajouté à une base SQLite
+(`data/history/history.sqlite3`), écrite par un thread dédié (la boucle d'événements
+n'attend jamais le disque) :
+- fenêtre chaude : seuls les `Config.HISTORY_HOT_WINDOW` derniers résultats restent en
+  mémoire, avec un dictionnaire empreinte → résultat ;
+- index par empreinte de l'affirmation (texte normalisé) et par horodatage : "ai-je déjà
+  vérifié cette affirmation ?" se résout dans la fenêtre chaude en O(1), sinon par l'index ;
+- pagination du plus récent au plus ancien (commande `history` du mode interactif) ;
+- réutilisation d'un verdict récent (`reusable_verdict`) : même affirmation, même modèle, mêmes
+  prompts, réussi, non dégradé et plus récent que `Config.HISTORY_VERDICT_TTL`.
+
+L'ancien `history.json` est importé au premier lancement.
+
+Consultation, depuis src/ :
+    python -m core.history_store page [--page 2]
+    python -m core.history_store find "Le taux de chômage est de 7%"
+"""
+
+import os
+import json
+import queue
+import hashlib
+import sqlite3
+import logging
+import argparse
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple, Union
+
+from .utils import Config, format_affirmation
+from .search_cache import normalize_query
+from .prompts_templates import get_prompts_version
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_PATH = Path(os.getenv(
+    "HISTORY_PATH", str(Path(__file__).resolve().parents[2] / "data" / "history" / "history.sqlite3")
+))
+
+def claim_hash(affirmation: Union[str, Dict[str, Any]]) -> str:
+    """Empreinte d'une affirmation (texte normalisé : Unicode, casse, blancs)."""
+    return hashlib.sha1(normalize_query(format_affirmation(affirmation)).encode("utf-8")).hexdigest()
+
+# =============================================
+# HISTORIQUE
+# =============================================
+
+class HistoryStore:
+    """
+    Historique SQLite des résultats, avec une fenêtre chaude en mémoire
+
+    `add` rend la main immédiatement : l'écriture se fait dans le thread de l'historique.
+    Les pages attendent d'abord les écritures en cours (`flush`) ; la recherche d'une
+    affirmation ne les attend pas : un résultat pas encore écrit est dans la fenêtre chaude.
+    """
+
+    def __init__(self, path: Path = DEFAULT_HISTORY_PATH, hot_window: int = Config.HISTORY_HOT_WINDOW):
+        """
+        Ouvre (ou crée) l'historique
+
+        Args:
+            path: Fichier SQLite de l'historique
+            hot_window: Nombre de résultats récents gardés en mémoire
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT, ts TEXT, claim_hash TEXT, status TEXT, record TEXT)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_claim ON entries (claim_hash, id)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_ts ON entries (ts)")
+        self._db.commit()
+        # Connexion de lecture séparée (ouverte au premier besoin) : en WAL, elle lit sans attendre le thread d'écriture
+        self._reader: Optional[sqlite3.Connection] = None
+        self._read_lock = threading.Lock()
+        # Fenêtre chaude (du plus ancien au plus récent) et dernier résultat de chaque empreinte qu'elle contient
+        self.recent: Deque[Tuple[str, Dict[str, Any]]] = deque()
+        self._recent_by_hash: Dict[str, Dict[str, Any]] = {}
+        self.hot_window = hot_window
+        self._queue: "queue.Queue[Optional[Tuple[str, str, str, str]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._load_recent()
+
+    def _load_recent(self) -> None:
+        """Remplit la fenêtre chaude avec les derniers résultats enregistrés."""
+        rows = self._db.execute(
+            "SELECT claim_hash, record FROM entries ORDER BY id DESC LIMIT ?", (self.hot_window,)
+        ).fetchall()
+        for digest, record in reversed(rows):
+            self._remember(digest, json.loads(record))
+
+    def _remember(self, digest: str, record: Dict[str, Any]) -> None:
+        self.recent.append((digest, record))
+        self._recent_by_hash[digest] = record
+        if len(self.recent) > self.hot_window:
+            old_digest, old_record = self.recent.popleft()
+            # L'empreinte ne quitte le dictionnaire que si aucun résultat plus récent ne l'a remplacée
+            if self._recent_by_hash.get(old_digest) is old_record:
+                del self._recent_by_hash[old_digest]
+
+    def add(self, record: Dict[str, Any]) -> None:
+        """
+        Ajoute un résultat (format de `AffirmationProcessor.process_affirmation`)
+
+        Args:
+            record: Résultat, avec "timestamp" et "affirmation"
+        """
+        digest = claim_hash(record.get("affirmation", ""))
+        self._remember(digest, record)
+        row = (record.get("timestamp") or datetime.now().isoformat(), digest,
+               record.get("status") or record.get("result", {}).get("status", "success"),
+               json.dumps(record, ensure_ascii=False))
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="history-store", daemon=True)
+            self._thread.start()
+        self._queue.put(row)
+
+    def _run(self) -> None:
+        while True:
+            # Les résultats arrivés entre-temps partent dans la même transaction
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            rows = [row for row in batch if row is not None]
+            try:
+                if rows:
+                    with self._lock:
+                        self._db.executemany("INSERT INTO entries (ts, claim_hash, status, record) VALUES (?, ?, ?, ?)", rows)
+                        self._db.commit()
+            except Exception as e:
+                logger.error(f"Erreur d'écriture de l'historique: {str(e)}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if len(rows) < len(batch):
+                return  # Signal d'arrêt (`close`)
+
+    def flush(self) -> None:
+        """Attend que tous les résultats ajoutés soient écrits."""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.join()
+
+    def last_check(self, affirmation: Union[str, Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Dernier résultat enregistré pour cette affirmation (texte normalisé)
+
+        Args:
+            affirmation: Affirmation recherchée
+
+        Returns:
+            Optional[Dict[str, Any]]: Le résultat le plus récent, ou None si elle n'a jamais été vérifiée
+        """
+        digest = claim_hash(affirmation)
+        record = self.recent_record(digest)
+        return record if record is not None else self.read_last(digest)
+
+    def recent_record(self, digest: str) -> Optional[Dict[str, Any]]:
+        """Dernier résultat de cette empreinte dans la fenêtre chaude (en mémoire), ou None."""
+        return self._recent_by_hash.get(digest)
+
+    def read_last(self, digest: str) -> Optional[Dict[str, Any]]:
+        """
+        Dernier résultat de cette empreinte sur disque (index par empreinte)
+
+        Lecture bloquante : depuis la boucle d'événements, l'appeler dans un thread
+        (voir `HistoryManager.reusable_verdict`). Les écritures en cours ne sont pas attendues.
+
+        Args:
+            digest: Empreinte de l'affirmation (voir `claim_hash`)
+
+        Returns:
+            Optional[Dict[str, Any]]: Le résultat le plus récent, ou None
+        """
+        with self._read_lock:
+            if self._reader is None:
+                self._reader = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+            row = self._reader.execute(
+                "SELECT record FROM entries WHERE claim_hash = ? ORDER BY id DESC LIMIT 1", (digest,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def reusable_verdict(self, affirmation: Union[str, Dict[str, Any]], model: str,
+                         max_age_s: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Verdict déjà obtenu pour cette affirmation et encore valable
+
+        Valable : analyse réussie et complète (non dégradée), même modèle, mêmes prompts
+        (`get_prompts_version`), vieille de moins de `max_age_s` secondes.
+
+        Args:
+            affirmation: Affirmation à analyser
+            model: Modèle qui analyserait l'affirmation
+            max_age_s: Âge maximal du verdict (par défaut `Config.HISTORY_VERDICT_TTL` ; 0 : jamais repris)
+
+        Returns:
+            Optional[Dict[str, Any]]: Le résultat d'analyse (clé "result" de l'historique), ou None
+        """
+        max_age_s = Config.HISTORY_VERDICT_TTL if max_age_s is None else max_age_s
+        if max_age_s <= 0:
+            return None
+        return self.valid_verdict(self.last_check(affirmation), model, max_age_s)
+
+    @staticmethod
+    def valid_verdict(record: Optional[Dict[str, Any]], model: str, max_age_s: float) -> Optional[Dict[str, Any]]:
+        """
+        Résultat d'analyse de cette entrée d'historique s'il peut être repris (voir `reusable_verdict`)
+
+        Returns:
+            Optional[Dict[str, Any]]: Le résultat d'analyse (clé "result"), ou None
+        """
+        result = (record or {}).get("result")
+        if not result or result.get("status") != "success" or result.get("degradation") not in (None, "full"):
+            return None
+        if result.get("model") != model or result.get("prompts") != get_prompts_version():
+            return None
+        try:
+            checked_at = datetime.fromisoformat(record["timestamp"])
+        except (KeyError, TypeError, ValueError):
+            return None
+        if datetime.now() - checked_at > timedelta(seconds=max_age_s):
+            return None
+        return result
+
+    def page(self, page: int = 1, page_size: int = Config.HISTORY_PAGE_SIZE,
+             since: Optional[str] = None) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Une page de l'historique, du plus récent au plus ancien
+
+        Args:
+            page: Numéro de page (1 = les plus récents)
+            page_size: Résultats par page
+            since: Horodatage ISO : seuls les résultats postérieurs sont retenus (index par horodatage)
+
+        Returns:
+            Tuple[List[Dict[str, Any]], int]: (résultats de la page, nombre total de résultats retenus)
+        """
+        self.flush()
+        where, params = ("WHERE ts >= ?", (since,)) if since else ("", ())
+        with self._lock:
+            total = self._db.execute(f"SELECT COUNT(*) FROM entries {where}", params).fetchone()[0]
+            rows = self._db.execute(
+                f"SELECT record FROM entries {where} ORDER BY id DESC LIMIT ? OFFSET ?",
+                (*params, page_size, (max(page, 1) - 1) * page_size)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows], total
+
+    def clear(self) -> None:
+        """Efface tout l'historique (disque et mémoire)."""
+        self.flush()
+        with self._lock:
+            self._db.execute("DELETE FROM entries")
+            self._db.commit()
+        self.recent.clear()
+        self._recent_by_hash.clear()
+
+    def import_json(self, path: Path) -> int:
+        """
+        Importe un ancien historique JSON (liste de résultats) si la base est encore vide
+
+        Args:
+            path: Fichier `history.json`
+
+        Returns:
+            int: Nombre de résultats importés
+        """
+        with self._lock:
+            empty = self._db.execute("SELECT 1 FROM entries LIMIT 1").fetchone() is None
+        if not empty or not Path(path).exists():
+            return 0
+        with open(path, 'r', encoding='utf-8') as f:
+            records = [r for r in json.load(f) if isinstance(r, dict)]
+        for record in records:
+            self.add(record)
+        self.flush()
+        return len(records)
+
+    def close(self) -> None:
+        """Termine les écritures en attente puis ferme l'historique."""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        self._thread = None
+        with self._read_lock:
+            if self._reader is not None:
+                self._reader.close()
+                self._reader = None
+        self._db.close()
+
+def format_history_line(index: int, record: Dict[str, Any]) -> str:
+    """Ligne d'historique : numéro, date, catégorie et affirmation."""
+    result = record.get("result", {})
+    category = result.get("category") or record.get("status", "")
+    return f"{index}. [{str(record.get('timestamp', ''))[:16]}] ({category}) {record.get('affirmation', 'Inconnu')}"
+
+# --- Exemple d'utilisation du module ---
+if __name__ == '__main__':
+    cli = argparse.ArgumentParser(description="Historique des affirmations vérifiées")
+    cli.add_argument("--history", type=Path, default=DEFAULT_HISTORY_PATH, help="Fichier SQLite de l'historique")
+    commands = cli.add_subparsers(dest="command", required=True)
+    page_cmd = commands.add_parser("page", help="Une page de l'historique (la plus récente par défaut)")
+    page_cmd.add_argument("--page", type=int, default=1, help="Numéro de page")
+    page_cmd.add_argument("--since", default=None, metavar="AAAA-MM-JJ", help="Résultats à partir de cette date")
+    find_cmd = commands.add_parser("find", help="Dernière vérification d'une affirmation")
+    find_cmd.add_argument("affirmation", help="Texte de l'affirmation")
+    args = cli.parse_args()
+
+    store = HistoryStore(args.history)
+    if args.command == "page":
+        entries, total = store.page(args.page, since=args.since)
+        first = (args.page - 1) * Config.HISTORY_PAGE_SIZE + 1
+        for i, entry in enumerate(entries, first):
+            print(format_history_line(i, entry))
+        print(f"Page {args.page}/{max(1, -(-total // Config.HISTORY_PAGE_SIZE))} ({total} résultats)")
+    else:
+        found = store.last_check(args.affirmation)
+        print(json.dumps(found, indent=2, ensure_ascii=False) if found else "Jamais vérifiée")
+    store.close()
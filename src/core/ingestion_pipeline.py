@@ -1,6 +1,14 @@
 import os
-import re
-from typing import List
+import time
+import codecs
+import asyncio
+from typing import List, Dict, Any, Optional, AsyncIterator
+
+from .text_normalization import (
+    CueState, iter_cue_lines, normalize_whitespace,
+    remove_brackets, strip_cue_tags
+)
+from .claim_extraction import split_sentences_fr, ends_sentence
 
 # NÉCESSITE : Rien d'autre que Python. Nous lisons un fichier local.
 
@@ -18,45 +26,18 @@ LOCAL_VTT_FILE = "Impôts, RN, Algérie... Éric Zemmour invité du Face à Face
 
 def clean_transcript(text: str) -> List[str]:
     """Nettoie la transcription et la découpe en phrases pour le Fact-Checker."""
-    # Correction des expressions régulières pour Python
-    text = re.sub(r'\[.*?\]', '', text)
-    text = re.sub(r'\s+', ' ', text).strip()
-    sentences = re.split(r'(?<=[.?!;])\s+', text)
-    cleaned_sentences = [s.strip() for s in sentences if s.strip()]
-    return cleaned_sentences
+    # Crochets retirés, puis mêmes règles de découpage que le mode live (voir `split_sentences_fr`)
+    return split_sentences_fr(remove_brackets(text))
 
 def parse_vtt(vtt_content: str) -> List[str]:
     """
-    Extrait et nettoie le texte d'un fichier VTT.
-    Version 2 : Gère les en-têtes et la déduplication.
+    Extrait et nettoie le texte d'un fichier VTT (ou SRT).
+    Version 3 : tokenizer en une passe (en-têtes, numéros de cue, déduplication).
     """
     
-    lines = vtt_content.splitlines()
-    dialogue_lines = []
-    last_line_added = "" # Variable pour vérifier les doublons
-    in_header = True # Indicateur pour ignorer l'en-tête
-    
-    for line in lines:
-        # Ignore l'en-tête VTT et les lignes vides
-        if line.startswith("WEBVTT") or line.startswith("Kind:") or line.startswith("Language:"):
-            continue
-        # Sortir du mode en-tête après la première ligne vide suivant l'en-tête
-        if not line.strip():
-            in_header = False
-            continue
-        if in_header:
-            continue
-            
-        # Ignore les horodatages et autres métadonnées (qui commencent par des chiffres, ex: 00:00:00.000 --> 00:00:00.000)
-        # Note: Utilisation de la version Python de l'expression régulière
-        if re.match(r'\d{2}:\d{2}:\d{2}\.\d{3}', line.strip()):
-            continue
-        
-        # Nettoyage et déduplication
-        cleaned_line = re.sub(r'<[^>]+>', '', line).strip() # Retire les balises VTT <c> et les horodatages internes
-        if cleaned_line and cleaned_line != last_line_added:
-            dialogue_lines.append(cleaned_line)
-            last_line_added = cleaned_line
+    # Les balises VTT sont retirées en une seule fois sur tout le contenu (bien plus rapide que ligne par ligne)
+    lines = strip_cue_tags(vtt_content).splitlines()
+    dialogue_lines = [text for _, _, text in iter_cue_lines(lines, with_timestamps=False)]
         
     # Concaténer tout le dialogue en un seul bloc de texte
     full_text = " ".join(dialogue_lines)
@@ -64,6 +45,15 @@ def parse_vtt(vtt_content: str) -> List[str]:
     # Utiliser le nettoyeur de phrases
     return clean_transcript(full_text)
 
+def parse_vtt_timed(vtt_content: str) -> List[Dict[str, Any]]:
+    """
+    Variante de `parse_vtt` qui garde les horodatages : chaque phrase est un dictionnaire
+    {"text", "start", "end"} (secondes depuis le début de la vidéo), pour aligner les verdicts sur la vidéo.
+    Même découpage que le mode live (une seule passe, voir `IncrementalCaptionParser`).
+    """
+    parser = IncrementalCaptionParser()
+    return parser.feed(vtt_content) + parser.flush()
+
 def ingest_from_local_vtt(file_path: str) -> List[str]:
     """Lit le fichier .vtt local et le parse."""
     
@@ -86,12 +76,161 @@ def ingest_from_local_vtt(file_path: str) -> List[str]:
         print(f"Erreur lors de la lecture du fichier VTT : {e}")
         return []
 
+# --- Mode Suivi (Live) : lecture incrémentale d'un fichier VTT/SRT en cours d'écriture ---
+
+class IncrementalCaptionParser:
+    """
+    Parser VTT/SRT incrémental : reçoit le texte par morceaux et renvoie les phrases complètes.
+
+    Chaque phrase est un dictionnaire {"text", "start", "end"} (secondes depuis le début de la vidéo).
+    Les horodatages sont ceux des cues qui contiennent la phrase (précision au niveau de la cue).
+    La déduplication des lignes répétées (sous-titres YouTube) est la même que `parse_vtt`.
+    """
+
+    def __init__(self):
+        self._partial_line = ""       # Fin de ligne pas encore terminée par un saut de ligne
+        self._state = CueState()      # État du tokenizer partagé (cue courante, déduplication)
+        self._pending_text = ""       # Début de phrase en attente de ponctuation finale
+        self._pending_start: Optional[float] = None
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """
+        Ajoute un morceau de texte et renvoie les phrases devenues complètes.
+
+        Args:
+            chunk: Nouveau texte lu dans le fichier (peut couper une ligne en deux)
+
+        Returns:
+            List[Dict[str, Any]]: Phrases complètes avec leurs horodatages
+        """
+        data = self._partial_line + chunk
+        # La dernière ligne n'est peut-être pas terminée : on la garde pour le prochain appel
+        complete, _, self._partial_line = data.rpartition("\n")
+        if not complete:
+            return []
+        return self._consume(strip_cue_tags(complete).split("\n"))
+
+    def flush(self) -> List[Dict[str, Any]]:
+        """
+        Termine la lecture : renvoie la dernière phrase, même sans ponctuation finale.
+
+        Returns:
+            List[Dict[str, Any]]: Phrases restantes
+        """
+        sentences = []
+        if self._partial_line:
+            sentences.extend(self._consume([strip_cue_tags(self._partial_line)]))
+            self._partial_line = ""
+        remainder = self._pending_text.strip()
+        if remainder:
+            sentences.append({"text": remainder, "start": self._pending_start, "end": self._state.end})
+        self._pending_text = ""
+        self._pending_start = None
+        return sentences
+
+    def _consume(self, lines: List[str]) -> List[Dict[str, Any]]:
+        """Passe les lignes au tokenizer et assemble les phrases complètes."""
+        sentences = []
+        for start, end, line in iter_cue_lines(lines, self._state):
+            line = remove_brackets(line).strip()
+            if not line:
+                continue
+            if self._pending_start is None:
+                self._pending_start = start
+
+            # Règles françaises (abréviations, initiales, nombres décimaux, voir `split_sentences_fr`) ;
+            # le texte en attente n'est qu'un début de phrase, le redécouper reste bon marché
+            pieces = split_sentences_fr(f"{self._pending_text} {line}" if self._pending_text else line)
+            if not pieces:
+                continue
+            # La dernière phrase reste en attente tant qu'elle ne finit pas (ex: "... selon M.")
+            if ends_sentence(pieces[-1]):
+                complete, self._pending_text = pieces, ""
+            else:
+                complete, self._pending_text = pieces[:-1], pieces[-1]
+            if not complete:
+                continue
+
+            emitted = [
+                {"text": normalize_whitespace(piece), "start": self._pending_start, "end": end}
+                for piece in complete if piece.strip()
+            ]
+            if emitted:
+                # La suite du texte en attente commence dans la cue courante
+                self._pending_start = start if self._pending_text else None
+                sentences.extend(emitted)
+        return sentences
+
+async def follow_caption_file(
+    file_path: str,
+    poll_interval: float = 0.5,
+    idle_timeout: Optional[float] = None,
+    from_start: bool = True
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Suit un fichier VTT/SRT en cours d'écriture (yt-dlp, ASR) et produit les nouvelles phrases.
+
+    Le fichier est surveillé par scrutation (polling) de sa taille : seuls les octets ajoutés
+    depuis le dernier décalage sont lus et parsés. Chaque phrase reçoit en plus `detected_at`,
+    l'heure (time.time()) à laquelle elle a été lue, pour mesurer la latence de bout en bout.
+
+    Args:
+        file_path: Chemin du fichier à suivre (il peut ne pas encore exister)
+        poll_interval: Intervalle de scrutation en secondes
+        idle_timeout: Arrête le suivi après ce nombre de secondes sans nouvelles données (None = jamais)
+        from_start: Lit le fichier depuis le début (sinon, seulement les ajouts futurs)
+
+    Yields:
+        Dict[str, Any]: Phrase {"text", "start", "end", "detected_at"}
+    """
+    parser = IncrementalCaptionParser()
+    # Décodeur incrémental : un caractère UTF-8 peut être coupé entre deux lectures
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    offset = None
+    last_growth = time.monotonic()
+
+    while True:
+        try:
+            size = os.path.getsize(file_path)
+        except OSError:
+            size = None  # Fichier pas encore créé par le producteur
+
+        if size is not None:
+            if offset is None:
+                offset = 0 if from_start else size
+            if size < offset:
+                # Fichier tronqué ou recréé : on repart de zéro
+                offset = 0
+                parser = IncrementalCaptionParser()
+                decoder.reset()
+            if size > offset:
+                with open(file_path, 'rb') as f:
+                    f.seek(offset)
+                    new_bytes = f.read(size - offset)
+                offset += len(new_bytes)
+                last_growth = time.monotonic()
+                detected_at = time.time()
+                for sentence in parser.feed(decoder.decode(new_bytes)):
+                    yield {**sentence, "detected_at": detected_at}
+
+        if idle_timeout is not None and time.monotonic() - last_growth > idle_timeout:
+            for sentence in parser.flush():
+                yield {**sentence, "detected_at": time.time()}
+            return
+
+        await asyncio.sleep(poll_interval)
+
 # --- Exemple d'utilisation du module (gardé pour les tests locaux) ---
+# Lancer depuis src/ : python -m core.ingestion_pipeline
 if __name__ == '__main__':
     
+    from .claim_extraction import extract_claims
+
     statements = ingest_from_local_vtt(LOCAL_VTT_FILE)
+    # Seules les phrases vérifiables partent à l'analyse (le reste n'est que du dialogue)
+    claims = extract_claims(statements)
     
     print("\n--- RÉSULTAT DE L'INGESTION ---\n")
-    for s in statements[:5]: # Afficher les 5 premières phrases
+    for s in claims[:5]: # Afficher les 5 premières affirmations retenues
         print(f"- {s}")
-    print(f"Total de {len(statements)} affirmations extraites.")
+    print(f"Total de {len(claims)} affirmations retenues sur {len(statements)} phrases.")
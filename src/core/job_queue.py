@@ -0,0 +1,490 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module de file de travaux durable pour le traitement réparti des lots d'affirmations.
+
+Un seul processus (un sémaphore, une clé API) plafonne le débit. Ici, les modes batch et
+fichier (`live_fact_checker.py --queue`) déposent les affirmations dans une file SQLite,
+et plusieurs processus "workers", chacun avec sa propre clé API, les analysent :
+- bail à durée limitée (délai de visibilité) : un travail pris par un worker qui plante
+  redevient disponible à l'expiration du bail ; le worker le prolonge tant qu'il travaille ;
+- nouvelles tentatives avec délai croissant, jusqu'à `QUEUE_MAX_ATTEMPTS` ; au-delà, le travail
+  est marqué en échec avec le dernier message d'erreur ;
+- agrégation : les résultats d'un lot sont réunis dans l'ordre d'origine, au format des
+  autres modes, dans `src/results/resultats_queue_<lot>.json`.
+
+SQLite en mode WAL gère plusieurs processus sur la même machine. Pour plusieurs machines,
+le fichier doit être sur un disque partagé qui respecte les verrous POSIX (pas NFS).
+
+Lancer depuis src/ :
+    python -m core.job_queue enqueue affirmations.txt
+    MISTRAL_API_KEY=... python -m core.job_queue worker --concurrency 2
+    python -m core.job_queue status <lot>
+    python -m core.job_queue collect <lot>
+"""
+
+import os
+import json
+import time
+import uuid
+import socket
+import sqlite3
+import asyncio
+import logging
+import argparse
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+from .utils import Config, validate_text, format_affirmation, media_timing
+from .background_io import write_json_atomic
+from .usage_ledger import tracking_run
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_PATH = Path(os.getenv(
+    "JOB_QUEUE_PATH", str(Path(__file__).resolve().parents[2] / "data" / "queue" / "jobs.sqlite3")
+))
+DEFAULT_RESULT_DIR = Path(__file__).resolve().parents[1] / "results"
+
+# États d'un travail : en attente, pris par un worker (bail en cours), terminé, en échec définitif
+JOB_STATUSES = ("pending", "leased", "done", "failed")
+
+# =============================================
+# FILE DURABLE
+# =============================================
+
+class JobQueue:
+    """
+    File de travaux SQLite partagée par les producteurs et les workers
+
+    Chaque travail porte une affirmation (texte ou dictionnaire horodaté) et appartient à un
+    lot ("run"). Les méthodes sont bloquantes : depuis une coroutine, les appeler via
+    `asyncio.to_thread`.
+    """
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_QUEUE_PATH,
+        visibility_timeout: float = Config.QUEUE_VISIBILITY_TIMEOUT,
+        max_attempts: int = Config.QUEUE_MAX_ATTEMPTS
+    ):
+        """
+        Ouvre (ou crée) la file
+
+        Args:
+            path: Fichier SQLite de la file
+            visibility_timeout: Durée d'un bail (s) avant qu'un travail non terminé soit redistribué
+            max_attempts: Nombre maximal de tentatives par travail
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        # Une connexion par file, utilisée depuis les threads de `asyncio.to_thread` un à la fois
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), timeout=30, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS runs (run_id TEXT PRIMARY KEY, name TEXT, total INTEGER, created_at REAL)"
+        )
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT, run_id TEXT, seq INTEGER, payload TEXT,"
+            " status TEXT DEFAULT 'pending', attempts INTEGER DEFAULT 0, available_at REAL,"
+            " lease_until REAL, worker TEXT, result TEXT, error TEXT, updated_at REAL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, available_at)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS jobs_run ON jobs (run_id, seq)")
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Transaction exclusive en écriture (BEGIN IMMEDIATE) : deux workers ne prennent jamais le même travail."""
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._db
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    # --- Producteur ---
+
+    def create_run(self, affirmations: List[Union[str, Dict[str, Any]]], name: str = "") -> str:
+        """
+        Dépose un lot d'affirmations dans la file
+
+        Args:
+            affirmations: Affirmations (textes ou dictionnaires {"affirmation", "start", "end"})
+            name: Libellé du lot (nom du fichier d'origine...)
+
+        Returns:
+            str: Identifiant du lot
+        """
+        run_id = f"{datetime.now():%Y%m%d_%H%M%S}_{uuid.uuid4().hex[:6]}"
+        now = time.time()
+        with self._transaction() as db:
+            db.execute("INSERT INTO runs VALUES (?, ?, ?, ?)", (run_id, name, len(affirmations), now))
+            db.executemany(
+                "INSERT INTO jobs (run_id, seq, payload, available_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                [(run_id, seq, json.dumps(aff, ensure_ascii=False), now, now) for seq, aff in enumerate(affirmations, 1)]
+            )
+        logger.info(f"Lot {run_id} déposé dans la file ({len(affirmations)} affirmations)")
+        return run_id
+
+    # --- Worker ---
+
+    def lease(self, worker: str) -> Optional[Dict[str, Any]]:
+        """
+        Prend le prochain travail disponible (en attente, ou dont le bail a expiré)
+
+        Args:
+            worker: Identifiant du worker
+
+        Returns:
+            Optional[Dict[str, Any]]: {"id", "run_id", "seq", "payload", "attempts"} ou None si rien n'est disponible
+        """
+        now = time.time()
+        with self._transaction() as db:
+            # Bail expiré sur la dernière tentative : le worker a planté trop souvent sur ce travail
+            db.execute(
+                "UPDATE jobs SET status = 'failed', error = ?, updated_at = ?"
+                " WHERE status = 'leased' AND lease_until < ? AND attempts >= ?",
+                ("Délai de visibilité dépassé à chaque tentative", now, now, self.max_attempts)
+            )
+            row = db.execute(
+                "SELECT id, run_id, seq, payload, attempts FROM jobs"
+                " WHERE (status = 'pending' AND available_at <= ?) OR (status = 'leased' AND lease_until < ?)"
+                " ORDER BY id LIMIT 1",
+                (now, now)
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute(
+                "UPDATE jobs SET status = 'leased', worker = ?, attempts = attempts + 1, lease_until = ?, updated_at = ?"
+                " WHERE id = ?",
+                (worker, now + self.visibility_timeout, now, row[0])
+            )
+        return {"id": row[0], "run_id": row[1], "seq": row[2], "payload": json.loads(row[3]), "attempts": row[4] + 1}
+
+    def extend_lease(self, job_id: int, worker: str) -> bool:
+        """
+        Prolonge le bail d'un travail en cours
+
+        Returns:
+            bool: False si le bail a été perdu (expiré et repris par un autre worker)
+        """
+        now = time.time()
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET lease_until = ?, updated_at = ? WHERE id = ? AND status = 'leased' AND worker = ?",
+                (now + self.visibility_timeout, now, job_id, worker)
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id: int, worker: str, result: Dict[str, Any]) -> bool:
+        """
+        Enregistre le résultat d'un travail
+
+        Returns:
+            bool: False si le bail avait été perdu (le résultat de l'autre worker fera foi)
+        """
+        with self._transaction() as db:
+            cursor = db.execute(
+                "UPDATE jobs SET status = 'done', result = ?, error = NULL, lease_until = NULL, updated_at = ?"
+                " WHERE id = ? AND status = 'leased' AND worker = ?",
+                (json.dumps(result, ensure_ascii=False), time.time(), job_id, worker)
+            )
+        return cursor.rowcount == 1
+
+    def fail(self, job_id: int, worker: str, error: str, retryable: bool = True) -> str:
+        """
+        Signale l'échec d'une tentative
+
+        Args:
+            job_id: Travail concerné
+            worker: Identifiant du worker
+            error: Message d'erreur
+            retryable: False pour une erreur définitive (affirmation invalide)
+
+        Returns:
+            str: Nouvel état du travail ("pending" si une nouvelle tentative est prévue, sinon "failed")
+        """
+        now = time.time()
+        with self._transaction() as db:
+            row = db.execute(
+                "SELECT attempts FROM jobs WHERE id = ? AND status = 'leased' AND worker = ?", (job_id, worker)
+            ).fetchone()
+            if row is None:
+                return "lost"
+            attempts = row[0]
+            if retryable and attempts < self.max_attempts:
+                # Délai croissant : une panne de l'API ou un blocage de débit a le temps de passer
+                db.execute(
+                    "UPDATE jobs SET status = 'pending', available_at = ?, lease_until = NULL, error = ?, updated_at = ?"
+                    " WHERE id = ?",
+                    (now + Config.QUEUE_RETRY_DELAY * attempts, error, now, job_id)
+                )
+                return "pending"
+            db.execute(
+                "UPDATE jobs SET status = 'failed', lease_until = NULL, error = ?, updated_at = ? WHERE id = ?",
+                (error, now, job_id)
+            )
+            return "failed"
+
+    # --- Suivi et agrégation ---
+
+    def run_status(self, run_id: str) -> Dict[str, int]:
+        """
+        Avancement d'un lot
+
+        Returns:
+            Dict[str, int]: Nombre de travaux par état, plus "total"
+        """
+        with self._lock:
+            rows = self._db.execute("SELECT status, COUNT(*) FROM jobs WHERE run_id = ? GROUP BY status", (run_id,)).fetchall()
+        counts = {status: 0 for status in JOB_STATUSES}
+        counts.update(dict(rows))
+        counts["total"] = sum(counts[status] for status in JOB_STATUSES)
+        return counts
+
+    def run_results(self, run_id: str) -> List[Dict[str, Any]]:
+        """
+        Résultats d'un lot, dans l'ordre de dépôt (travaux en échec sous forme de rapport d'erreur)
+
+        Returns:
+            List[Dict[str, Any]]: Un résultat par travail terminé ou en échec, avec son "id" (rang dans le lot)
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT seq, payload, status, attempts, result, error FROM jobs"
+                " WHERE run_id = ? AND status IN ('done', 'failed') ORDER BY seq",
+                (run_id,)
+            ).fetchall()
+        results = []
+        for seq, payload, status, attempts, result, error in rows:
+            if status == "done":
+                results.append({"id": seq, **json.loads(result)})
+                continue
+            affirmation = json.loads(payload)
+            results.append({
+                "id": seq,
+                "timestamp": datetime.now().isoformat(),
+                "affirmation": format_affirmation(affirmation),
+                "status": "error",
+                "error_type": "JobFailed",
+                "error_message": error or "Échec",
+                "attempts": attempts,
+                **media_timing(affirmation)
+            })
+        return results
+
+    def list_runs(self) -> List[Dict[str, Any]]:
+        """Lots connus, du plus récent au plus ancien."""
+        with self._lock:
+            rows = self._db.execute("SELECT run_id, name, total, created_at FROM runs ORDER BY created_at DESC").fetchall()
+        return [{"run_id": r[0], "name": r[1], "total": r[2], "created_at": r[3]} for r in rows]
+
+    def close(self) -> None:
+        """Ferme la file."""
+        self._db.close()
+
+# =============================================
+# WORKER
+# =============================================
+
+async def process_job(queue: JobQueue, analyzer: Any, job: Dict[str, Any], worker: str) -> str:
+    """
+    Analyse un travail en gardant son bail actif, puis enregistre le résultat ou l'échec
+
+    Args:
+        queue: File de travaux
+        analyzer: Instance de CritiqueAnalyzer
+        job: Travail obtenu par `JobQueue.lease`
+        worker: Identifiant du worker
+
+    Returns:
+        str: "done", "pending" (nouvelle tentative prévue), "failed" ou "lost" (bail perdu)
+    """
+    affirmation = job["payload"]
+    if not validate_text(affirmation):
+        return await asyncio.to_thread(queue.fail, job["id"], worker, "Affirmation invalide ou vide", False)
+
+    async def keep_lease() -> None:
+        while True:
+            await asyncio.sleep(queue.visibility_timeout / 3)
+            if not await asyncio.to_thread(queue.extend_lease, job["id"], worker):
+                logger.warning(f"Bail perdu pour le travail {job['id']}")
+                return
+
+    heartbeat = asyncio.create_task(keep_lease())
+    started = time.perf_counter()
+    try:
+        # Consommation inscrite au compte du lot de la file (même identifiant sur tous les workers)
+        with tracking_run(job["run_id"]):
+            result = await analyzer.analyze(affirmation)
+    except Exception as e:
+        status = await asyncio.to_thread(queue.fail, job["id"], worker, str(e))
+        logger.warning(f"Travail {job['id']} (tentative {job['attempts']}) en échec -> {status}: {str(e)}")
+        return status
+    finally:
+        heartbeat.cancel()
+
+    # Même format que les autres modes (voir `AffirmationProcessor.process_affirmation`)
+    record = {"timestamp": datetime.now().isoformat(), "affirmation": format_affirmation(affirmation), "result": result,
+              "elapsed_s": round(time.perf_counter() - started, 3)}
+    completed = await asyncio.to_thread(queue.complete, job["id"], worker, record)
+    return "done" if completed else "lost"
+
+async def run_worker(
+    queue: JobQueue,
+    analyzer: Any,
+    concurrency: int = Config.QUEUE_WORKER_CONCURRENCY,
+    worker: Optional[str] = None,
+    poll_interval: float = 1.0,
+    idle_exit: Optional[float] = None
+) -> Dict[str, int]:
+    """
+    Boucle d'un worker : prend et analyse des travaux jusqu'à l'arrêt (Ctrl+C) ou l'inactivité
+
+    Args:
+        queue: File de travaux
+        analyzer: Instance de CritiqueAnalyzer (avec la clé API de ce worker)
+        concurrency: Travaux traités en parallèle par ce worker
+        worker: Identifiant du worker (par défaut : machine:pid)
+        poll_interval: Attente entre deux scrutations quand la file est vide (s)
+        idle_exit: S'arrête après ce nombre de secondes sans travail (None = jamais)
+
+    Returns:
+        Dict[str, int]: Nombre de travaux par issue ("done", "pending", "failed", "lost")
+    """
+    worker = worker or f"{socket.gethostname()}:{os.getpid()}"
+    stats = {"done": 0, "pending": 0, "failed": 0, "lost": 0}
+    logger.info(f"Worker {worker} démarré ({concurrency} travaux en parallèle, file {queue.path})")
+
+    async def slot() -> None:
+        idle_since = time.monotonic()
+        while True:
+            job = await asyncio.to_thread(queue.lease, worker)
+            if job is None:
+                if idle_exit is not None and time.monotonic() - idle_since >= idle_exit:
+                    return
+                await asyncio.sleep(poll_interval)
+                continue
+            stats[await process_job(queue, analyzer, job, worker)] += 1
+            idle_since = time.monotonic()
+
+    await asyncio.gather(*(slot() for _ in range(concurrency)))
+    return stats
+
+# =============================================
+# AGRÉGATION DES RÉSULTATS
+# =============================================
+
+async def wait_for_run(
+    queue: JobQueue,
+    run_id: str,
+    poll_interval: float = 2.0,
+    on_progress: Optional[Callable[[Dict[str, int]], None]] = None
+) -> Dict[str, int]:
+    """
+    Attend que tous les travaux d'un lot soient terminés ou en échec
+
+    Args:
+        queue: File de travaux
+        run_id: Identifiant du lot
+        poll_interval: Intervalle de scrutation (s)
+        on_progress: Appelée avec l'avancement à chaque changement
+
+    Returns:
+        Dict[str, int]: Avancement final (voir `JobQueue.run_status`)
+    """
+    last = None
+    while True:
+        status = await asyncio.to_thread(queue.run_status, run_id)
+        if status != last and on_progress:
+            on_progress(status)
+        last = status
+        if status["done"] + status["failed"] >= status["total"]:
+            return status
+        await asyncio.sleep(poll_interval)
+
+def collect_run(queue: JobQueue, run_id: str, result_dir: Path = DEFAULT_RESULT_DIR) -> Path:
+    """
+    Écrit les résultats d'un lot dans le dossier des résultats
+
+    Args:
+        queue: File de travaux
+        run_id: Identifiant du lot
+        result_dir: Dossier de sortie
+
+    Returns:
+        Path: Fichier écrit (`resultats_queue_<lot>.json`)
+    """
+    result_dir.mkdir(parents=True, exist_ok=True)
+    path = result_dir / f"resultats_queue_{run_id}.json"
+    write_json_atomic(path, queue.run_results(run_id))
+    return path
+
+def format_progress(status: Dict[str, int]) -> str:
+    """Avancement d'un lot sur une ligne."""
+    return (f"{status['done'] + status['failed']}/{status['total']} traités "
+            f"({status['done']} réussis, {status['failed']} en échec, {status['leased']} en cours, {status['pending']} en attente)")
+
+# --- Exemple d'utilisation du module ---
+if __name__ == '__main__':
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    cli = argparse.ArgumentParser(description="File de travaux répartie du fact-checker")
+    cli.add_argument("--queue", type=Path, default=DEFAULT_QUEUE_PATH, help="Fichier SQLite de la file")
+    commands = cli.add_subparsers(dest="command", required=True)
+
+    enqueue_cmd = commands.add_parser("enqueue", help="Dépose les lignes d'un fichier texte comme un lot")
+    enqueue_cmd.add_argument("file", type=Path)
+
+    worker_cmd = commands.add_parser("worker", help="Analyse les travaux de la file")
+    worker_cmd.add_argument("--concurrency", type=int, default=Config.QUEUE_WORKER_CONCURRENCY)
+    worker_cmd.add_argument("--api-key-env", default="MISTRAL_API_KEY", help="Variable d'environnement de la clé API de ce worker")
+    worker_cmd.add_argument("--idle-exit", type=float, default=None, help="S'arrête après N secondes sans travail")
+
+    for name in ("status", "collect"):
+        run_cmd = commands.add_parser(name, help="Avancement du lot" if name == "status" else "Écrit les résultats du lot dans src/results")
+        run_cmd.add_argument("run_id", nargs="?", default=None, help="Lot (par défaut : le plus récent)")
+
+    args = cli.parse_args()
+    job_queue = JobQueue(args.queue)
+
+    if args.command == "enqueue":
+        with open(args.file, 'r', encoding='utf-8') as f:
+            lines = [line.strip() for line in f if line.strip()]
+        print(f"Lot {job_queue.create_run(lines, name=args.file.name)} : {len(lines)} affirmations déposées")
+
+    elif args.command == "worker":
+        from .analyse_critique import CritiqueAnalyzer
+        from .client_registry import close_clients
+
+        async def work() -> None:
+            analyzer = await CritiqueAnalyzer.create(api_key=os.getenv(args.api_key_env))
+            try:
+                stats = await run_worker(job_queue, analyzer, args.concurrency, idle_exit=args.idle_exit)
+                print(f"Worker arrêté : {stats}")
+            finally:
+                await close_clients()
+
+        try:
+            asyncio.run(work())
+        except KeyboardInterrupt:
+            print("\nWorker interrompu (les travaux en cours seront repris à l'expiration de leur bail)")
+
+    else:
+        runs = job_queue.list_runs()
+        run_id = args.run_id or (runs[0]["run_id"] if runs else None)
+        if run_id is None:
+            print("Aucun lot dans la file")
+        elif args.command == "status":
+            print(f"Lot {run_id} : {format_progress(job_queue.run_status(run_id))}")
+        else:
+            print(f"Résultats du lot {run_id} écrits dans {collect_run(job_queue, run_id)}")
+    job_queue.close()
@@ -1,6 +1,8 @@
 # prompts_templates.py
 
 import sys
+import hashlib
+from functools import lru_cache
 from typing import Dict, List
 
 # --- Constante de Rigueur (Règle d'or) ---
@@ -70,6 +72,22 @@ FORMAT DE SORTIE : Vous devez **OBLIGATOIREMENT** ne répondre qu'avec la catég
 RÉPONSE UNIQUE : [CATÉGORIE]
 """
 
+# --- LISTE DES CATÉGORIES RECONNUES (Phase 1) ---
+# Les neuf catégories officielles de la méthodologie V80.x, dans l'ordre du prompt de classification.
+CATEGORIES = (
+    "LOGIQUE",
+    "STATISTIQUE",
+    "JURIDIQUE",
+    "CONSENSUS_SCIENCE",
+    "CONSENSUS_HISTO",
+    "DOCTRINE",
+    "NON_FAIT",
+    "POLITESSE",
+    "NON_VERIFIABLE",
+)
+# HUMOUR est une règle spéciale de la catégorie LOGIQUE, mais le modèle peut la renvoyer telle quelle.
+CATEGORIES_VALIDES = CATEGORIES + ("HUMOUR",)
+
 # --- PHASE 2 : PROMPT DE FACT-CHECKING SPÉCIALISÉ (V81.0) ---
 
 # 🚨 CORRECTION : Rétablissement du Dictionnaire (au lieu d'une liste)
@@ -96,10 +114,45 @@ SPECIALIZED_PROMPTS_NON_FACTUEL = {
 }
 
 
-def get_system_prompt_classify() -> str:
-    """Renvoie le prompt de classification."""
-    return SYSTEM_PROMPT_CLASSIFY
+def get_system_prompt_classify(constrained: bool = False) -> str:
+    """
+    Renvoie le prompt de classification.
 
+    Args:
+        constrained: True si la réponse est contrainte par `get_classify_response_format`
+            (la consigne "[CATÉGORIE]" est alors remplacée par le format JSON)
+    """
+    if not constrained:
+        return SYSTEM_PROMPT_CLASSIFY
+    return (
+        f"{SYSTEM_PROMPT_CLASSIFY.split('FORMAT DE SORTIE')[0]}"
+        "FORMAT DE SORTIE : Répondez **OBLIGATOIREMENT** avec un objet JSON de la forme exacte "
+        '{"category": "<CATÉGORIE>"}, '
+        f"où <CATÉGORIE> est l'une de : {', '.join(CATEGORIES_VALIDES)}."
+    )
+
+def get_classify_response_format() -> Dict:
+    """
+    Format de réponse contraint de la Phase 1 (sortie structurée "json_schema" de l'API Mistral)
+
+    Le champ "category" est limité aux CATEGORIES_VALIDES : le décodage ne peut pas produire
+    d'autre étiquette.
+    """
+    return {
+        "type": "json_schema",
+        "json_schema": {
+            "name": "classification",
+            "strict": True,
+            "schema": {
+                "type": "object",
+                "properties": {"category": {"type": "string", "enum": list(CATEGORIES_VALIDES)}},
+                "required": ["category"],
+                "additionalProperties": False,
+            },
+        },
+    }
+
+@lru_cache(maxsize=64)  # Prompts construits une seule fois par catégorie, puis réutilisés
 def get_specialized_system_prompt(category: str) -> str:
     """Retourne le system prompt spécifique à la catégorie pour l'analyse critique."""
 
@@ -146,3 +199,43 @@ def get_factuel_system_prompt() -> str:
         "Règles : Répondez en français. Si les sources confirment l'affirmation → VRAI. Si elles infirment → FAUX. Si elles sont insuffisantes/contradictoires → CONTESTÉ. "
         "FORMAT : [VERDICT BRUT] : [Synthèse factuelle] : [Explication] [Source: Référence]."
     )
+
+
+# --- MODE FUSIONNÉ : CLASSIFICATION + ANALYSE EN UN SEUL APPEL (V83.0) ---
+@lru_cache(maxsize=None)  # Prompts construits une seule fois, puis réutilisés à chaque appel
+def get_system_prompt_fused() -> str:
+    """
+    Retourne le prompt du mode fusionné : le modèle choisit la catégorie ET rédige le verdict
+    spécialisé dans une seule réponse JSON.
+
+    Le prompt réutilise les règles de classification et les consignes de chaque catégorie
+    pour que le verdict reste identique à celui du mode en deux phases.
+    """
+    # Consignes de Phase 2 regroupées par catégorie (une entrée par catégorie reconnue)
+    consignes = "\n\n".join(
+        f"### SI LA CATÉGORIE EST {categorie} :\n{get_specialized_system_prompt(categorie)}"
+        for categorie in CATEGORIES_VALIDES
+    )
+    # On retire la consigne de sortie de la Phase 1, remplacée par le format JSON ci-dessous
+    regles_classification = SYSTEM_PROMPT_CLASSIFY.split("FORMAT DE SORTIE")[0]
+    return (
+        f"{regles_classification}\n"
+        "ÉTAPE 2 : Une fois la catégorie choisie, rédigez le verdict en suivant UNIQUEMENT les consignes de cette catégorie.\n\n"
+        f"{consignes}\n\n"
+        "FORMAT DE SORTIE : Répondez **OBLIGATOIREMENT** avec un objet JSON valide, sans texte autour, de la forme exacte :\n"
+        '{"category": "<CATÉGORIE>", "analyse": "<verdict au format de la catégorie>"}\n'
+        f"La valeur de \"category\" DOIT être l'une de : {', '.join(CATEGORIES_VALIDES)}."
+    )
+
+
+@lru_cache(maxsize=None)
+def get_prompts_version() -> str:
+    """
+    Empreinte courte des prompts de classification et d'analyse, recopiée dans chaque résultat.
+
+    Elle change dès qu'un prompt est modifié : les statistiques (voir `result_stats`) séparent
+    ainsi les résultats obtenus avant et après la modification.
+    """
+    prompts = [SYSTEM_PROMPT_CLASSIFY, get_system_prompt_fused()]
+    prompts += [get_specialized_system_prompt(categorie) for categorie in CATEGORIES_VALIDES]
+    return hashlib.sha256("\n".join(prompts).encode("utf-8")).hexdigest()[:8]
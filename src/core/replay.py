@@ -0,0 +1,356 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module d'enregistrement et de rejeu des appels externes (API Mistral, recherche web).
+
+Chaque exécution interroge l'API en direct, avec des réponses non déterministes : impossible
+de comparer deux versions du code, ou de mesurer un gain de performance, à entrées égales.
+Ce module intercale une "cassette" entre le code et ses dépendances externes :
+- enregistrement : `RecordingMistralClient` et `recording_search` passent les appels au vrai
+  service et notent chaque couple requête → réponse avec sa durée (et, en streaming, le
+  rythme des fragments) ;
+- rejeu : `ReplayMistralClient` et `replay_search` servent ces réponses localement, sans clé
+  API ni réseau, instantanément ou avec les latences d'origine (`latency_scale`).
+
+Une requête est identifiée par son contenu exact (modèle, messages, options) : si un prompt
+change, la requête n'est plus dans la cassette et le rejeu échoue (`ReplayMiss`) au lieu de
+servir une réponse qui ne lui correspond pas.
+
+Depuis n'importe quel point d'entrée, via l'environnement :
+    LLM_CASSETTE=cassette.json LLM_CASSETTE_MODE=record python live_fact_checker.py
+    LLM_CASSETTE=cassette.json LLM_CASSETTE_MODE=replay LLM_REPLAY_LATENCY=1 python live_fact_checker.py
+Banc de régression complet : `python -m benchmarks.replay_batch` (depuis src/).
+"""
+
+import json
+import time
+import atexit
+import asyncio
+import hashlib
+import logging
+import threading
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Union
+
+from .utils import Config, format_response, format_stream_chunk
+from .background_io import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+CASSETTE_VERSION = 1
+
+class ReplayMiss(LookupError):
+    """
+    Requête absente de la cassette (prompt modifié, affirmation nouvelle...).
+    """
+    pass
+
+# =============================================
+# CASSETTE
+# =============================================
+
+def request_key(kind: str, request: Dict[str, Any]) -> str:
+    """
+    Identifiant d'une requête : empreinte de son contenu exact
+
+    Args:
+        kind: "llm" ou "search"
+        request: Paramètres de la requête (sérialisables en JSON)
+
+    Returns:
+        str: Empreinte SHA-256 (hexadécimale)
+    """
+    canonical = json.dumps({"kind": kind, **request}, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+class Cassette:
+    """
+    Couples requête → réponse enregistrés, rejoués dans leur ordre d'enregistrement
+
+    Une même requête enregistrée plusieurs fois (réponses différentes d'un modèle non
+    déterministe) est rejouée dans le même ordre ; au-delà, la dernière réponse est resservie.
+    """
+
+    def __init__(self, path: Union[str, Path], data: Optional[Dict[str, Any]] = None):
+        """
+        Initialise la cassette (vide, ou avec des données déjà chargées)
+
+        Args:
+            path: Fichier JSON de la cassette
+            data: Contenu déjà lu (voir `load`)
+        """
+        self.path = Path(path)
+        self.data = data or {"version": CASSETTE_VERSION, "created_at": datetime.now().isoformat(), "entries": {}}
+        self._cursors: Dict[str, int] = {}
+        self._lock = threading.Lock()  # La recherche web tourne dans des threads (`asyncio.to_thread`)
+        self.stats = {"recorded": 0, "replayed": 0, "missed": 0}
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "Cassette":
+        """
+        Lit une cassette enregistrée
+
+        Raises:
+            FileNotFoundError: Si le fichier n'existe pas
+            ValueError: Si le fichier n'est pas une cassette de cette version
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get("version") != CASSETTE_VERSION:
+            raise ValueError(f"Version de cassette non prise en charge: {data.get('version')!r}")
+        return cls(path, data)
+
+    def add(self, kind: str, request: Dict[str, Any], response: Any, latency_s: float) -> None:
+        """
+        Enregistre un couple requête → réponse
+
+        Args:
+            kind: "llm" ou "search"
+            request: Paramètres de la requête
+            response: Réponse sérialisable en JSON
+            latency_s: Durée de l'appel d'origine
+        """
+        entry = {"kind": kind, "request": request, "response": response, "latency_s": round(latency_s, 4)}
+        with self._lock:
+            self.data["entries"].setdefault(request_key(kind, request), []).append(entry)
+            self.stats["recorded"] += 1
+
+    def next(self, kind: str, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Prochaine réponse enregistrée pour cette requête
+
+        Returns:
+            Dict[str, Any]: Entrée {"kind", "request", "response", "latency_s"}
+
+        Raises:
+            ReplayMiss: Si la requête n'a jamais été enregistrée
+        """
+        key = request_key(kind, request)
+        with self._lock:
+            entries = self.data["entries"].get(key)
+            if not entries:
+                self.stats["missed"] += 1
+                raise ReplayMiss(f"Requête {kind} absente de la cassette {self.path.name} ({key[:12]})")
+            cursor = self._cursors.get(key, 0)
+            self._cursors[key] = cursor + 1
+            self.stats["replayed"] += 1
+            return entries[min(cursor, len(entries) - 1)]
+
+    def save(self) -> None:
+        """Écrit la cassette (atomiquement, voir `write_json_atomic`)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            write_json_atomic(self.path, self.data)
+        logger.info(f"Cassette {self.path} écrite ({sum(len(e) for e in self.data['entries'].values())} réponses)")
+
+async def _pause(latency_s: float, latency_scale: float) -> None:
+    if latency_scale > 0:
+        await asyncio.sleep(latency_s * latency_scale)
+
+def _llm_request(kwargs: Dict[str, Any], stream: bool) -> Dict[str, Any]:
+    """Paramètres d'un appel `chat.*_async` qui déterminent sa réponse."""
+    return {"stream": stream, **{name: value for name, value in kwargs.items() if value is not None}}
+
+def _usage(response: Any) -> Optional[Dict[str, int]]:
+    usage = getattr(response, "usage", None)
+    prompt_tokens = getattr(usage, "prompt_tokens", None)
+    completion_tokens = getattr(usage, "completion_tokens", None)
+    if isinstance(prompt_tokens, int) and isinstance(completion_tokens, int):
+        return {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens}
+    return None
+
+def _as_sdk_usage(usage: Optional[Dict[str, int]]) -> Optional[SimpleNamespace]:
+    return SimpleNamespace(**usage, total_tokens=sum(usage.values())) if usage else None
+
+# =============================================
+# CLIENT MISTRAL : ENREGISTREMENT
+# =============================================
+
+class _RecordingChat:
+    def __init__(self, owner: "RecordingMistralClient"):
+        self.owner = owner
+
+    async def complete_async(self, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        response = await self.owner.client.chat.complete_async(**kwargs)
+        self.owner.cassette.add(
+            "llm", _llm_request(kwargs, stream=False),
+            {"content": format_response(response), "usage": _usage(response)},
+            time.perf_counter() - start
+        )
+        return response
+
+    async def stream_async(self, **kwargs: Any) -> AsyncIterator[Any]:
+        start = time.perf_counter()
+        stream = await self.owner.client.chat.stream_async(**kwargs)
+
+        async def events() -> AsyncIterator[Any]:
+            # Chaque fragment est noté avec son instant d'arrivée, pour rejouer le TTFT et le débit
+            fragments: List[List[Any]] = []
+            usage = None
+            async for chunk in stream:
+                text = format_stream_chunk(chunk)
+                if text:
+                    fragments.append([round(time.perf_counter() - start, 4), text])
+                usage = _usage(getattr(chunk, "data", chunk)) or usage
+                yield chunk
+            self.owner.cassette.add(
+                "llm", _llm_request(kwargs, stream=True),
+                {"fragments": fragments, "usage": usage},
+                time.perf_counter() - start
+            )
+        return events()
+
+class RecordingMistralClient:
+    """
+    Enveloppe d'un vrai client Mistral qui enregistre chaque réponse dans une cassette
+    """
+
+    def __init__(self, client: Any, cassette: Cassette):
+        """
+        Args:
+            client: Client Mistral réel
+            cassette: Cassette où enregistrer (écrite par `cassette.save()`)
+        """
+        self.client = client
+        self.cassette = cassette
+        self.chat = _RecordingChat(self)
+        self.models = client.models
+
+# =============================================
+# CLIENT MISTRAL : REJEU
+# =============================================
+
+class _ReplayChat:
+    def __init__(self, owner: "ReplayMistralClient"):
+        self.owner = owner
+
+    async def complete_async(self, **kwargs: Any) -> SimpleNamespace:
+        entry = self.owner.cassette.next("llm", _llm_request(kwargs, stream=False))
+        await _pause(entry["latency_s"], self.owner.latency_scale)
+        response = entry["response"]
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=response["content"]))],
+            usage=_as_sdk_usage(response.get("usage"))
+        )
+
+    async def stream_async(self, **kwargs: Any) -> AsyncIterator[SimpleNamespace]:
+        entry = self.owner.cassette.next("llm", _llm_request(kwargs, stream=True))
+        fragments = entry["response"]["fragments"]
+        usage = _as_sdk_usage(entry["response"].get("usage"))
+        scale = self.owner.latency_scale
+        # Temps d'attente de la réponse (avant le premier fragment), puis rythme des fragments
+        await _pause(fragments[0][0] if fragments else entry["latency_s"], scale)
+
+        async def events() -> AsyncIterator[SimpleNamespace]:
+            previous = fragments[0][0] if fragments else 0.0
+            for offset, text in fragments:
+                await _pause(offset - previous, scale)
+                previous = offset
+                yield SimpleNamespace(data=SimpleNamespace(
+                    choices=[SimpleNamespace(delta=SimpleNamespace(content=text))], usage=None
+                ))
+            if usage is not None:
+                yield SimpleNamespace(data=SimpleNamespace(choices=[], usage=usage))
+        return events()
+
+class _ReplayModels:
+    async def list_async(self) -> List[str]:
+        return []
+
+class ReplayMistralClient:
+    """
+    Client Mistral local qui sert les réponses d'une cassette (aucune clé API, aucun réseau)
+    """
+
+    def __init__(self, cassette: Cassette, latency_scale: float = 0.0):
+        """
+        Args:
+            cassette: Cassette enregistrée
+            latency_scale: 0 pour des réponses immédiates, 1 pour les latences d'origine (0.5 : deux fois plus vite)
+        """
+        self.cassette = cassette
+        self.latency_scale = latency_scale
+        self.chat = _ReplayChat(self)
+        self.models = _ReplayModels()
+
+# =============================================
+# RECHERCHE WEB
+# =============================================
+
+SearchBackend = Callable[[str, str], List[str]]
+
+def recording_search(cassette: Cassette, backend: Optional[SearchBackend] = None) -> SearchBackend:
+    """
+    Moteur de recherche qui enregistre les résultats du vrai moteur (voir `fact_check_affirmations`)
+
+    Les erreurs ne sont pas enregistrées : au rejeu, la requête manquante lève `ReplayMiss`,
+    traitée comme l'erreur d'origine par le code appelant.
+
+    Args:
+        cassette: Cassette où enregistrer
+        backend: Moteur réel (par défaut : `fact_checker.rechercher_google`)
+
+    Returns:
+        SearchBackend: Fonction (requête, langue) -> URLs
+    """
+    if backend is None:
+        from .fact_checker import rechercher_google
+        backend = rechercher_google
+
+    def search(requete: str, langue: str) -> List[str]:
+        start = time.perf_counter()
+        urls = backend(requete, langue)
+        cassette.add("search", {"query": requete, "lang": langue}, list(urls), time.perf_counter() - start)
+        return urls
+    return search
+
+def replay_search(cassette: Cassette, latency_scale: float = 0.0) -> SearchBackend:
+    """
+    Moteur de recherche local qui sert les résultats d'une cassette
+
+    Args:
+        cassette: Cassette enregistrée
+        latency_scale: Facteur appliqué aux latences d'origine (0 : immédiat)
+
+    Returns:
+        SearchBackend: Fonction (requête, langue) -> URLs (appelée dans un thread : attente bloquante)
+    """
+    def search(requete: str, langue: str) -> List[str]:
+        entry = cassette.next("search", {"query": requete, "lang": langue})
+        if latency_scale > 0:
+            time.sleep(entry["latency_s"] * latency_scale)
+        return list(entry["response"])
+    return search
+
+# =============================================
+# BRANCHEMENT PAR L'ENVIRONNEMENT
+# =============================================
+
+def cassette_client(api_key: Optional[str] = None) -> Any:
+    """
+    Client Mistral selon `Config.LLM_CASSETTE_MODE` : enregistreur autour du client partagé, ou rejoueur
+
+    En enregistrement, la cassette est écrite à la sortie du processus.
+
+    Args:
+        api_key: Clé API (inutile en rejeu)
+
+    Returns:
+        Any: Client compatible avec `CritiqueAnalyzer`
+
+    Raises:
+        ValueError: Si le mode est inconnu
+    """
+    if Config.LLM_CASSETTE_MODE == "replay":
+        logger.info(f"Rejeu de la cassette {Config.LLM_CASSETTE} (latences x{Config.LLM_REPLAY_LATENCY})")
+        return ReplayMistralClient(Cassette.load(Config.LLM_CASSETTE), Config.LLM_REPLAY_LATENCY)
+    if Config.LLM_CASSETTE_MODE == "record":
+        from .client_registry import get_shared_mistral_client
+        cassette = Cassette(Config.LLM_CASSETTE)
+        atexit.register(cassette.save)
+        logger.info(f"Enregistrement des réponses dans la cassette {Config.LLM_CASSETTE}")
+        return RecordingMistralClient(get_shared_mistral_client(api_key), cassette)
+    raise ValueError(f"LLM_CASSETTE_MODE inconnu: {Config.LLM_CASSETTE_MODE!r} (record ou replay)")
@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module de statistiques cumulées sur tous les résultats enregistrés.
+
+`display_results` ne montre que les réussites et erreurs du lot en cours. Ici, chaque fichier
+de résultats (`src/results/resultats_*.json`) est intégré une seule fois dans un agrégat
+persistant (`data/stats/aggregate.json`), mis à jour en O(1) par résultat, sans relire les
+anciens fichiers :
+- répartition des verdicts par catégorie ;
+- taux d'erreurs et de rejets 429 (rate limiting) ;
+- percentiles de latence, sur un histogramme à paliers fixes (taille constante) ;
+- segments : un nouveau segment commence à chaque changement de modèle ou de prompts
+  (empreinte `prompts_templates.get_prompts_version`). Le rapport compare chaque segment au
+  précédent et signale les déplacements de catégories et les ralentissements.
+
+Les fichiers écrits par `save_results_to_file` sont intégrés dès leur écriture ; ceux écrits
+autrement (`job_queue collect`, anciens fichiers) le sont par la commande `update`.
+
+Lancer depuis src/ :
+    python -m core.result_stats update
+    python -m core.result_stats report [--html ../data/stats/rapport.html]
+    python -m core.result_stats rebuild
+"""
+
+import os
+import re
+import html
+import json
+import math
+import logging
+import argparse
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .utils import Config
+from .background_io import write_json_atomic
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATS_PATH = Path(os.getenv(
+    "RESULT_STATS_PATH", str(Path(__file__).resolve().parents[2] / "data" / "stats" / "aggregate.json")
+))
+DEFAULT_RESULT_DIR = Path(__file__).resolve().parents[1] / "results"
+# Fichiers de résultats intégrés (history.json reprend des résultats déjà présents ailleurs)
+RESULT_FILE_PATTERN = "resultats_*.json"
+
+# Histogramme des latences : paliers géométriques de LATENCY_MIN_S à ~15 min (bornes supérieures)
+LATENCY_MIN_S = 0.05
+LATENCY_FACTOR = 1.2
+LATENCY_BUCKETS = 55
+PERCENTILES = (50, 90, 95, 99)
+
+# Verdict brut en tête de l'analyse (ex: "[VERDICT BRUT] : CONTESTÉ", "BIAIS : Attaque personnelle")
+VERDICT_PATTERN = re.compile(
+    r"\b(VRAI|FAUX|BIAIS|CONTEST[ÉE]|INFOND[ÉE]|NON[-_ ]V[ÉE]RIFIABLE|ADMIS|TONALIT[ÉE])\b"
+)
+RATE_LIMIT_PATTERN = re.compile(r"\b429\b|rate.?limit", re.IGNORECASE)
+
+# =============================================
+# EXTRACTION DES CHAMPS D'UN RÉSULTAT
+# =============================================
+
+def extract_verdict(analyse: str) -> str:
+    """
+    Verdict brut d'une analyse (premier verdict cité dans ses 200 premiers caractères)
+
+    Args:
+        analyse: Texte du verdict
+
+    Returns:
+        str: VRAI, FAUX, BIAIS, CONTESTÉ, INFONDÉ, NON-VÉRIFIABLE, ADMIS, TONALITÉ ou AUTRE
+    """
+    match = VERDICT_PATTERN.search(analyse[:200].upper())
+    if not match:
+        return "AUTRE"
+    verdict = match.group(1)
+    if verdict.startswith("NON"):
+        return "NON-VÉRIFIABLE"
+    return verdict.replace("CONTESTE", "CONTESTÉ").replace("INFONDE", "INFONDÉ").replace("TONALITE", "TONALITÉ")
+
+def latency_bucket(seconds: float) -> int:
+    """Palier de l'histogramme des latences (calcul direct, sans parcours)."""
+    if seconds <= LATENCY_MIN_S:
+        return 0
+    return min(LATENCY_BUCKETS - 1, math.ceil(math.log(seconds / LATENCY_MIN_S, LATENCY_FACTOR)))
+
+def bucket_upper_bound(index: int) -> float:
+    """Borne supérieure (s) d'un palier de l'histogramme."""
+    return LATENCY_MIN_S * LATENCY_FACTOR ** index
+
+# =============================================
+# AGRÉGAT
+# =============================================
+
+def _new_segment(model: Optional[str], prompts: Optional[str], timestamp: str) -> Dict[str, Any]:
+    return {
+        "model": model, "prompts": prompts, "first_seen": timestamp, "last_seen": timestamp,
+        "results": 0, "errors": 0, "rate_limited": 0, "degraded": 0,
+        "categories": {}, "latency": [0] * LATENCY_BUCKETS, "latency_samples": 0,
+    }
+
+def _add_to(segment: Dict[str, Any], record: Dict[str, Any]) -> None:
+    """Ajoute un résultat à un segment (ou aux totaux) : nombre d'opérations constant."""
+    result = record.get("result", record)
+    segment["results"] += 1
+    segment["last_seen"] = max(segment["last_seen"], record.get("timestamp", ""))
+    if result.get("status") == "degraded":
+        # Catégorie seule (échéance ou budget dépassé) : ni verdict ni erreur
+        segment["degraded"] = segment.get("degraded", 0) + 1
+    elif record.get("status") == "error" or result.get("status", "success") != "success":
+        segment["errors"] += 1
+        if RATE_LIMIT_PATTERN.search(str(record.get("error_message", ""))):
+            segment["rate_limited"] += 1
+    else:
+        verdicts = segment["categories"].setdefault(result.get("category") or "Non déterminée", {})
+        verdict = extract_verdict(str(result.get("analyse", "")))
+        verdicts[verdict] = verdicts.get(verdict, 0) + 1
+    elapsed = record.get("elapsed_s")
+    if isinstance(elapsed, (int, float)):
+        segment["latency"][latency_bucket(elapsed)] += 1
+        segment["latency_samples"] += 1
+
+class ResultAggregator:
+    """
+    Statistiques cumulées sur les résultats, persistées dans un fichier JSON
+
+    L'état a une taille bornée (catégories × verdicts, histogramme fixe, un segment par
+    changement de modèle ou de prompts) : ajouter un résultat ne dépend pas du nombre de
+    résultats déjà intégrés.
+    """
+
+    def __init__(self, path: Path = DEFAULT_STATS_PATH):
+        """
+        Charge l'agrégat (vide s'il n'existe pas encore)
+
+        Args:
+            path: Fichier JSON de l'agrégat
+        """
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        if self.path.exists():
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.state = json.load(f)
+        else:
+            self.state = self._empty_state()
+
+    @staticmethod
+    def _empty_state() -> Dict[str, Any]:
+        return {"files": {}, "totals": _new_segment(None, None, ""), "segments": []}
+
+    def add(self, record: Dict[str, Any]) -> None:
+        """
+        Intègre un résultat (format de `AffirmationProcessor.process_affirmation`)
+
+        Un résultat d'un autre modèle ou d'autres prompts que le segment courant ouvre un
+        nouveau segment. Les erreurs (sans modèle) et les résultats dégradés (modèle
+        économique ou aucun, voir `degradation`) sont comptés dans le segment courant.
+
+        Args:
+            record: Résultat, éventuellement enveloppé sous la clé "result"
+        """
+        result = record.get("result", record)
+        degraded = result.get("degradation") not in (None, "full")
+        model = None if degraded else result.get("model") or None
+        prompts = result.get("prompts")
+        timestamp = record.get("timestamp", "")
+        with self._lock:
+            segments = self.state["segments"]
+            current = segments[-1] if segments else None
+            if current is not None and current["model"] is None and model is not None:
+                current["model"], current["prompts"] = model, prompts
+            elif current is None or (model is not None and (model, prompts) != (current["model"], current["prompts"])):
+                current = _new_segment(model, prompts, timestamp)
+                segments.append(current)
+            _add_to(current, record)
+            _add_to(self.state["totals"], record)
+
+    def ingest_file(self, path: Path) -> int:
+        """
+        Intègre un fichier de résultats, une seule fois
+
+        Args:
+            path: Fichier JSON (liste de résultats)
+
+        Returns:
+            int: Nombre de résultats intégrés (0 si le fichier l'était déjà)
+        """
+        path = Path(path)
+        if path.name in self.state["files"]:
+            return 0
+        with open(path, 'r', encoding='utf-8') as f:
+            records = json.load(f)
+        for record in records:
+            if isinstance(record, dict):
+                self.add(record)
+        with self._lock:
+            self.state["files"][path.name] = len(records)
+        return len(records)
+
+    def update(self, result_dir: Path = DEFAULT_RESULT_DIR) -> int:
+        """
+        Intègre les fichiers de résultats pas encore vus, du plus ancien au plus récent
+
+        Args:
+            result_dir: Dossier des résultats
+
+        Returns:
+            int: Nombre de résultats intégrés
+        """
+        files = sorted(Path(result_dir).glob(RESULT_FILE_PATTERN), key=lambda p: p.stat().st_mtime)
+        added = 0
+        for path in files:
+            try:
+                added += self.ingest_file(path)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Fichier de résultats ignoré {path.name}: {str(e)}")
+        return added
+
+    def reset(self) -> None:
+        """Vide l'agrégat (avant de tout réintégrer)."""
+        with self._lock:
+            self.state = self._empty_state()
+
+    def save(self) -> None:
+        """Écrit l'agrégat sur disque (écriture atomique)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            snapshot = json.loads(json.dumps(self.state))
+        write_json_atomic(self.path, snapshot)
+
+# =============================================
+# RAPPORT
+# =============================================
+
+def percentiles(histogram: List[int], samples: int) -> Dict[int, Optional[float]]:
+    """
+    Percentiles de latence lus dans l'histogramme (borne supérieure du palier atteint)
+
+    Returns:
+        Dict[int, Optional[float]]: {percentile: secondes}, None sans mesure
+    """
+    values: Dict[int, Optional[float]] = {p: None for p in PERCENTILES}
+    if not samples:
+        return values
+    cumulative, pending = 0, list(PERCENTILES)
+    for index, count in enumerate(histogram):
+        cumulative += count
+        while pending and cumulative >= samples * pending[0] / 100:
+            values[pending.pop(0)] = round(bucket_upper_bound(index), 2)
+        if not pending:
+            break
+    return values
+
+def summarize_segment(segment: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Indicateurs d'un segment (ou des totaux)
+
+    Returns:
+        Dict[str, Any]: {"results", "error_rate", "rate_limited_rate", "degraded_rate", "category_share", "verdicts", "latency"}
+    """
+    results = segment["results"]
+    successes = sum(sum(v.values()) for v in segment["categories"].values())
+    return {
+        "results": results,
+        "error_rate": segment["errors"] / results if results else 0.0,
+        "rate_limited_rate": segment["rate_limited"] / results if results else 0.0,
+        "degraded_rate": segment.get("degraded", 0) / results if results else 0.0,
+        "category_share": {c: sum(v.values()) / successes for c, v in segment["categories"].items()} if successes else {},
+        "verdicts": segment["categories"],
+        "latency": percentiles(segment["latency"], segment["latency_samples"]),
+    }
+
+def detect_shifts(segments: List[Dict[str, Any]]) -> List[str]:
+    """
+    Compare chaque segment au précédent : déplacements de catégories et ralentissements
+
+    Seuils : `Config.STATS_SHIFT_THRESHOLD` (écart de part d'une catégorie) et
+    `Config.STATS_SLOWDOWN_RATIO` (rapport des latences p50 ou p95).
+
+    Returns:
+        List[str]: Alertes lisibles, de la plus ancienne à la plus récente
+    """
+    alerts = []
+    for previous, current in zip(segments, segments[1:]):
+        before, after = summarize_segment(previous), summarize_segment(current)
+        label = f"{previous['model']}/{previous['prompts']} → {current['model']}/{current['prompts']} ({current['first_seen'][:16]})"
+        for category in sorted(set(before["category_share"]) | set(after["category_share"])):
+            delta = after["category_share"].get(category, 0.0) - before["category_share"].get(category, 0.0)
+            if abs(delta) >= Config.STATS_SHIFT_THRESHOLD:
+                alerts.append(f"{label} : {category} {delta:+.0%} des résultats")
+        for p in (50, 95):
+            old, new = before["latency"][p], after["latency"][p]
+            if old and new and new / old >= Config.STATS_SLOWDOWN_RATIO:
+                alerts.append(f"{label} : latence p{p} {old}s → {new}s")
+    return alerts
+
+def _format_latency(latency: Dict[int, Optional[float]]) -> str:
+    if latency[50] is None:
+        return "latence non mesurée"
+    return " ".join(f"p{p} {latency[p]}s" for p in PERCENTILES)
+
+def format_report(state: Dict[str, Any]) -> str:
+    """Rapport texte (terminal) de l'agrégat."""
+    totals = summarize_segment(state["totals"])
+    if not totals["results"]:
+        return "Aucun résultat intégré"
+    lines = [
+        f"{totals['results']} résultats ({len(state['files'])} fichiers) : "
+        f"{totals['error_rate']:.1%} d'erreurs dont {totals['rate_limited_rate']:.1%} de 429, "
+        f"{totals['degraded_rate']:.1%} sans verdict (catégorie seule), {_format_latency(totals['latency'])}",
+        "",
+        f"{'catégorie':<20} {'part':>6}  verdicts",
+    ]
+    for category, verdicts in sorted(totals["verdicts"].items(), key=lambda item: -sum(item[1].values())):
+        distribution = ", ".join(f"{v} {n}" for v, n in sorted(verdicts.items(), key=lambda item: -item[1]))
+        lines.append(f"{category[:20]:<20} {totals['category_share'][category]:>6.1%}  {distribution}")
+    lines += ["", "SEGMENTS (modèle / prompts) :"]
+    for segment in state["segments"]:
+        summary = summarize_segment(segment)
+        lines.append(f"  {segment['first_seen'][:16]:<16}  {segment['model']}/{segment['prompts']}  "
+                     f"{summary['results']} résultats, {summary['error_rate']:.1%} d'erreurs, {_format_latency(summary['latency'])}")
+    alerts = detect_shifts(state["segments"])
+    lines += ["", "ALERTES :" if alerts else "Aucun déplacement de catégorie ni ralentissement entre segments"]
+    lines += [f"  {alert}" for alert in alerts]
+    return "\n".join(lines)
+
+def format_html_report(state: Dict[str, Any]) -> str:
+    """Rapport HTML statique (un seul fichier, sans dépendance) de l'agrégat."""
+    esc = html.escape
+    totals = summarize_segment(state["totals"])
+    verdict_names = sorted({v for verdicts in totals["verdicts"].values() for v in verdicts})
+    rows = "".join(
+        f"<tr><td>{esc(category)}</td><td>{totals['category_share'][category]:.1%}</td>"
+        + "".join(f"<td>{verdicts.get(v, 0)}</td>" for v in verdict_names) + "</tr>"
+        for category, verdicts in sorted(totals["verdicts"].items(), key=lambda item: -sum(item[1].values()))
+    )
+    segment_rows = ""
+    for segment in state["segments"]:
+        summary = summarize_segment(segment)
+        segment_rows += (
+            f"<tr><td>{esc(segment['first_seen'][:16])}</td><td>{esc(str(segment['model']))}</td>"
+            f"<td>{esc(str(segment['prompts']))}</td><td>{summary['results']}</td><td>{summary['error_rate']:.1%}</td>"
+            f"<td>{summary['rate_limited_rate']:.1%}</td><td>{esc(_format_latency(summary['latency']))}</td></tr>"
+        )
+    alerts = "".join(f"<li>{esc(alert)}</li>" for alert in detect_shifts(state["segments"])) or "<li>Aucune</li>"
+    return f"""<!DOCTYPE html>
+<html lang="fr"><head><meta charset="utf-8"><title>Statistiques des résultats</title>
+<style>body{{font-family:sans-serif;margin:2em}}table{{border-collapse:collapse;margin-bottom:2em}}
+td,th{{border:1px solid #ccc;padding:4px 8px;text-align:right}}td:first-child{{text-align:left}}</style></head>
+<body><h1>Statistiques des résultats</h1>
+<p>Généré le {datetime.now():%Y-%m-%d %H:%M} — {totals['results']} résultats ({len(state['files'])} fichiers),
+{totals['error_rate']:.1%} d'erreurs dont {totals['rate_limited_rate']:.1%} de 429,
+{totals['degraded_rate']:.1%} sans verdict (catégorie seule), {esc(_format_latency(totals['latency']))}.</p>
+<h2>Verdicts par catégorie</h2>
+<table><tr><th>Catégorie</th><th>Part</th>{"".join(f"<th>{esc(v)}</th>" for v in verdict_names)}</tr>{rows}</table>
+<h2>Segments (modèle / prompts)</h2>
+<table><tr><th>Début</th><th>Modèle</th><th>Prompts</th><th>Résultats</th><th>Erreurs</th><th>429</th><th>Latence</th></tr>{segment_rows}</table>
+<h2>Alertes</h2><ul>{alerts}</ul>
+</body></html>
+"""
+
+# =============================================
+# INSTANCE PARTAGÉE
+# =============================================
+_aggregator: Optional[ResultAggregator] = None
+_aggregator_lock = threading.Lock()
+
+def record_result_file(path: Path) -> None:
+    """
+    Intègre un fichier de résultats qui vient d'être écrit, puis sauvegarde l'agrégat
+
+    Appelé depuis le thread d'écriture (voir `save_results_to_file`) : ne bloque pas la boucle
+    d'événements. Sans effet si `Config.RESULT_STATS` est désactivé.
+
+    Args:
+        path: Fichier de résultats écrit
+    """
+    global _aggregator
+    if not Config.RESULT_STATS:
+        return
+    try:
+        with _aggregator_lock:
+            if _aggregator is None:
+                _aggregator = ResultAggregator()
+            if _aggregator.ingest_file(path):
+                _aggregator.save()
+    except Exception as e:
+        logger.error(f"Statistiques non mises à jour pour {path}: {str(e)}")
+
+# --- Exemple d'utilisation du module ---
+if __name__ == '__main__':
+    cli = argparse.ArgumentParser(description="Statistiques cumulées sur les résultats enregistrés")
+    cli.add_argument("--stats", type=Path, default=DEFAULT_STATS_PATH, help="Fichier JSON de l'agrégat")
+    cli.add_argument("--results", type=Path, default=DEFAULT_RESULT_DIR, help="Dossier des résultats")
+    commands = cli.add_subparsers(dest="command", required=True)
+    commands.add_parser("update", help="Intègre les fichiers de résultats pas encore vus")
+    commands.add_parser("rebuild", help="Recalcule l'agrégat à partir de tous les fichiers")
+    report_cmd = commands.add_parser("report", help="Rapport (terminal, ou HTML statique)")
+    report_cmd.add_argument("--html", type=Path, default=None, help="Écrit aussi le rapport HTML dans ce fichier")
+    args = cli.parse_args()
+
+    aggregator = ResultAggregator(args.stats)
+    if args.command == "rebuild":
+        aggregator.reset()
+    added = aggregator.update(args.results)
+    aggregator.save()
+    if args.command in ("update", "rebuild"):
+        print(f"{added} résultats intégrés ({len(aggregator.state['files'])} fichiers au total) -> {args.stats}")
+    else:
+        print(format_report(aggregator.state))
+        if args.html:
+            args.html.parent.mkdir(parents=True, exist_ok=True)
+            args.html.write_text(format_html_report(aggregator.state), encoding='utf-8')
+            print(f"\nRapport HTML : {args.html}")
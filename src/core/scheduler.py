@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module d'ordonnancement des appels API par priorité.
+
+Le sémaphore de `CritiqueAnalyzer` servait les appels dans l'ordre d'arrivée : un gros
+fichier en cours de traitement faisait attendre les verdicts d'un débat en direct.
+`PriorityScheduler` le remplace (même capacité : `Config.API_CONCURRENCY`) :
+- deux niveaux : "live" (direct, interactif, requêtes unitaires du service) avant "backlog"
+  (lots, fichiers, file de travaux) ;
+- part minimale garantie au backlog (`SCHEDULER_MIN_BACKLOG_SHARE` des derniers appels
+  accordés) quand les deux niveaux attendent : le backlog ne s'arrête jamais complètement ;
+- à l'intérieur d'un niveau, l'échéance la plus proche passe en premier (EDF) ;
+- temps d'attente mesuré par niveau (`wait_stats`).
+
+La priorité et l'échéance sont portées par le contexte asyncio (`scheduling`) : elles suivent
+l'affirmation dans tous ses appels (classification, Phase 2, spéculation) sans paramètre à passer.
+"""
+
+import time
+import heapq
+import asyncio
+import itertools
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, List, Optional, Tuple
+
+from .utils import Config
+
+# =============================================
+# NIVEAUX DE PRIORITÉ
+# =============================================
+PRIORITY_LIVE = 0
+PRIORITY_BACKLOG = 1
+PRIORITY_NAMES = {PRIORITY_LIVE: "live", PRIORITY_BACKLOG: "backlog"}
+
+# Échéance par défaut (secondes après la demande) de chaque niveau
+DEFAULT_DEADLINES = {
+    PRIORITY_LIVE: Config.SCHEDULER_DEADLINE_LIVE_S,
+    PRIORITY_BACKLOG: Config.SCHEDULER_DEADLINE_BACKLOG_S,
+}
+
+# (priorité, échéance absolue en secondes depuis l'epoch ou None) du travail en cours
+_current: ContextVar[Tuple[int, Optional[float]]] = ContextVar("scheduling", default=(PRIORITY_BACKLOG, None))
+
+@contextmanager
+def scheduling(priority: int, deadline: Optional[float] = None) -> Iterator[None]:
+    """
+    Fixe la priorité (et l'échéance) des appels API lancés dans ce bloc, tâches filles comprises
+
+    Args:
+        priority: PRIORITY_LIVE ou PRIORITY_BACKLOG
+        deadline: Échéance absolue (`time.time()`), par défaut celle du niveau à partir de maintenant
+    """
+    token = _current.set((priority, deadline))
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+# =============================================
+# ORDONNANCEUR
+# =============================================
+
+class PriorityScheduler:
+    """
+    Remplaçant du sémaphore d'appels API, avec priorités, part garantie et EDF
+    """
+
+    def __init__(
+        self,
+        capacity: int = Config.API_CONCURRENCY,
+        min_backlog_share: float = Config.SCHEDULER_MIN_BACKLOG_SHARE,
+        window: int = 20
+    ):
+        """
+        Initialise l'ordonnanceur
+
+        Args:
+            capacity: Appels simultanés autorisés
+            min_backlog_share: Part minimale des appels accordés au backlog quand les deux niveaux attendent
+            window: Nombre de derniers appels accordés pris en compte pour cette part
+        """
+        self.capacity = capacity
+        self.min_backlog_share = min_backlog_share
+        self._in_use = 0
+        self._queues: Dict[int, List[Tuple[float, int, asyncio.Future, float]]] = {level: [] for level in PRIORITY_NAMES}
+        self._sequence = itertools.count()
+        self._recent: Deque[int] = deque(maxlen=window)
+        self._waits: Dict[int, Deque[float]] = {level: deque(maxlen=1000) for level in PRIORITY_NAMES}
+        self._totals: Dict[int, Dict[str, float]] = {level: {"count": 0, "total_s": 0.0, "max_s": 0.0} for level in PRIORITY_NAMES}
+
+    @asynccontextmanager
+    async def slot(self, priority: Optional[int] = None, deadline: Optional[float] = None) -> AsyncIterator[None]:
+        """
+        Attend une place pour un appel API (à utiliser comme `async with scheduler.slot():`)
+
+        Args:
+            priority: Niveau (par défaut : celui du contexte, voir `scheduling`)
+            deadline: Échéance absolue (par défaut : celle du contexte, sinon celle du niveau)
+        """
+        await self.acquire(priority, deadline)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, priority: Optional[int] = None, deadline: Optional[float] = None) -> None:
+        """
+        Réserve une place (voir `slot`)
+        """
+        context_priority, context_deadline = _current.get()
+        priority = context_priority if priority is None else priority
+        now = time.time()
+        deadline = deadline or context_deadline or now + DEFAULT_DEADLINES[priority]
+
+        if self._in_use < self.capacity and not self._waiting():
+            self._grant(priority, 0.0)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queues[priority], (deadline, next(self._sequence), future, time.perf_counter()))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # La place venait d'être accordée : on la rend
+                self.release()
+            else:
+                future.cancel()  # Retirée de la file au prochain passage de `_dispatch`
+            raise
+
+    def release(self) -> None:
+        """
+        Libère une place et la donne au prochain appel choisi
+        """
+        self._in_use -= 1
+        self._dispatch()
+
+    def _waiting(self) -> bool:
+        return any(not entry[2].done() for queue in self._queues.values() for entry in queue)
+
+    def _next_level(self) -> Optional[int]:
+        """Niveau servi : live d'abord, sauf si la part récente du backlog est sous son minimum."""
+        for queue in self._queues.values():
+            while queue and queue[0][2].done():
+                heapq.heappop(queue)  # Attentes annulées
+        live, backlog = self._queues[PRIORITY_LIVE], self._queues[PRIORITY_BACKLOG]
+        if live and backlog:
+            share = self._recent.count(PRIORITY_BACKLOG) / len(self._recent) if self._recent else 0.0
+            return PRIORITY_BACKLOG if share < self.min_backlog_share else PRIORITY_LIVE
+        if live:
+            return PRIORITY_LIVE
+        if backlog:
+            return PRIORITY_BACKLOG
+        return None
+
+    def _dispatch(self) -> None:
+        while self._in_use < self.capacity:
+            level = self._next_level()
+            if level is None:
+                return
+            _, _, future, enqueued_at = heapq.heappop(self._queues[level])
+            future.set_result(None)
+            self._grant(level, time.perf_counter() - enqueued_at)
+
+    def _grant(self, level: int, wait_s: float) -> None:
+        self._in_use += 1
+        self._recent.append(level)
+        self._waits[level].append(wait_s)
+        totals = self._totals[level]
+        totals["count"] += 1
+        totals["total_s"] += wait_s
+        totals["max_s"] = max(totals["max_s"], wait_s)
+
+    def wait_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Temps d'attente d'une place, par niveau
+
+        Returns:
+            Dict[str, Dict[str, Any]]: {"live"/"backlog": {"count", "mean_s", "p95_s", "max_s", "waiting"}}
+        """
+        stats = {}
+        for level, name in PRIORITY_NAMES.items():
+            totals = self._totals[level]
+            recent = sorted(self._waits[level])
+            stats[name] = {
+                "count": int(totals["count"]),
+                "mean_s": round(totals["total_s"] / totals["count"], 3) if totals["count"] else 0.0,
+                # Centile calculé sur les 1000 dernières attentes
+                "p95_s": round(recent[min(len(recent) - 1, int(len(recent) * 0.95))], 3) if recent else 0.0,
+                "max_s": round(totals["max_s"], 3),
+                "waiting": sum(1 for entry in self._queues[level] if not entry[2].done()),
+            }
+        return stats
+
+def format_wait_stats(stats: Dict[str, Dict[str, Any]]) -> str:
+    """Temps d'attente par niveau sur une ligne."""
+    return ", ".join(
+        f"{name} {s['count']} appels (attente moyenne {s['mean_s']}s, p95 {s['p95_s']}s, max {s['max_s']}s)"
+        for name, s in stats.items()
+    )
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module de cache persistant des recherches de preuves (Module 4).
+
+Chaque requête Google est mise en cache sur disque (SQLite, bibliothèque standard),
+indexée par la requête normalisée et la langue :
+- résultat positif (au moins une URL) : conservé `SEARCH_CACHE_TTL_POSITIVE` secondes ;
+- résultat négatif (recherche réussie mais vide) : conservé `SEARCH_CACHE_TTL_NEGATIVE`
+  secondes, plus court, pour retenter plus tôt ;
+- les erreurs (blocage, réseau) ne sont jamais mises en cache.
+
+Rafraîchissement conditionnel : une entrée expirée n'est relancée que lorsqu'on la
+demande ; si la nouvelle recherche échoue, l'ancienne entrée est servie (périmée plutôt
+que rien). Les affirmations quasi identiques sont regroupées (`ClaimClusters`) et
+partagent la même requête, donc les mêmes preuves.
+"""
+
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import unicodedata
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+
+from .utils import Config
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = Path(__file__).resolve().parents[2] / "data" / "cache" / "search_cache.sqlite3"
+
+# =============================================
+# NORMALISATION DES REQUÊTES ET DES AFFIRMATIONS
+# =============================================
+# Mots vides français ignorés pour le regroupement des affirmations
+STOPWORDS = {
+    "le", "la", "les", "un", "une", "des", "du", "de", "d", "l", "et", "ou", "en", "au", "aux",
+    "a", "à", "est", "sont", "que", "qui", "ce", "cet", "cette", "ces", "il", "elle", "ils", "elles",
+    "on", "se", "sa", "son", "ses", "pour", "par", "sur", "dans", "avec", "y",
+}
+# Mots de négation (sans accents, comme les signatures) : ils inversent le sens d'une affirmation,
+# deux affirmations qui n'ont pas les mêmes ne sont jamais regroupées
+NEGATION_WORDS = frozenset({"ne", "n", "pas", "plus", "jamais", "aucun", "aucune", "rien", "ni", "non", "sans"})
+TOKEN_PATTERN = re.compile(r"[\w%]+")
+# "10 %" et "10%" doivent donner le même mot
+PERCENT_PATTERN = re.compile(r"(\d)\s+%")
+
+def normalize_query(query: str) -> str:
+    """
+    Normalise une requête pour la clé du cache (Unicode NFC, casse, blancs).
+
+    Args:
+        query: Requête telle qu'envoyée au moteur de recherche
+
+    Returns:
+        str: Requête normalisée
+    """
+    return " ".join(unicodedata.normalize("NFC", query).casefold().split())
+
+def cache_key(query: str, lang: str) -> str:
+    """Clé du cache : empreinte de la requête normalisée et de la langue."""
+    return hashlib.sha1(f"{lang}\x00{normalize_query(query)}".encode("utf-8")).hexdigest()
+
+def claim_signature(claim: str) -> FrozenSet[str]:
+    """
+    Signature d'une affirmation : ensemble de ses mots significatifs (casse, accents,
+    ponctuation et mots vides ignorés ; les nombres sont gardés).
+
+    Args:
+        claim: Texte de l'affirmation
+
+    Returns:
+        FrozenSet[str]: Mots significatifs
+    """
+    text = unicodedata.normalize("NFKD", PERCENT_PATTERN.sub(r"\1%", claim.casefold()))
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return frozenset(token for token in TOKEN_PATTERN.findall(text) if token not in STOPWORDS)
+
+class ClaimClusters:
+    """
+    Regroupe les affirmations quasi identiques (similarité de Jaccard de leurs signatures)
+
+    Chaque groupe a un texte canonique (la première affirmation rencontrée) : c'est lui qui
+    sert à construire les requêtes, de sorte que tout le groupe partage les mêmes entrées du cache.
+    Avec un `SearchCache`, les groupes sont conservés d'une exécution à l'autre.
+    """
+
+    def __init__(self, threshold: float = Config.SEARCH_CLUSTER_SIMILARITY, cache: Optional["SearchCache"] = None):
+        """
+        Initialise le regroupement
+
+        Args:
+            threshold: Similarité minimale (0 à 1) pour rejoindre un groupe existant
+            cache: Cache où lire et enregistrer les groupes (optionnel)
+        """
+        self.threshold = threshold
+        self.cache = cache
+        self._clusters: List[Tuple[FrozenSet[str], str]] = cache.load_clusters() if cache else []
+        self._exact: Dict[FrozenSet[str], str] = {signature: text for signature, text in self._clusters}
+
+    def canonical(self, claim: str) -> str:
+        """
+        Renvoie le texte canonique du groupe de l'affirmation (le crée au besoin)
+
+        Args:
+            claim: Texte de l'affirmation
+
+        Returns:
+            str: Texte canonique du groupe
+        """
+        signature = claim_signature(claim)
+        if signature in self._exact:
+            return self._exact[signature]
+        key_tokens = self._key_tokens(signature)
+        for members, text in self._clusters:
+            # Chiffres ou négation différents ("baissé depuis 2012", "n'a pas baissé") : autre affirmation
+            if self._key_tokens(members) != key_tokens:
+                continue
+            union = len(signature | members)
+            if union and len(signature & members) / union >= self.threshold:
+                self._exact[signature] = text
+                return text
+        self._clusters.append((signature, claim))
+        self._exact[signature] = claim
+        if self.cache:
+            self.cache.save_cluster(signature, claim)
+        return claim
+
+    @staticmethod
+    def _key_tokens(signature: FrozenSet[str]) -> FrozenSet[str]:
+        """Mots qui doivent être identiques pour regrouper deux affirmations : nombres et négations."""
+        return frozenset(t for t in signature if t in NEGATION_WORDS or any(c.isdigit() for c in t))
+
+# =============================================
+# CACHE PERSISTANT
+# =============================================
+
+class SearchCache:
+    """
+    Cache SQLite des résultats de recherche, avec durées de vie positive et négative distinctes
+    """
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_CACHE_PATH,
+        ttl_positive: float = Config.SEARCH_CACHE_TTL_POSITIVE,
+        ttl_negative: float = Config.SEARCH_CACHE_TTL_NEGATIVE
+    ):
+        """
+        Ouvre (ou crée) le cache
+
+        Args:
+            path: Fichier SQLite du cache
+            ttl_positive: Durée de vie d'un résultat non vide (secondes)
+            ttl_negative: Durée de vie d'un résultat vide (secondes)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_positive = ttl_positive
+        self.ttl_negative = ttl_negative
+        self.stats = {"hits": 0, "negative_hits": 0, "misses": 0, "refreshed": 0, "stale_served": 0}
+        # Utilisable depuis un thread de travail (service HTTP), à condition qu'un seul thread l'utilise à la fois
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS searches ("
+            " key TEXT PRIMARY KEY, query TEXT, lang TEXT, results TEXT,"
+            " fetched_at REAL, expires_at REAL)"
+        )
+        self._db.execute("CREATE TABLE IF NOT EXISTS clusters (signature TEXT PRIMARY KEY, canonical TEXT)")
+        self._db.commit()
+
+    def get(self, query: str, lang: str) -> Optional[Dict[str, Any]]:
+        """
+        Lit une entrée, même expirée
+
+        Args:
+            query: Requête
+            lang: Langue de la recherche
+
+        Returns:
+            Optional[Dict[str, Any]]: {"results", "fetched_at", "expires_at", "fresh"} ou None si absente
+        """
+        row = self._db.execute(
+            "SELECT results, fetched_at, expires_at FROM searches WHERE key = ?", (cache_key(query, lang),)
+        ).fetchone()
+        if row is None:
+            return None
+        return {"results": json.loads(row[0]), "fetched_at": row[1], "expires_at": row[2], "fresh": row[2] > time.time()}
+
+    def put(self, query: str, lang: str, results: List[str]) -> None:
+        """
+        Enregistre le résultat d'une recherche réussie (durée de vie selon qu'il est vide ou non)
+
+        Args:
+            query: Requête
+            lang: Langue de la recherche
+            results: URLs trouvées (liste vide = résultat négatif)
+        """
+        now = time.time()
+        ttl = self.ttl_positive if results else self.ttl_negative
+        self._db.execute(
+            "INSERT OR REPLACE INTO searches (key, query, lang, results, fetched_at, expires_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (cache_key(query, lang), normalize_query(query), lang, json.dumps(results), now, now + ttl)
+        )
+        self._db.commit()
+
+    def get_or_fetch(self, query: str, lang: str, fetch: Callable[[], List[str]]) -> List[str]:
+        """
+        Renvoie le résultat en cache s'il est frais, sinon relance la recherche
+
+        Args:
+            query: Requête
+            lang: Langue de la recherche
+            fetch: Fonction qui exécute la recherche (lève une exception en cas d'échec)
+
+        Returns:
+            List[str]: URLs trouvées
+
+        Raises:
+            Exception: L'erreur de `fetch` si la recherche échoue et que rien n'est en cache
+        """
+        entry = self.get(query, lang)
+        if entry is not None and entry["fresh"]:
+            self.stats["hits" if entry["results"] else "negative_hits"] += 1
+            return entry["results"]
+
+        try:
+            results = fetch()
+        except Exception as e:
+            if entry is None:
+                raise
+            # Rafraîchissement impossible (blocage, réseau) : l'entrée périmée vaut mieux que rien
+            logger.warning(f"Recherche impossible, résultat périmé servi pour '{query[:40]}...': {str(e)}")
+            self.stats["stale_served"] += 1
+            return entry["results"]
+
+        self.stats["refreshed" if entry is not None else "misses"] += 1
+        self.put(query, lang, results)
+        return results
+
+    def load_clusters(self) -> List[Tuple[FrozenSet[str], str]]:
+        """Relit les groupes d'affirmations enregistrés (signature, texte canonique)."""
+        rows = self._db.execute("SELECT signature, canonical FROM clusters").fetchall()
+        return [(frozenset(json.loads(signature)), canonical) for signature, canonical in rows]
+
+    def save_cluster(self, signature: FrozenSet[str], canonical: str) -> None:
+        """Enregistre un nouveau groupe d'affirmations."""
+        self._db.execute(
+            "INSERT OR IGNORE INTO clusters (signature, canonical) VALUES (?, ?)",
+            (json.dumps(sorted(signature), ensure_ascii=False), canonical)
+        )
+        self._db.commit()
+
+    def purge_expired(self, grace: float = 0.0) -> int:
+        """
+        Supprime les entrées expirées depuis plus de `grace` secondes
+
+        Args:
+            grace: Délai de conservation après expiration (pour le service des entrées périmées)
+
+        Returns:
+            int: Nombre d'entrées supprimées
+        """
+        cursor = self._db.execute("DELETE FROM searches WHERE expires_at < ?", (time.time() - grace,))
+        self._db.commit()
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """Ferme la base du cache."""
+        self._db.close()
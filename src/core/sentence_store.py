@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module de stockage compact des phrases pour les très gros corpus de transcriptions.
+
+Plutôt que des millions d'objets `str` Python, le magasin garde :
+- text.bin    : tous les textes UTF-8 mis bout à bout, lus par projection mémoire (mmap) ;
+- offsets.npy : tableau NumPy des décalages (n + 1 entiers), la phrase i est text[offsets[i]:offsets[i+1]] ;
+- meta.npy    : colonnes par phrase (fichier source, début, fin, empreinte du contenu) ;
+- sources.json: noms des fichiers sources (référencés par leur indice dans meta.npy).
+
+Une phrase est désignée par son identifiant entier (sa position), ce qui permet aux
+résultats d'analyse de la référencer sans recopier le texte.
+
+Lancer depuis src/ pour construire un magasin à partir des shards de l'ingestion en masse :
+    python -m core.sentence_store ../data/shards ../data/store
+"""
+
+import os
+import json
+import mmap
+import hashlib
+import argparse
+from array import array
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .bulk_ingestion import MANIFEST_NAME, read_shard
+
+# =============================================
+# FORMAT SUR DISQUE
+# =============================================
+TEXT_FILE = "text.bin"
+OFFSETS_FILE = "offsets.npy"
+META_FILE = "meta.npy"
+SOURCES_FILE = "sources.json"
+
+# Colonnes de métadonnées (une ligne par phrase)
+META_DTYPE = np.dtype([
+    ("source", np.int32),     # Indice dans sources.json
+    ("start", np.float64),    # Début dans la vidéo (secondes, NaN si inconnu)
+    ("end", np.float64),      # Fin dans la vidéo (secondes, NaN si inconnue)
+    ("hash", np.uint64),      # Empreinte du texte (BLAKE2b 64 bits), pour la déduplication
+])
+
+def content_hash(data: bytes) -> int:
+    """Empreinte 64 bits (BLAKE2b) d'un texte encodé en UTF-8."""
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+# =============================================
+# ÉCRITURE
+# =============================================
+
+class SentenceStoreWriter:
+    """
+    Écrit un magasin de phrases en flux (ajout seulement)
+
+    Les textes partent directement sur disque ; seules les colonnes numériques sont
+    gardées en mémoire, dans des tableaux compacts `array` (quelques octets par phrase).
+    """
+
+    def __init__(self, path: Path):
+        """
+        Initialise l'écriture d'un nouveau magasin
+
+        Args:
+            path: Dossier du magasin (créé si besoin, écrasé s'il existe)
+        """
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._text_file = open(self.path / TEXT_FILE, 'wb')
+        self._offsets = array('q', [0])
+        self._sources: List[str] = []
+        self._source_ids: Dict[str, int] = {}
+        self._source_col = array('i')
+        self._start_col = array('d')
+        self._end_col = array('d')
+        self._hash_col = array('Q')
+
+    def add(self, text: str, source: str = "", start: Optional[float] = None, end: Optional[float] = None) -> int:
+        """
+        Ajoute une phrase au magasin
+
+        Args:
+            text: Texte de la phrase
+            source: Fichier source de la phrase
+            start: Début dans la vidéo (secondes)
+            end: Fin dans la vidéo (secondes)
+
+        Returns:
+            int: Identifiant de la phrase
+        """
+        data = text.encode("utf-8")
+        self._text_file.write(data)
+        self._offsets.append(self._offsets[-1] + len(data))
+
+        if source not in self._source_ids:
+            self._source_ids[source] = len(self._sources)
+            self._sources.append(source)
+        self._source_col.append(self._source_ids[source])
+        self._start_col.append(float("nan") if start is None else start)
+        self._end_col.append(float("nan") if end is None else end)
+        self._hash_col.append(content_hash(data))
+        return len(self._offsets) - 2
+
+    def close(self) -> None:
+        """
+        Termine l'écriture : enregistre les décalages, les métadonnées et les sources
+        """
+        self._text_file.close()
+        np.save(self.path / OFFSETS_FILE, np.frombuffer(self._offsets, dtype=np.int64))
+
+        meta = np.empty(len(self._source_col), dtype=META_DTYPE)
+        meta["source"] = np.frombuffer(self._source_col, dtype=np.int32)
+        meta["start"] = np.frombuffer(self._start_col, dtype=np.float64)
+        meta["end"] = np.frombuffer(self._end_col, dtype=np.float64)
+        meta["hash"] = np.frombuffer(self._hash_col, dtype=np.uint64)
+        np.save(self.path / META_FILE, meta)
+
+        with open(self.path / SOURCES_FILE, 'w', encoding='utf-8') as f:
+            json.dump(self._sources, f, ensure_ascii=False)
+
+    def __enter__(self) -> "SentenceStoreWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+# =============================================
+# LECTURE
+# =============================================
+
+class SentenceStore:
+    """
+    Magasin de phrases en lecture seule, projeté en mémoire
+
+    Rien n'est chargé à l'ouverture : le système d'exploitation ne lit que les pages
+    réellement consultées. `iter_bytes` parcourt les phrases sans aucune copie.
+    """
+
+    def __init__(self, path: Path):
+        """
+        Ouvre un magasin existant
+
+        Args:
+            path: Dossier du magasin
+        """
+        self.path = Path(path)
+        self.offsets = np.load(self.path / OFFSETS_FILE, mmap_mode='r')
+        self.meta = np.load(self.path / META_FILE, mmap_mode='r')
+        with open(self.path / SOURCES_FILE, 'r', encoding='utf-8') as f:
+            self.sources: List[str] = json.load(f)
+
+        self._text_file = open(self.path / TEXT_FILE, 'rb')
+        # mmap refuse les fichiers vides : un magasin vide n'a simplement pas de texte
+        if os.path.getsize(self.path / TEXT_FILE) > 0:
+            self._mmap: Optional[mmap.mmap] = mmap.mmap(self._text_file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._view = memoryview(self._mmap)
+        else:
+            self._mmap = None
+            self._view = memoryview(b"")
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def get_bytes(self, sentence_id: int) -> memoryview:
+        """
+        Renvoie les octets UTF-8 d'une phrase, sans copie
+
+        Args:
+            sentence_id: Identifiant de la phrase
+
+        Returns:
+            memoryview: Vue sur les octets de la phrase dans le fichier projeté
+        """
+        if not 0 <= sentence_id < len(self):
+            raise IndexError(f"Phrase {sentence_id} hors du magasin ({len(self)} phrases)")
+        return self._view[int(self.offsets[sentence_id]):int(self.offsets[sentence_id + 1])]
+
+    def __getitem__(self, sentence_id: int) -> str:
+        return str(self.get_bytes(sentence_id), "utf-8")
+
+    def get_metadata(self, sentence_id: int) -> Dict[str, Any]:
+        """
+        Renvoie les métadonnées d'une phrase
+
+        Args:
+            sentence_id: Identifiant de la phrase
+
+        Returns:
+            Dict[str, Any]: {"id", "source", "start", "end", "hash"} (None pour les horodatages inconnus)
+        """
+        row = self.meta[sentence_id]
+        start, end = float(row["start"]), float(row["end"])
+        return {
+            "id": sentence_id,
+            "source": self.sources[int(row["source"])],
+            "start": None if np.isnan(start) else start,
+            "end": None if np.isnan(end) else end,
+            "hash": int(row["hash"]),
+        }
+
+    def iter_bytes(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Tuple[int, memoryview]]:
+        """
+        Parcourt les phrases sans copie (les octets ne sont décodés que si l'appelant le demande)
+
+        Args:
+            start: Premier identifiant
+            stop: Identifiant de fin (exclu), par défaut la fin du magasin
+
+        Yields:
+            Tuple[int, memoryview]: (identifiant, octets UTF-8 de la phrase)
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        offsets = self.offsets
+        view = self._view
+        for sentence_id in range(start, stop):
+            yield sentence_id, view[int(offsets[sentence_id]):int(offsets[sentence_id + 1])]
+
+    def iter_texts(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+        """
+        Parcourt les phrases décodées, une à une (mémoire constante)
+
+        Args:
+            start: Premier identifiant
+            stop: Identifiant de fin (exclu)
+
+        Yields:
+            Tuple[int, str]: (identifiant, texte)
+        """
+        for sentence_id, data in self.iter_bytes(start, stop):
+            yield sentence_id, str(data, "utf-8")
+
+    def ids_for_hash(self, text: str) -> np.ndarray:
+        """
+        Retrouve toutes les occurrences d'un texte (même empreinte) dans le magasin
+
+        Args:
+            text: Texte recherché
+
+        Returns:
+            np.ndarray: Identifiants des phrases de même empreinte
+        """
+        return np.flatnonzero(self.meta["hash"] == np.uint64(content_hash(text.encode("utf-8"))))
+
+    def close(self) -> None:
+        """
+        Libère la projection mémoire et le fichier
+        """
+        self._view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+        self._text_file.close()
+
+    def __enter__(self) -> "SentenceStore":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+# =============================================
+# CONSTRUCTION À PARTIR DES SHARDS
+# =============================================
+
+def build_store_from_shards(shard_dir: Path, store_dir: Path) -> int:
+    """
+    Construit un magasin à partir des shards de l'ingestion en masse (voir bulk_ingestion)
+
+    Args:
+        shard_dir: Dossier des shards (contenant manifest.json)
+        store_dir: Dossier du magasin à créer
+
+    Returns:
+        int: Nombre de phrases écrites
+    """
+    shard_dir = Path(shard_dir)
+    with open(shard_dir / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    count = 0
+    with SentenceStoreWriter(store_dir) as writer:
+        for source, entry in sorted(manifest.items()):
+            for sentence in read_shard(shard_dir / entry["shard"]):
+                writer.add(sentence["text"], source=source, start=sentence["start"], end=sentence["end"])
+                count += 1
+    return count
+
+# --- Exemple d'utilisation du module ---
+if __name__ == '__main__':
+    cli = argparse.ArgumentParser(description="Construit un magasin de phrases à partir des shards")
+    cli.add_argument("shard_dir", type=Path, help="Dossier des shards (sortie de core.bulk_ingestion)")
+    cli.add_argument("store_dir", type=Path, help="Dossier du magasin à créer")
+    args = cli.parse_args()
+
+    total = build_store_from_shards(args.shard_dir, args.store_dir)
+    with SentenceStore(args.store_dir) as store:
+        print(f"{total} phrases écrites dans {args.store_dir}")
+        for sentence_id, text in store.iter_texts(0, 3):
+            print(f"  #{sentence_id} {store.get_metadata(sentence_id)['start']}s : {text}")
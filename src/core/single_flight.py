@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module de regroupement des appels identiques simultanés ("single-flight").
+
+Quand plusieurs appelants demandent en même temps le même travail (même clé), un seul
+appel est réellement exécuté : les autres attendent le même résultat (ou la même erreur).
+Une fois l'appel terminé, la clé est libérée : ce n'est pas un cache, une demande
+ultérieure relance le travail.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+class SingleFlight:
+    """
+    Partage un appel en cours entre tous les appelants de même clé
+
+    Le résultat est le même objet pour tous les appelants : ne pas le modifier (en faire une copie).
+    L'annulation d'un appelant (client déconnecté, spéculation abandonnée) n'annule pas l'appel
+    partagé tant que d'autres l'attendent ; quand le dernier appelant est annulé, l'appel l'est aussi.
+    """
+
+    def __init__(self):
+        """
+        Initialise le regroupement (aucun appel en cours)
+        """
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self._waiters: Dict[Hashable, int] = {}
+        # "calls" : appels demandés ; "executions" : appels réellement lancés ;
+        # "suppressed" : appels évités car un appel identique était déjà en cours
+        self.stats = {"calls": 0, "executions": 0, "suppressed": 0}
+
+    async def do(self, key: Hashable, factory: Callable[[], Awaitable[T]]) -> T:
+        """
+        Exécute `factory()` ou rejoint l'appel en cours de même clé
+
+        Args:
+            key: Clé identifiant le travail (deux appels de même clé donnent le même résultat)
+            factory: Fonction sans argument qui renvoie la coroutine à exécuter
+
+        Returns:
+            T: Résultat de l'appel partagé
+
+        Raises:
+            Exception: L'erreur levée par l'appel partagé (transmise à tous les appelants)
+        """
+        self.stats["calls"] += 1
+        task = self._inflight.get(key)
+        if task is not None:
+            self.stats["suppressed"] += 1
+            logger.debug(f"Appel identique en cours, résultat partagé ({key!r:.60})")
+        else:
+            self.stats["executions"] += 1
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            self._waiters[key] = 0
+            task.add_done_callback(lambda done, key=key: self._release(key, done))
+
+        self._waiters[key] += 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            if self._inflight.get(key) is task:
+                self._waiters[key] -= 1
+                if self._waiters[key] == 0 and not task.done():
+                    # Plus personne n'attend le résultat : inutile de payer l'appel jusqu'au bout
+                    task.cancel()
+
+    def _release(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+            del self._waiters[key]
+        if not task.cancelled():
+            task.exception()  # Erreur lue ici même si tous les appelants sont partis
+
+    @property
+    def in_flight(self) -> int:
+        """Nombre d'appels partagés en cours."""
+        return len(self._inflight)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Compteurs du regroupement
+
+        Returns:
+            Dict[str, Any]: {"calls", "executions", "suppressed", "in_flight"}
+        """
+        return {**self.stats, "in_flight": self.in_flight}
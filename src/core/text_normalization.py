@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module de normalisation de texte partagé par l'ingestion et la recherche.
+
+Toutes les expressions régulières sont compilées une seule fois, au chargement du module.
+Le découpage des fichiers VTT/SRT se fait en une seule passe sur les lignes
+(`iter_cue_lines`), utilisée à la fois par le parsing complet (`parse_vtt`) et par
+le parsing incrémental du mode live.
+"""
+
+import re
+from typing import Iterable, Iterator, Optional, Tuple
+
+# =============================================
+# MOTIFS PRÉCOMPILÉS
+# =============================================
+# Balises VTT (<c>, </c>) et horodatages internes (<00:00:00.399>)
+CUE_TAG_PATTERN = re.compile(r'<[^>]+>')
+# Annotations entre crochets ([Musique], [Applaudissements])
+BRACKET_PATTERN = re.compile(r'\[.*?\]')
+# Guillemets retirés des requêtes de recherche
+QUOTES_PATTERN = re.compile(r'[«»“”"]')
+# Caractères spéciaux (tout sauf lettres, chiffres, espaces et ponctuation de base)
+SPECIAL_CHARS_PATTERN = re.compile(r'[^\w\s.,;:!?\'"-]')
+
+# =============================================
+# FONCTIONS DE NORMALISATION
+# =============================================
+
+def normalize_whitespace(text: str) -> str:
+    """Compacte tous les blancs (espaces, tabulations, sauts de ligne) en un seul espace."""
+    return " ".join(text.split())
+
+def strip_cue_tags(text: str) -> str:
+    """Retire les balises VTT ; ne lance la regex que si le texte contient une balise."""
+    return CUE_TAG_PATTERN.sub('', text) if "<" in text else text
+
+def remove_brackets(text: str) -> str:
+    """Retire les annotations entre crochets ; ne lance la regex que si nécessaire."""
+    return BRACKET_PATTERN.sub('', text) if "[" in text else text
+
+def strip_quotes(text: str) -> str:
+    """Retire les guillemets (français et anglais) d'un texte."""
+    return QUOTES_PATTERN.sub('', text).strip()
+
+def clean_text(text: str) -> str:
+    """
+    Nettoie un texte : blancs compactés et caractères spéciaux retirés (ponctuation de base gardée).
+
+    Args:
+        text: Le texte à nettoyer
+
+    Returns:
+        str: Le texte nettoyé
+    """
+    if not text:
+        return ""
+    return SPECIAL_CHARS_PATTERN.sub('', normalize_whitespace(text)).strip()
+
+def parse_timestamp(value: str) -> float:
+    """Convertit un horodatage VTT/SRT ("01:02:03.456" ou "02:03,456") en secondes."""
+    if len(value) == 12 and value[2] == ":" and value[5] == ":":
+        # Format le plus courant HH:MM:SS.mmm : découpage par position, sans split
+        return int(value[0:2]) * 3600 + int(value[3:5]) * 60 + float(value[6:].replace(',', '.'))
+    parts = value.replace(',', '.').split(':')
+    seconds = float(parts[-1])
+    minutes = int(parts[-2]) if len(parts) >= 2 else 0
+    hours = int(parts[-3]) if len(parts) >= 3 else 0
+    return hours * 3600 + minutes * 60 + seconds
+
+def parse_cue_timing(line: str) -> Tuple[float, float]:
+    """
+    Convertit une ligne d'horodatage ("00:00:01.000 --> 00:00:03.500 align:start") en secondes.
+
+    Args:
+        line: Ligne d'horodatage VTT ou SRT
+
+    Returns:
+        Tuple[float, float]: (début, fin)
+
+    Raises:
+        ValueError: Si la ligne n'est pas un horodatage valide
+    """
+    left, _, right = line.partition("-->")
+    right = right.split()
+    if not right:
+        raise ValueError(f"Horodatage invalide: {line!r}")
+    return parse_timestamp(left.strip()), parse_timestamp(right[0])
+
+# =============================================
+# TOKENIZER VTT/SRT EN UNE PASSE
+# =============================================
+
+class CueState:
+    """
+    État du tokenizer entre deux appels (utile pour le parsing incrémental)
+
+    Attributs :
+    - in_cue : True entre une ligne d'horodatage et la ligne vide suivante
+    - start / end : horodatages (secondes) de la cue courante
+    - last_line : dernière ligne ajoutée, pour la déduplication
+    """
+    __slots__ = ("in_cue", "start", "end", "last_line")
+
+    def __init__(self):
+        self.in_cue = False
+        self.start = 0.0
+        self.end = 0.0
+        self.last_line = ""
+
+def iter_cue_lines(
+    lines: Iterable[str],
+    state: Optional[CueState] = None,
+    with_timestamps: bool = True
+) -> Iterator[Tuple[Optional[float], Optional[float], str]]:
+    """
+    Parcourt les lignes d'un fichier VTT/SRT en une seule passe et produit les lignes de dialogue.
+
+    Les lignes doivent déjà être débarrassées des balises VTT (voir `strip_cue_tags`, appliquée
+    une fois sur tout le contenu, ce qui est bien plus rapide que ligne par ligne).
+    Sont ignorés : l'en-tête WEBVTT, les blocs NOTE/STYLE, les numéros de cue SRT, les lignes
+    d'espaces et les lignes identiques à la précédente (sous-titres YouTube "roulants").
+
+    Args:
+        lines: Lignes du fichier (sans balises)
+        state: État à reprendre et à mettre à jour (parsing incrémental) ; nouveau si None
+        with_timestamps: Si False, les horodatages ne sont pas convertis (plus rapide)
+
+    Yields:
+        Tuple[Optional[float], Optional[float], str]: (début, fin, ligne nettoyée)
+    """
+    state = state or CueState()
+    # Variables locales : bien plus rapides que les attributs dans une boucle de milliers de lignes
+    in_cue, start, end, last_line = state.in_cue, state.start, state.end, state.last_line
+    # L'horodatage n'est converti que si la cue produit une ligne (la plupart sont des doublons)
+    timing_line = None
+    try:
+        for line in lines:
+            if not line or line == "\r":
+                # Ligne vide : fin de la cue (ou du bloc d'en-tête)
+                in_cue = False
+                continue
+            if "-->" in line:
+                in_cue = True
+                timing_line = line
+                continue
+            # En dehors d'une cue : en-tête WEBVTT, blocs NOTE/STYLE, numéros de cue SRT
+            if not in_cue:
+                continue
+            line = line.strip()
+            if line and line != last_line:
+                last_line = line
+                if not with_timestamps:
+                    yield None, None, line
+                    continue
+                if timing_line is not None:
+                    try:
+                        start, end = parse_cue_timing(timing_line)
+                    except ValueError:
+                        pass  # Horodatage illisible : on garde celui de la cue précédente
+                    timing_line = None
+                yield start, end, line
+    finally:
+        if timing_line is not None and with_timestamps:
+            try:
+                start, end = parse_cue_timing(timing_line)
+            except ValueError:
+                pass
+        state.in_cue, state.start, state.end, state.last_line = in_cue, start, end, last_line
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module de comptabilité des tokens et des coûts des appels API.
+
+Les résultats gardent le modèle utilisé mais pas la consommation : personne ne savait ce
+qu'avait coûté un passage de `file_mode` sur 1 000 lignes. Chaque appel (`complete_async`,
+streaming) est inscrit ici avec ses tokens de prompt et de réponse (champ `usage` de l'API,
+sinon estimation marquée comme telle) et son coût (`Config.MODEL_PRICES`), puis agrégé :
+- par lot ("run" : un lot, un fichier, une session interactive, un suivi live, un lot de la file) ;
+- par catégorie, par phase ("classify", "phase2", "fused", "stream") et par modèle.
+
+Les inscriptions vont dans un registre SQLite, écrit par un thread dédié (la boucle
+d'événements n'attend jamais le disque). Des alarmes de budget (`USAGE_ALARM_RUN_USD`,
+`USAGE_ALARM_DAY_USD`) sont journalisées dès qu'un lot ou la journée dépasse son seuil.
+
+Rapport, depuis src/ :
+    python -m core.usage_ledger report --by category
+    python -m core.usage_ledger report --run <lot> --by phase
+    python -m core.usage_ledger runs
+"""
+
+import os
+import time
+import queue
+import atexit
+import sqlite3
+import logging
+import argparse
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .utils import Config, format_response
+from .context_window import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_LEDGER_PATH = Path(os.getenv(
+    "USAGE_LEDGER_PATH", str(Path(__file__).resolve().parents[2] / "data" / "ledger" / "usage.sqlite3")
+))
+
+# Axes d'agrégation du rapport
+GROUP_COLUMNS = ("run_id", "category", "phase", "model")
+
+# Lot en cours (porté par le contexte asyncio, comme la priorité de `scheduler`)
+_current_run: ContextVar[str] = ContextVar("usage_run", default="")
+
+# Identifiant par défaut des appels hors lot : la session du processus
+SESSION_RUN_ID = f"session_{datetime.now():%Y%m%d_%H%M%S}"
+
+@contextmanager
+def tracking_run(run_id: str) -> Iterator[None]:
+    """
+    Inscrit les appels API lancés dans ce bloc (tâches filles comprises) au lot `run_id`
+
+    Args:
+        run_id: Identifiant du lot
+    """
+    token = _current_run.set(run_id)
+    try:
+        yield
+    finally:
+        _current_run.reset(token)
+
+def usage_counts(response: Any, messages: List[Dict[str, str]]) -> Tuple[int, int, bool]:
+    """
+    Tokens de prompt et de réponse d'un appel
+
+    Args:
+        response: Réponse de `chat.complete_async` (champ `usage`), ou texte du verdict (streaming)
+        messages: Messages envoyés (pour l'estimation quand l'API ne renvoie pas `usage`)
+
+    Returns:
+        Tuple[int, int, bool]: (tokens du prompt, tokens de la réponse, estimés ?)
+    """
+    usage = getattr(response, "usage", None)
+    prompt_tokens = getattr(usage, "prompt_tokens", None)
+    completion_tokens = getattr(usage, "completion_tokens", None)
+    if isinstance(prompt_tokens, int) and isinstance(completion_tokens, int):
+        return prompt_tokens, completion_tokens, False
+    prompt = "".join(message["content"] for message in messages)
+    return estimate_tokens(prompt), estimate_tokens(format_response(response)), True
+
+def call_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """
+    Coût d'un appel en dollars (0 pour un modèle absent de `Config.MODEL_PRICES`)
+
+    Args:
+        model: Modèle appelé
+        prompt_tokens: Tokens du prompt
+        completion_tokens: Tokens de la réponse
+
+    Returns:
+        float: Coût en USD
+    """
+    input_price, output_price = Config.MODEL_PRICES.get(model, (0.0, 0.0))
+    return (prompt_tokens * input_price + completion_tokens * output_price) / 1_000_000
+
+# =============================================
+# REGISTRE
+# =============================================
+
+class UsageLedger:
+    """
+    Registre SQLite des appels API, alimenté sans bloquer par `record`
+
+    Les totaux par lot et du jour sont tenus en mémoire pour les alarmes ; le rapport
+    complet est calculé par SQLite (`report`).
+    """
+
+    def __init__(
+        self,
+        path: Path = DEFAULT_LEDGER_PATH,
+        alarm_run_usd: float = Config.USAGE_ALARM_RUN_USD,
+        alarm_day_usd: float = Config.USAGE_ALARM_DAY_USD
+    ):
+        """
+        Ouvre (ou crée) le registre
+
+        Args:
+            path: Fichier SQLite du registre
+            alarm_run_usd: Seuil d'alarme du coût d'un lot (0 : aucune alarme)
+            alarm_day_usd: Seuil d'alarme du coût de la journée (0 : aucune alarme)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.alarm_run_usd = alarm_run_usd
+        self.alarm_day_usd = alarm_day_usd
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS calls ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT, ts REAL, run_id TEXT, phase TEXT, category TEXT, model TEXT,"
+            " prompt_tokens INTEGER, completion_tokens INTEGER, cost_usd REAL, estimated INTEGER)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS calls_run ON calls (run_id)")
+        self._db.execute("CREATE INDEX IF NOT EXISTS calls_ts ON calls (ts)")
+        self._db.commit()
+        # Coût déjà enregistré aujourd'hui (autres processus compris), pour l'alarme journalière
+        self._day = datetime.now().date()
+        self.day_cost = self._cost_since(self._day_start())
+        # Totaux des lots de ce processus {run_id: {"calls", "tokens", "cost_usd"}}
+        self.run_totals: Dict[str, Dict[str, float]] = {}
+        self._alarmed: set = set()
+        self._queue: "queue.Queue[Optional[Tuple[Any, ...]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _day_start() -> float:
+        return datetime.combine(datetime.now().date(), datetime.min.time()).timestamp()
+
+    def _cost_since(self, since: float) -> float:
+        with self._lock:
+            row = self._db.execute("SELECT COALESCE(SUM(cost_usd), 0) FROM calls WHERE ts >= ?", (since,)).fetchone()
+        return row[0]
+
+    def record(
+        self,
+        phase: str,
+        model: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        estimated: bool = False,
+        category: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Inscrit un appel (retour immédiat, l'écriture se fait dans le thread du registre)
+
+        Args:
+            phase: "classify", "phase2", "fused" ou "stream"
+            model: Modèle appelé
+            prompt_tokens: Tokens du prompt (voir `usage_counts`)
+            completion_tokens: Tokens de la réponse
+            estimated: Tokens estimés (l'API n'a pas renvoyé `usage`)
+            category: Catégorie de l'affirmation, si connue
+
+        Returns:
+            Dict[str, Any]: L'inscription {"run_id", "prompt_tokens", "completion_tokens", "cost_usd", "estimated"}
+        """
+        cost = call_cost(model, prompt_tokens, completion_tokens)
+        run_id = _current_run.get() or SESSION_RUN_ID
+        row = (time.time(), run_id, phase, category or "", model, prompt_tokens, completion_tokens, cost, int(estimated))
+
+        if datetime.now().date() != self._day:
+            self._day, self.day_cost = datetime.now().date(), 0.0
+        self.day_cost += cost
+        totals = self.run_totals.setdefault(run_id, {"calls": 0, "tokens": 0, "cost_usd": 0.0})
+        totals["calls"] += 1
+        totals["tokens"] += prompt_tokens + completion_tokens
+        totals["cost_usd"] += cost
+        self._check_alarms(run_id)
+
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="usage-ledger", daemon=True)
+            self._thread.start()
+        self._queue.put(row)
+        return {"run_id": run_id, "prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                "cost_usd": cost, "estimated": estimated}
+
+    def _check_alarms(self, run_id: str) -> None:
+        """Journalise une alarme (une seule fois par lot et par jour) quand un seuil est franchi."""
+        run_cost = self.run_totals[run_id]["cost_usd"]
+        if self.alarm_run_usd and run_cost >= self.alarm_run_usd and ("run", run_id) not in self._alarmed:
+            self._alarmed.add(("run", run_id))
+            logger.warning(f"ALARME BUDGET : le lot {run_id} a coûté {run_cost:.4f} $ "
+                           f"(seuil {self.alarm_run_usd} $)")
+        if self.alarm_day_usd and self.day_cost >= self.alarm_day_usd and ("day", self._day) not in self._alarmed:
+            self._alarmed.add(("day", self._day))
+            logger.warning(f"ALARME BUDGET : {self.day_cost:.4f} $ dépensés aujourd'hui (seuil {self.alarm_day_usd} $)")
+
+    def _run(self) -> None:
+        while True:
+            # Les inscriptions arrivées entre-temps partent dans la même transaction
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            rows = [row for row in batch if row is not None]
+            try:
+                if rows:
+                    with self._lock:
+                        self._db.executemany(
+                            "INSERT INTO calls (ts, run_id, phase, category, model, prompt_tokens, completion_tokens,"
+                            " cost_usd, estimated) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                            rows
+                        )
+                        self._db.commit()
+            except Exception as e:
+                logger.error(f"Erreur d'écriture du registre de consommation: {str(e)}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if len(rows) < len(batch):
+                return  # Signal d'arrêt (`close`)
+
+    def flush(self) -> None:
+        """
+        Attend que toutes les inscriptions soient écrites (bloquant : depuis une coroutine,
+        utiliser `await asyncio.to_thread(ledger.flush)`).
+        """
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.join()
+
+    def report(self, by: str = "run_id", run_id: Optional[str] = None, since: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        Consommation agrégée
+
+        Args:
+            by: Axe d'agrégation ("run_id", "category", "phase" ou "model")
+            run_id: Limite le rapport à un lot
+            since: Limite le rapport aux appels postérieurs (`time.time()`)
+
+        Returns:
+            List[Dict[str, Any]]: Une ligne par valeur de l'axe {by, "calls", "prompt_tokens",
+            "completion_tokens", "cost_usd", "estimated_calls"}, la plus coûteuse d'abord
+        """
+        if by not in GROUP_COLUMNS:
+            raise ValueError(f"Axe d'agrégation inconnu: {by}")
+        self.flush()
+        where, params = [], []
+        if run_id:
+            where.append("run_id = ?")
+            params.append(run_id)
+        if since:
+            where.append("ts >= ?")
+            params.append(since)
+        sql = (f"SELECT {by}, COUNT(*), SUM(prompt_tokens), SUM(completion_tokens), SUM(cost_usd), SUM(estimated)"
+               f" FROM calls {'WHERE ' + ' AND '.join(where) if where else ''}"
+               f" GROUP BY {by} ORDER BY SUM(cost_usd) DESC, COUNT(*) DESC")
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        return [
+            {by: key or "-", "calls": calls, "prompt_tokens": prompt, "completion_tokens": completion,
+             "cost_usd": round(cost, 6), "estimated_calls": estimated}
+            for key, calls, prompt, completion, cost, estimated in rows
+        ]
+
+    def runs(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Derniers lots inscrits, du plus récent au plus ancien, avec leurs totaux."""
+        self.flush()
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT run_id, MIN(ts), COUNT(*), SUM(prompt_tokens + completion_tokens), SUM(cost_usd)"
+                " FROM calls GROUP BY run_id ORDER BY MAX(ts) DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
+        return [{"run_id": r[0], "started_at": r[1], "calls": r[2], "tokens": r[3], "cost_usd": round(r[4], 6)} for r in rows]
+
+    def close(self) -> None:
+        """Termine les écritures en attente puis ferme le registre."""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        self._thread = None
+        self._db.close()
+
+_ledger: Optional[UsageLedger] = None
+
+def get_usage_ledger() -> Optional[UsageLedger]:
+    """
+    Registre partagé par tout le processus (créé au premier appel, fermé à la sortie)
+
+    Returns:
+        Optional[UsageLedger]: Le registre, ou None si `Config.USAGE_LEDGER` est désactivé
+    """
+    global _ledger
+    if not Config.USAGE_LEDGER:
+        return None
+    if _ledger is None:
+        _ledger = UsageLedger()
+        atexit.register(_ledger.close)
+    return _ledger
+
+def format_run_totals(run_id: str, ledger: Optional[UsageLedger]) -> Optional[str]:
+    """Consommation d'un lot de ce processus sur une ligne (None si rien n'a été inscrit)."""
+    totals = ledger.run_totals.get(run_id) if ledger is not None else None
+    if not totals:
+        return None
+    return f"{int(totals['calls'])} appels, {int(totals['tokens'])} tokens, {totals['cost_usd']:.4f} $ (lot {run_id})"
+
+def format_report(rows: List[Dict[str, Any]], by: str) -> str:
+    """Rapport de consommation sous forme de tableau texte."""
+    if not rows:
+        return "Aucun appel enregistré"
+    lines = [f"{by:<32} {'appels':>7} {'prompt':>10} {'réponse':>10} {'coût ($)':>11}"]
+    for row in rows:
+        estimated = f"  (~{row['estimated_calls']} estimés)" if row["estimated_calls"] else ""
+        lines.append(f"{str(row[by])[:32]:<32} {row['calls']:>7} {row['prompt_tokens']:>10} "
+                     f"{row['completion_tokens']:>10} {row['cost_usd']:>11.6f}{estimated}")
+    total_cost = sum(row["cost_usd"] for row in rows)
+    total_tokens = sum(row["prompt_tokens"] + row["completion_tokens"] for row in rows)
+    lines.append(f"{'TOTAL':<32} {sum(row['calls'] for row in rows):>7} {total_tokens:>21} {total_cost:>11.6f}")
+    return "\n".join(lines)
+
+# --- Exemple d'utilisation du module ---
+if __name__ == '__main__':
+    cli = argparse.ArgumentParser(description="Consommation de tokens et coûts des appels API")
+    cli.add_argument("--ledger", type=Path, default=DEFAULT_LEDGER_PATH, help="Fichier SQLite du registre")
+    commands = cli.add_subparsers(dest="command", required=True)
+    report_cmd = commands.add_parser("report", help="Consommation agrégée")
+    report_cmd.add_argument("--by", choices=GROUP_COLUMNS, default="run_id", help="Axe d'agrégation")
+    report_cmd.add_argument("--run", default=None, help="Limite le rapport à un lot")
+    report_cmd.add_argument("--since", default=None, metavar="AAAA-MM-JJ", help="Appels à partir de cette date")
+    commands.add_parser("runs", help="Derniers lots et leurs totaux")
+    args = cli.parse_args()
+
+    ledger = UsageLedger(args.ledger)
+    if args.command == "report":
+        since = datetime.strptime(args.since, "%Y-%m-%d").timestamp() if args.since else None
+        print(format_report(ledger.report(args.by, run_id=args.run, since=since), args.by))
+    else:
+        for run in ledger.runs():
+            print(f"{run['run_id']:<40} {datetime.fromtimestamp(run['started_at']):%Y-%m-%d %H:%M}  "
+                  f"{run['calls']:>5} appels  {run['tokens']:>9} tokens  {run['cost_usd']:.4f} $")
+    ledger.close()
@@ -8,8 +8,9 @@ utilisées par plusieurs autres modules du projet. Le but est de
 centraliser le code commun et d'éviter les dépendances circulaires.
 """
 
+import os
 import logging
-from typing import Union, Dict, Any
+from typing import Union, Dict, Any, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +29,98 @@ class Config:
     TEMPERATURE = 0.7
     MIN_CLAIM_LENGTH = 10
     MAX_CLAIM_LENGTH = 500
+    # Mode d'analyse : "two_phase" (classification puis analyse) ou "fused" (un seul appel JSON)
+    ANALYSIS_MODE = os.getenv("ANALYSIS_MODE", "two_phase")
+    # Nombre d'appels API simultanés autorisés (1 = séquentiel, protège du rate limiting)
+    API_CONCURRENCY = int(os.getenv("API_CONCURRENCY", "1"))
+    # Exécution spéculative de la Phase 2 (opt-in) ; elle est suspendue tant que la part de devinettes
+    # fausses dépasse SPECULATION_MAX_WASTED_RATIO sur les SPECULATION_WINDOW dernières
+    SPECULATIVE = os.getenv("SPECULATIVE", "0") == "1"
+    SPECULATION_MIN_CONFIDENCE = 0.5
+    SPECULATION_WINDOW = int(os.getenv("SPECULATION_WINDOW", "20"))
+    SPECULATION_MAX_WASTED_RATIO = float(os.getenv("SPECULATION_MAX_WASTED_RATIO", "0.5"))
+    # Contexte glissant des transcriptions live (paramètre `history`)
+    CONTEXT_MAX_SENTENCES = 5
+    CONTEXT_MAX_TOKENS = 300
+    CONTEXT_REFRESH_EVERY = 3
+    # Extraction des affirmations vérifiables : budget par texte et score minimal
+    CLAIM_BUDGET = int(os.getenv("CLAIM_BUDGET", "20"))
+    CLAIM_MIN_SCORE = 1.5
+    # Cache des recherches de preuves : durées de vie (s) des résultats non vides / vides
+    SEARCH_CACHE_TTL_POSITIVE = int(os.getenv("SEARCH_CACHE_TTL_POSITIVE", str(7 * 24 * 3600)))
+    SEARCH_CACHE_TTL_NEGATIVE = int(os.getenv("SEARCH_CACHE_TTL_NEGATIVE", str(24 * 3600)))
+    # Similarité (Jaccard) à partir de laquelle deux affirmations partagent leurs preuves
+    SEARCH_CLUSTER_SIMILARITY = 0.8
+    # Pool de connexions HTTP partagé par tout le processus (voir client_registry)
+    HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+    HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "10"))
+    HTTP_KEEPALIVE_EXPIRY = 60
+    # Appel léger au démarrage pour ouvrir la connexion avant la première affirmation
+    CLIENT_WARMUP = os.getenv("CLIENT_WARMUP", "1") == "1"
+    # Récupération des preuves web : politesse par domaine, limites et budget de la Phase 2
+    EVIDENCE_PER_DOMAIN = 2
+    EVIDENCE_FETCH_TIMEOUT = 8
+    EVIDENCE_MAX_BYTES = 2_000_000
+    EVIDENCE_TOKEN_BUDGET = int(os.getenv("EVIDENCE_TOKEN_BUDGET", "800"))
+    # Piste de verdicts (WebVTT) : durée d'affichage minimale d'un verdict et longueur du résumé
+    VERDICT_MIN_DISPLAY_S = 4.0
+    VERDICT_CUE_MAX_CHARS = 160
+    # Service HTTP (--serve) : adresse d'écoute, taille maximale d'une requête et d'un lot
+    SERVICE_HOST = os.getenv("SERVICE_HOST", "127.0.0.1")
+    SERVICE_PORT = int(os.getenv("SERVICE_PORT", "8765"))
+    SERVICE_MAX_BODY_BYTES = 1_000_000
+    SERVICE_BATCH_MAX = 200
+    SERVICE_KEEPALIVE_TIMEOUT = 30
+    # Ordonnancement des appels API : part minimale du backlog, échéances par défaut (s) du direct et du backlog
+    SCHEDULER_MIN_BACKLOG_SHARE = float(os.getenv("SCHEDULER_MIN_BACKLOG_SHARE", "0.2"))
+    SCHEDULER_DEADLINE_LIVE_S = 10.0
+    SCHEDULER_DEADLINE_BACKLOG_S = 600.0
+    # File de travaux répartie (voir job_queue) : durée d'un bail, tentatives, délai entre tentatives
+    QUEUE_VISIBILITY_TIMEOUT = int(os.getenv("QUEUE_VISIBILITY_TIMEOUT", "300"))
+    QUEUE_MAX_ATTEMPTS = 3
+    QUEUE_RETRY_DELAY = 30
+    QUEUE_WORKER_CONCURRENCY = int(os.getenv("QUEUE_WORKER_CONCURRENCY", os.getenv("API_CONCURRENCY", "1")))
+    # Dégradation progressive (voir degradation) : échéance par affirmation des lots (s, 0 = aucune),
+    # budget de tokens par lot (0 = illimité), modèle économique et seuils de budget restant
+    CLAIM_DEADLINE_S = float(os.getenv("CLAIM_DEADLINE_S", "0"))
+    RUN_TOKEN_BUDGET = int(os.getenv("RUN_TOKEN_BUDGET", "0"))
+    CHEAP_MODEL = os.getenv("CHEAP_MODEL", "ministral-3b-latest")
+    BUDGET_NO_EVIDENCE_BELOW = 0.25
+    BUDGET_CHEAP_MODEL_BELOW = 0.10
+    # Part du temps restant accordée à un niveau avant de passer au suivant
+    DEGRADATION_STEP_SHARE = 0.6
+    # Registre de consommation (voir usage_ledger) : activation et seuils d'alarme en USD (0 = aucune alarme)
+    USAGE_LEDGER = os.getenv("USAGE_LEDGER", "1") == "1"
+    USAGE_ALARM_RUN_USD = float(os.getenv("USAGE_ALARM_RUN_USD", "0"))
+    USAGE_ALARM_DAY_USD = float(os.getenv("USAGE_ALARM_DAY_USD", "0"))
+    # Enregistrement / rejeu des appels externes (voir replay) : cassette, mode ("record" ou "replay"),
+    # facteur appliqué aux latences enregistrées au rejeu (0 = réponses immédiates)
+    LLM_CASSETTE = os.getenv("LLM_CASSETTE", "")
+    LLM_CASSETTE_MODE = os.getenv("LLM_CASSETTE_MODE", "replay")
+    LLM_REPLAY_LATENCY = float(os.getenv("LLM_REPLAY_LATENCY", "0"))
+    # Classification contrainte (sortie JSON limitée aux catégories connues) et seuil de similarité
+    # au-dessus duquel une étiquette approchante est rattachée à une catégorie
+    CLASSIFY_CONSTRAINED = os.getenv("CLASSIFY_CONSTRAINED", "1") == "1"
+    CATEGORY_MATCH_CUTOFF = 0.8
+    # Statistiques cumulées des résultats (voir result_stats) : activation, écart de part d'une catégorie
+    # et rapport de latence entre deux segments (modèle / prompts) à partir desquels une alerte est émise
+    RESULT_STATS = os.getenv("RESULT_STATS", "1") == "1"
+    STATS_SHIFT_THRESHOLD = 0.15
+    STATS_SLOWDOWN_RATIO = 1.5
+    # Historique sur disque (voir history_store) : résultats gardés en mémoire, taille d'une page,
+    # âge maximal (s) d'un verdict repris de l'historique sans nouvel appel (0 = jamais repris)
+    HISTORY_HOT_WINDOW = 100
+    HISTORY_PAGE_SIZE = 20
+    HISTORY_VERDICT_TTL = float(os.getenv("HISTORY_VERDICT_TTL", "0"))
+    # Tarifs en USD par million de tokens (prompt, réponse) ; à tenir à jour avec la grille publique
+    MODEL_PRICES = {
+        "mistral-small-latest": (0.10, 0.30),
+        "mistral-medium-latest": (0.40, 2.00),
+        "mistral-large-latest": (2.00, 6.00),
+        "ministral-3b-latest": (0.04, 0.04),
+        "ministral-8b-latest": (0.10, 0.10),
+        "open-mistral-nemo": (0.15, 0.15),
+    }
 
 class AnalysisError(Exception):
     """
@@ -71,6 +164,20 @@ def format_affirmation(affirmation: Union[str, Dict]) -> str:
         return str(affirmation.get('affirmation', '')).strip()
     return str(affirmation).strip()
 
+def media_timing(affirmation: Union[str, Dict]) -> Dict[str, Optional[float]]:
+    """
+    Extrait la position dans la vidéo d'une affirmation issue d'une transcription.
+
+    Args:
+        affirmation: L'affirmation (un dictionnaire avec "start"/"end" si elle vient d'un VTT/SRT).
+
+    Returns:
+        Dict[str, Optional[float]]: {"start", "end"} en secondes, ou {} si l'affirmation n'est pas horodatée.
+    """
+    if isinstance(affirmation, dict) and affirmation.get('start') is not None:
+        return {"start": affirmation.get('start'), "end": affirmation.get('end')}
+    return {}
+
 def format_response(response: Any) -> str:
     """
     Formate une réponse de l'API pour un affichage propre.
@@ -91,4 +198,29 @@ def format_response(response: Any) -> str:
         if hasattr(response.choices[0], 'message') and hasattr(response.choices[0].message, 'content'):
             return response.choices[0].message.content.strip()
 
-    return str(response).strip()
\ No newline at end of file
+    return str(response).strip()
+
+def format_stream_chunk(chunk: Any) -> str:
+    """
+    Extrait le fragment de texte d'un événement de streaming de l'API.
+
+    Args:
+        chunk: L'événement brut reçu pendant le streaming (ex: `event.data.choices[0].delta`).
+
+    Returns:
+        str: Le texte du fragment (chaîne vide si l'événement n'en contient pas).
+    """
+    # Le SDK Mistral encapsule le fragment dans `event.data`
+    data = getattr(chunk, 'data', chunk)
+    choices = getattr(data, 'choices', None)
+    if not choices:
+        return ""
+
+    delta = getattr(choices[0], 'delta', None)
+    content = getattr(delta, 'content', None) if delta is not None else None
+    if isinstance(content, str):
+        return content
+    # Certains modèles renvoient une liste de blocs de contenu
+    if isinstance(content, list):
+        return "".join(getattr(part, 'text', '') or '' for part in content)
+    return ""
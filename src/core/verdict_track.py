@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Module de production de la piste de verdicts alignée sur la vidéo.
+
+Chaque verdict horodaté (affirmation issue d'un VTT/SRT, voir `parse_vtt_timed`) devient
+une cue WebVTT "[CATÉGORIE] résumé" superposable à la vidéo d'origine, ou une entrée JSON.
+L'écriture se fait en flux, en une seule passe : chaque verdict est écrit dès qu'il arrive,
+sans garder la piste en mémoire (adapté aux directs de plusieurs heures).
+
+Lancer depuis src/ pour convertir un fichier de résultats en piste :
+    python -m core.verdict_track ../results/resultats_live_XXX.json --output verdicts.vtt
+"""
+
+import json
+import argparse
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+from .utils import Config
+
+# =============================================
+# FORMATAGE
+# =============================================
+TRACK_FORMATS = ("vtt", "json")
+
+def format_vtt_timestamp(seconds: float) -> str:
+    """Formate une position en secondes en horodatage WebVTT (HH:MM:SS.mmm)."""
+    millis = int(round(max(seconds, 0.0) * 1000))
+    hours, millis = divmod(millis, 3_600_000)
+    minutes, millis = divmod(millis, 60_000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}.{millis:03d}"
+
+def summarize_verdict(analyse: str, max_chars: int = Config.VERDICT_CUE_MAX_CHARS) -> str:
+    """
+    Résume un texte pour l'affichage en sous-titre : première ligne non vide, tronquée.
+
+    Args:
+        analyse: Texte complet du verdict
+        max_chars: Longueur maximale du résumé
+
+    Returns:
+        str: Résumé sur une ligne
+    """
+    first_line = next((line.strip() for line in analyse.splitlines() if line.strip()), "")
+    # Une ligne vide termine une cue WebVTT, et "-->" y est interdit
+    first_line = first_line.replace("-->", "→")
+    if len(first_line) > max_chars:
+        first_line = first_line[:max_chars - 1].rstrip() + "…"
+    return first_line
+
+def verdict_entry(record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Extrait d'un résultat les champs de la piste (accepte les résultats bruts de
+    `CritiqueAnalyzer` comme ceux enveloppés par `AffirmationProcessor` sous la clé "result").
+
+    Args:
+        record: Résultat d'analyse
+
+    Returns:
+        Optional[Dict[str, Any]]: {"start", "end", "category", "affirmation", "analyse"},
+        ou None si le résultat est une erreur ou n'est pas horodaté
+    """
+    result = record.get("result", record)
+    if result.get("status", "success") != "success":
+        return None
+    start = result.get("start", record.get("start"))
+    if start is None:
+        return None
+    end = result.get("end", record.get("end"))
+    return {
+        "start": start,
+        "end": max(end if end is not None else start, start + Config.VERDICT_MIN_DISPLAY_S),
+        "category": result.get("category", "Non déterminée"),
+        "affirmation": result.get("affirmation", record.get("affirmation", "")),
+        "analyse": result.get("analyse", ""),
+    }
+
+# =============================================
+# ÉCRITURE EN FLUX
+# =============================================
+
+class VerdictTrackWriter:
+    """
+    Écrit une piste de verdicts au fil de l'eau
+
+    - "vtt"  : fichier WebVTT, une cue par verdict ;
+    - "json" : tableau JSON, un objet par verdict (refermé par `close`).
+    Chaque verdict est vidé sur disque immédiatement : un lecteur peut suivre la piste en direct.
+    """
+
+    def __init__(self, path: Path, fmt: Optional[str] = None):
+        """
+        Ouvre la piste en écriture
+
+        Args:
+            path: Fichier de sortie
+            fmt: "vtt" ou "json" (déduit de l'extension du fichier si absent)
+        """
+        self.path = Path(path)
+        self.fmt = fmt or ("json" if self.path.suffix.lower() == ".json" else "vtt")
+        if self.fmt not in TRACK_FORMATS:
+            raise ValueError(f"Format de piste inconnu: {self.fmt} (attendu: {', '.join(TRACK_FORMATS)})")
+        self.count = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self._file.write("WEBVTT\n\n" if self.fmt == "vtt" else "[\n")
+        self._file.flush()
+
+    def write(self, record: Dict[str, Any]) -> bool:
+        """
+        Ajoute un verdict à la piste
+
+        Args:
+            record: Résultat d'analyse (voir `verdict_entry`)
+
+        Returns:
+            bool: True si le verdict a été écrit (False s'il est en erreur ou sans horodatage)
+        """
+        entry = verdict_entry(record)
+        if entry is None:
+            return False
+        self.count += 1
+        if self.fmt == "vtt":
+            self._file.write(
+                f"{self.count}\n"
+                f"{format_vtt_timestamp(entry['start'])} --> {format_vtt_timestamp(entry['end'])}\n"
+                f"[{summarize_verdict(entry['category'])}] {summarize_verdict(entry['analyse'])}\n\n"
+            )
+        else:
+            separator = ",\n" if self.count > 1 else ""
+            self._file.write(separator + json.dumps({"id": self.count, **entry}, ensure_ascii=False))
+        self._file.flush()
+        return True
+
+    def close(self) -> None:
+        """
+        Termine la piste (referme le tableau JSON)
+        """
+        if self._file.closed:
+            return
+        if self.fmt == "json":
+            self._file.write("\n]\n")
+        self._file.close()
+
+    def __enter__(self) -> "VerdictTrackWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+def write_verdict_track(records: Iterable[Dict[str, Any]], path: Path, fmt: Optional[str] = None) -> int:
+    """
+    Écrit une piste complète en une passe (`records` peut être un générateur)
+
+    Args:
+        records: Résultats d'analyse, dans l'ordre de la vidéo
+        path: Fichier de sortie
+        fmt: "vtt" ou "json" (déduit de l'extension si absent)
+
+    Returns:
+        int: Nombre de verdicts écrits
+    """
+    with VerdictTrackWriter(path, fmt) as writer:
+        for record in records:
+            writer.write(record)
+    return writer.count
+
+# --- Exemple d'utilisation du module ---
+if __name__ == '__main__':
+    cli = argparse.ArgumentParser(description="Convertit un fichier de résultats en piste de verdicts")
+    cli.add_argument("results", type=Path, help="Fichier de résultats JSON (mode live ou fichier)")
+    cli.add_argument("--output", type=Path, default=None, help="Piste de sortie (.vtt ou .json)")
+    cli.add_argument("--format", choices=TRACK_FORMATS, default=None, help="Format (défaut : selon l'extension)")
+    args = cli.parse_args()
+
+    with open(args.results, 'r', encoding='utf-8') as f:
+        records = json.load(f)
+    output = args.output or args.results.with_suffix(f".verdicts.{args.format or 'vtt'}")
+    total = write_verdict_track(records, output, args.format)
+    print(f"{total} verdicts écrits dans {output}")
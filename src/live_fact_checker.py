@@ -26,51 +26,72 @@ import sys
 import asyncio
 import logging
 from pathlib import Path
-from typing import List, Dict, Any, Union, Optional
+from typing import List, Dict, Any, Union, Optional, Callable, Tuple
 import json
 import os
+import atexit
+import functools
+import threading
 from datetime import datetime
 import argparse
-import readline
-from collections import deque
-
-# Configuration du logging - Essentielle pour le débogage et le suivi
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('fact_checker.log')
-    ]
-)
+import time
+from typing import TYPE_CHECKING
+
 logger = logging.getLogger(__name__)
 
 # Configuration des chemins - Permet une bonne gestion des chemins dans le projet
-try:
-    current_file = Path(__file__).name
-    current_dir = Path(__file__).parent.absolute()
-    result_dir = current_dir / "results"
-    result_dir.mkdir(exist_ok=True, parents=True)
-
-    # Ajout du chemin parent au path Python pour les imports locaux
-    project_root = current_dir.parent
-    if str(project_root) not in sys.path:
-        sys.path.append(str(project_root))
-
-    logger.info("Configuration des chemins réussie")
-except Exception as e:
-    logger.error(f"Erreur de configuration des chemins: {str(e)}")
-    sys.exit(1)
-
-# Imports spécifiques au projet
-from core.analyse_critique import (
-    CritiqueAnalyzer
-)
+# (le dossier des résultats et le journal ne sont créés qu'au lancement, voir `setup_runtime`)
+current_file = Path(__file__).name
+current_dir = Path(__file__).parent.absolute()
+result_dir = current_dir / "results"
+
+# Ajout du chemin parent au path Python pour les imports locaux
+project_root = current_dir.parent
+if str(project_root) not in sys.path:
+    sys.path.append(str(project_root))
+
+# Imports spécifiques au projet (modules légers, bibliothèque standard uniquement)
+# La pile d'analyse (mistralai, httpx) n'est importée que par les modes qui en ont besoin,
+# pour que `--help` et le menu s'affichent immédiatement (voir benchmarks/bench_startup.py)
 from core.utils import (
     validate_text,
     validate_text,
     format_affirmation,
+    media_timing,
 )
+from core.ingestion_pipeline import follow_caption_file, parse_vtt_timed
+from core.context_window import RollingContext
+from core.claim_extraction import score_check_worthiness, extract_claims
+from core.verdict_track import VerdictTrackWriter, write_verdict_track, summarize_verdict
+from core.background_io import get_background_writer, setup_queue_logging
+from core.scheduler import scheduling, format_wait_stats, PRIORITY_LIVE
+from core.degradation import RunBudget, count_levels
+from core.usage_ledger import tracking_run, format_run_totals
+from core.result_stats import record_result_file
+from core.history_store import HistoryStore, claim_hash, format_history_line
+from core.utils import Config
+
+if TYPE_CHECKING:
+    from core.analyse_critique import CritiqueAnalyzer
+    from core.job_queue import JobQueue
+
+def setup_runtime() -> None:
+    """
+    Configuration faite au lancement (et non à l'import) : journalisation et dossier des résultats
+    """
+    # Configuration du logging - Essentielle pour le débogage et le suivi
+    # Le fichier journal est écrit par un thread dédié (QueueHandler) : jamais d'écriture disque
+    # dans la boucle d'événements ; la console reste directe pour garder l'ordre avec les print
+    setup_queue_logging(
+        handlers=[logging.FileHandler('fact_checker.log')],
+        direct_handlers=[logging.StreamHandler(sys.stdout)]
+    )
+    try:
+        result_dir.mkdir(exist_ok=True, parents=True)
+        logger.info("Configuration des chemins réussie")
+    except Exception as e:
+        logger.error(f"Erreur de configuration des chemins: {str(e)}")
+        sys.exit(1)
 
 # =============================================
 # CONSTANTES ET CONFIGURATIONS
@@ -120,65 +141,93 @@ class HistoryManager:
     Gestionnaire d'historique des affirmations
 
     Cette classe gère :
-    - Le stockage des affirmations précédentes
-    - La récupération de l'historique
-    - La sauvegarde et le chargement de l'historique
+    - Le stockage de toutes les affirmations traitées, sur disque (voir `core.history_store`)
+    - La récupération de l'historique, page par page
+    - La recherche d'une vérification antérieure et la réutilisation de son verdict
     """
 
-    def __init__(self, max_size: int = 100):
+    def __init__(self, hot_window: int = Config.HISTORY_HOT_WINDOW):
         """
         Initialise le gestionnaire d'historique
 
         Args:
-            max_size: Taille maximale de l'historique
+            hot_window: Nombre de résultats récents gardés en mémoire
         """
-        self.max_size = max_size
-        self.history = deque(maxlen=max_size)
+        self.hot_window = hot_window
+        # Ancien historique JSON (100 derniers résultats), importé à la première ouverture
         self.history_file = result_dir / "history.json"
-
-        # Charger l'historique existant
-        self.load_history()
-
-    def add_to_history(self, item: Dict[str, Any]) -> None:
+        # L'historique n'est ouvert qu'au premier accès (pas de coût au démarrage)
+        self._store: Optional[HistoryStore] = None
+        self._open_lock = threading.Lock()
+
+    @property
+    def store(self) -> HistoryStore:
+        """Historique sur disque, ouvert au premier accès (et fermé à la sortie du programme)"""
+        with self._open_lock:
+            if self._store is None:
+                store = HistoryStore(hot_window=self.hot_window)
+                atexit.register(store.close)
+                imported = store.import_json(self.history_file)
+                if imported:
+                    logger.info(f"{imported} résultats importés depuis {self.history_file}")
+                self._store = store
+        return self._store
+
+    async def open_store(self) -> HistoryStore:
+        """Comme `store`, mais la première ouverture (base SQLite, import de l'ancien JSON) se fait dans un thread"""
+        if self._store is None:
+            await asyncio.to_thread(lambda: self.store)
+        return self._store
+
+    async def add_to_history(self, item: Dict[str, Any]) -> None:
         """
         Ajoute un élément à l'historique
 
         Args:
             item: Élément à ajouter à l'historique
         """
-        self.history.append(item)
-        self.save_history()
+        (await self.open_store()).add(item)
 
     def get_history(self) -> List[Dict[str, Any]]:
         """
-        Récupère l'historique complet
+        Récupère les éléments récents (fenêtre chaude, du plus ancien au plus récent)
 
         Returns:
-            List[Dict[str, Any]]: Liste des éléments de l'historique
+            List[Dict[str, Any]]: Liste des éléments récents de l'historique
         """
-        return list(self.history)
+        return [record for _, record in self.store.recent]
 
-    def save_history(self) -> None:
+    def get_page(self, page: int = 1, page_size: int = Config.HISTORY_PAGE_SIZE) -> Tuple[List[Dict[str, Any]], int]:
         """
-        Sauvegarde l'historique dans un fichier
+        Récupère une page de l'historique complet, du plus récent au plus ancien
+
+        Returns:
+            Tuple[List[Dict[str, Any]], int]: (éléments de la page, nombre total d'éléments)
         """
-        try:
-            with open(self.history_file, 'w', encoding='utf-8') as f:
-                json.dump(list(self.history), f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            logger.error(f"Erreur lors de la sauvegarde de l'historique: {str(e)}")
+        return self.store.page(page, page_size)
 
-    def load_history(self) -> None:
+    async def last_check(self, affirmation: Union[str, Dict]) -> Optional[Dict[str, Any]]:
+        """Dernière vérification de cette affirmation, ou None si elle n'a jamais été vérifiée."""
+        store = await self.open_store()
+        digest = claim_hash(affirmation)
+        record = store.recent_record(digest)
+        # Hors de la fenêtre chaude : lecture de l'index sur disque dans un thread
+        return record if record is not None else await asyncio.to_thread(store.read_last, digest)
+
+    async def reusable_verdict(self, affirmation: Union[str, Dict], model: str) -> Optional[Dict[str, Any]]:
         """
-        Charge l'historique depuis un fichier
+        Verdict récent de cette affirmation, à reprendre sans appel API (voir `HistoryStore.reusable_verdict`)
+
+        Returns:
+            Optional[Dict[str, Any]]: Le résultat d'analyse, ou None (toujours None si `Config.HISTORY_VERDICT_TTL` vaut 0)
         """
-        try:
-            if self.history_file.exists():
-                with open(self.history_file, 'r', encoding='utf-8') as f:
-                    self.history = deque(json.load(f), maxlen=self.max_size)
-        except Exception as e:
-            logger.error(f"Erreur lors du chargement de l'historique: {str(e)}")
-            self.history = deque(maxlen=self.max_size)
+        if Config.HISTORY_VERDICT_TTL <= 0:
+            return None
+        return HistoryStore.valid_verdict(await self.last_check(affirmation), model, Config.HISTORY_VERDICT_TTL)
+
+    def clear(self) -> None:
+        """Efface l'historique"""
+        self.store.clear()
 
 class AffirmationProcessor:
     """
@@ -190,26 +239,67 @@ class AffirmationProcessor:
     - La gestion des erreurs
     """
 
-    def __init__(self, analyzer: CritiqueAnalyzer):
+    def __init__(
+        self,
+        analyzer: "CritiqueAnalyzer",
+        deadline_s: float = Config.CLAIM_DEADLINE_S,
+        token_budget: int = Config.RUN_TOKEN_BUDGET
+    ):
         """
         Initialise le processeur d'affirmations
 
         Args:
             analyzer: Instance de CritiqueAnalyzer pour l'analyse
+            deadline_s: Échéance de chaque affirmation, comptée depuis sa soumission (0 : aucune)
+            token_budget: Budget de tokens de chaque lot, et de la session pour les affirmations isolées (0 : illimité)
         """
         self.analyzer = analyzer
         self.history_manager = HistoryManager()
-
-    async def process_affirmation(self, affirmation: Union[str, Dict], semaphore: asyncio.Semaphore = None) -> Dict[str, Any]:
+        self.deadline_s = deadline_s
+        self.token_budget = token_budget
+        # Budget des affirmations traitées une à une (modes interactif et live) ; chaque lot a le sien
+        self.budget = self.new_budget()
+        # Lot du dernier `process_batch` (consommation inscrite sous cet identifiant, voir `usage_ledger`)
+        self.last_run_id: Optional[str] = None
+
+    def new_budget(self) -> Optional[RunBudget]:
+        """Nouveau budget de lot (None si aucun budget n'est configuré)."""
+        return RunBudget(self.token_budget) if self.token_budget else None
+
+    async def process_affirmation(
+        self,
+        affirmation: Union[str, Dict],
+        semaphore: asyncio.Semaphore = None,
+        on_category: Optional[Callable[[str], None]] = None,
+        on_token: Optional[Callable[[str], None]] = None,
+        history: Optional[List[str]] = None,
+        deadline: Optional[float] = None,
+        budget: Optional[RunBudget] = None
+    ) -> Dict[str, Any]:
         """
         Traite une affirmation unique
 
+        Avec une échéance ou un budget, l'analyse se dégrade par paliers au lieu de bloquer
+        (voir `CritiqueAnalyzer.analyze_within`) ; le palier atteint est dans "degradation".
+        Un verdict récent de l'historique est repris tel quel si `Config.HISTORY_VERDICT_TTL`
+        le permet ("from_history" dans le résultat).
+
         Args:
             affirmation: Affirmation à traiter
+            semaphore: Sémaphore optionnel pour limiter le parallélisme
+            on_category: Si fourni (ou on_token), active le streaming ; appelé avec la catégorie
+            on_token: Si fourni, appelé avec chaque fragment du verdict au fil de l'eau
+            history: Contexte de conversation borné (voir `RollingContext`)
+            deadline: Échéance absolue (`time.time()`), par défaut `deadline_s` après la soumission
+            budget: Budget de tokens du lot, par défaut celui de la session
 
         Returns:
             Dict[str, Any]: Résultat du traitement
         """
+        if deadline is None and self.deadline_s:
+            deadline = time.time() + self.deadline_s
+        budget = budget or self.budget
+        started = time.perf_counter()
         # Le sémaphore garantit que cette section n'est exécutée que par un nombre limité de tâches à la fois.
         async with semaphore if semaphore else asyncio.Semaphore(1):
             try:
@@ -217,16 +307,43 @@ class AffirmationProcessor:
                 if not validate_text(affirmation):
                     raise ValueError("Affirmation invalide ou vide")
 
-                # Analyse de l'affirmation
-                result = await self.analyzer.analyze(affirmation)
+                # Verdict récent déjà dans l'historique (voir `Config.HISTORY_VERDICT_TTL`) : aucun appel API
+                reused = await self.history_manager.reusable_verdict(affirmation, Config.DEFAULT_MODEL)
+                if reused is not None:
+                    result = {**reused, "affirmation": format_affirmation(affirmation), **media_timing(affirmation),
+                              "from_history": True}
+                    if on_category:
+                        on_category(result["category"])
+                    if on_token:
+                        on_token(result["analyse"])
+                    # Pas de nouvel ajout à l'historique : le verdict garde la date de sa vérification
+                    return {"timestamp": datetime.now().isoformat(), "affirmation": format_affirmation(affirmation),
+                            "result": result, "elapsed_s": round(time.perf_counter() - started, 3)}
+
+                # Analyse de l'affirmation (dégradable sous échéance ou budget, sinon en streaming
+                # si un affichage progressif est demandé)
+                if deadline is not None or budget is not None:
+                    result = await self.analyzer.analyze_within(affirmation, history=history, deadline=deadline, budget=budget)
+                    # Pas de streaming sous échéance : le verdict est transmis d'un bloc
+                    if on_category:
+                        on_category(result["category"])
+                    if on_token:
+                        on_token(result["analyse"])
+                elif on_category or on_token:
+                    result = await self.analyzer.analyze_stream(
+                        affirmation, history=history, on_category=on_category, on_token=on_token
+                    )
+                else:
+                    result = await self.analyzer.analyze(affirmation, history=history)
 
                 # Ajout à l'historique
                 processed_result = {
                     "timestamp": datetime.now().isoformat(),
                     "affirmation": format_affirmation(affirmation),
-                    "result": result
+                    "result": result,
+                    "elapsed_s": round(time.perf_counter() - started, 3)  # Latence (voir `result_stats`)
                 }
-                self.history_manager.add_to_history(processed_result)
+                await self.history_manager.add_to_history(processed_result)
 
                 return processed_result
 
@@ -244,27 +361,33 @@ class AffirmationProcessor:
                     "details": {
                         "type": "str" if isinstance(affirmation, str) else "dict",
                         "length": len(aff_text)
-                    }
+                    },
+                    "elapsed_s": round(time.perf_counter() - started, 3),
+                    **media_timing(affirmation)
                 }
 
                 # Ajout à l'historique même en cas d'erreur
-                self.history_manager.add_to_history(error_report)
+                await self.history_manager.add_to_history(error_report)
                 return error_report
 
-    async def process_batch(self, affirmations: List[Union[str, Dict]]) -> List[Dict[str, Any]]:
+    async def process_batch(self, affirmations: List[Union[str, Dict]], run_id: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Traite un lot d'affirmations
 
         Args:
             affirmations: Liste d'affirmations à traiter
+            run_id: Identifiant du lot dans le registre de consommation (par défaut : horodaté)
 
         Returns:
             List[Dict[str, Any]]: Liste des résultats
         """
-        # Création d'une liste de tâches asynchrones
-        tasks = [self.process_affirmation(aff) for aff in affirmations]
-        # Exécution de toutes les tâches en parallèle
-        results_raw = await asyncio.gather(*tasks)
+        self.last_run_id = run_id or f"lot_{datetime.now():%Y%m%d_%H%M%S}"
+        # Création d'une liste de tâches asynchrones (un budget de tokens par lot)
+        budget = self.new_budget()
+        tasks = [self.process_affirmation(aff, budget=budget) for aff in affirmations]
+        # Exécution de toutes les tâches en parallèle, appels API inscrits au compte du lot
+        with tracking_run(self.last_run_id):
+            results_raw = await asyncio.gather(*tasks)
         
         # Ajout de l'ID à chaque résultat
         return [{"id": i, **res} for i, res in enumerate(results_raw, 1)]
@@ -273,12 +396,18 @@ class AffirmationProcessor:
 # FONCTIONS PRINCIPALES
 # =============================================
 
-def display_results(results: List[Dict[str, Any]]) -> None:
+def display_results(
+    results: List[Dict[str, Any]],
+    analyzer: Optional["CritiqueAnalyzer"] = None,
+    run_id: Optional[str] = None
+) -> None:
     """
     Affiche les résultats de manière formatée
 
     Args:
         results: Liste des résultats à afficher
+        analyzer: Analyseur utilisé (pour afficher ses compteurs de regroupement), optionnel
+        run_id: Lot dont afficher la consommation (voir `usage_ledger`), optionnel
     """
     print("\n" + "="*80)
     print("RAPPORT D'ANALYSE".center(80))
@@ -291,10 +420,11 @@ def display_results(results: List[Dict[str, Any]]) -> None:
         aff_text = format_affirmation(result.get('affirmation', {}))
         analysis = result.get('result', {}).get('analyse', 'Aucune analyse disponible')
         category = result.get('result', {}).get('category', 'Non déterminée')
+        degradation = result.get('result', {}).get('degradation')
 
         print(f"\n{color}ID: {result.get('id', '')}{COLORS['reset']}")
         print(f"Affirmation: {aff_text}")
-        print(f"Catégorie: {category}")
+        print(f"Catégorie: {category}" + (f" (palier: {degradation})" if degradation else ""))
         print("-"*60)
         print("Analyse:")
         print(analysis)
@@ -307,26 +437,127 @@ def display_results(results: List[Dict[str, Any]]) -> None:
     stats = {
         "total": len(results),
         "success": sum(1 for r in results if r.get("result", {}).get("status") == "success"),
+        "degraded": sum(1 for r in results if r.get("result", {}).get("status") == "degraded"),
         "errors": sum(1 for r in results if r.get("status") == "error")
     }
-    print(f"STATISTIQUES: {stats['success']} réussites, {stats['errors']} erreurs sur {stats['total']} analyses")
+    print(f"STATISTIQUES: {stats['success']} réussites, {stats['degraded']} sans verdict (catégorie seule), "
+          f"{stats['errors']} erreurs sur {stats['total']} analyses")
+    levels = count_levels(results)
+    if levels:
+        print("DÉGRADATION: " + ", ".join(f"{name} {count}" for name, count in levels.items()))
+    from core.client_registry import connection_stats
+    connections = connection_stats()
+    print(f"CONNEXIONS: {connections['requests']} requêtes HTTP, {connections['new_connections']} connexions ouvertes "
+          f"({connections['reuse_rate']:.0%} réutilisées, {connections['handshake_s']}s de poignées de main)")
+    if analyzer is not None:
+        coalescing = analyzer.single_flight.stats
+        print(f"REGROUPEMENT: {coalescing['suppressed']} appels identiques simultanés évités "
+              f"({coalescing['executions']} exécutés)")
+        print(f"ATTENTE API: {format_wait_stats(analyzer.scheduler.wait_stats())}")
+        classification = analyzer.classification_stats
+        if classification["fuzzy"] or classification["fallback"]:
+            print(f"CLASSIFICATION: {classification['fuzzy']} étiquettes approchantes rattachées, "
+                  f"{classification['fallback']} catégories estimées localement ({classification['exact']} exactes)")
+        consumption = format_run_totals(run_id, analyzer.ledger) if run_id else None
+        if consumption:
+            print(f"CONSOMMATION: {consumption}")
     print("="*80 + "\n")
 
+def display_streamed_category(category: str) -> None:
+    """
+    Affiche la catégorie dès le retour de la Phase 1 (mode streaming)
+
+    Args:
+        category: Catégorie déterminée par la classification
+    """
+    print(f"\nCatégorie: {category}")
+    print("-"*60)
+    print("Analyse:")
+
+def display_streamed_token(token: str) -> None:
+    """
+    Affiche un fragment du verdict dès sa réception (mode streaming)
+
+    Args:
+        token: Fragment de texte reçu de l'API
+    """
+    print(token, end="", flush=True)
+
+def display_streamed_summary(result: Dict[str, Any]) -> None:
+    """
+    Termine l'affichage d'une analyse en streaming : erreur éventuelle et temps mesurés
+
+    Args:
+        result: Résultat renvoyé par `AffirmationProcessor.process_affirmation`
+    """
+    print()
+    if result.get("status") == "error":
+        print(f"{COLORS['error']}Erreur: {result.get('error_message', 'Erreur inconnue')}{COLORS['reset']}")
+        return
+    if result.get("result", {}).get("from_history"):
+        print("-"*60)
+        print(f"{COLORS['info']}Verdict repris de l'historique (aucun appel API){COLORS['reset']}")
+        return
+
+    timings = result.get("result", {}).get("timings", {})
+    print("-"*60)
+    print(
+        f"{COLORS['info']}Temps: classification {timings.get('phase1_s', '?')}s, "
+        f"premier token {timings.get('ttft_s', '?')}s, total {timings.get('total_s', '?')}s{COLORS['reset']}"
+    )
+
 def save_results_to_file(results: List[Dict[str, Any]], filename: str) -> None:
     """
     Sauvegarde les résultats dans un fichier
 
+    La sérialisation et l'écriture se font dans le thread d'écriture (`BackgroundWriter`) :
+    la fonction rend la main immédiatement, sans bloquer la boucle d'événements. Le fichier
+    est ensuite intégré aux statistiques cumulées (voir `core.result_stats`).
+
     Args:
         results: Liste des résultats à sauvegarder
         filename: Nom du fichier de sortie
     """
-    try:
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
-        logger.info(f"Résultats sauvegardés dans {filename}")
-    except Exception as e:
-        logger.error(f"Erreur lors de la sauvegarde des résultats: {str(e)}")
-        print(f"{COLORS['error']}Erreur lors de la sauvegarde des résultats: {str(e)}{COLORS['reset']}")
+    def on_done(error: Optional[Exception]) -> None:
+        if error is None:
+            logger.info(f"Résultats sauvegardés dans {filename}")
+            # Statistiques cumulées mises à jour avec ce fichier, toujours dans le thread d'écriture
+            record_result_file(Path(filename))
+        else:
+            logger.error(f"Erreur lors de la sauvegarde des résultats: {str(error)}")
+            print(f"{COLORS['error']}Erreur lors de la sauvegarde des résultats: {str(error)}{COLORS['reset']}")
+
+    get_background_writer().write_json(filename, list(results), on_done)
+
+async def run_batch(
+    processor: AffirmationProcessor,
+    affirmations: List[Union[str, Dict]],
+    job_queue: Optional["JobQueue"] = None,
+    name: str = ""
+) -> List[Dict[str, Any]]:
+    """
+    Analyse un lot localement, ou le confie aux workers de la file répartie
+
+    Args:
+        processor: Instance de AffirmationProcessor (analyse locale)
+        affirmations: Affirmations à analyser
+        job_queue: File de travaux (option --queue) : le lot y est déposé et ses résultats attendus
+        name: Libellé du lot dans la file
+
+    Returns:
+        List[Dict[str, Any]]: Résultats dans l'ordre des affirmations, avec leur "id"
+    """
+    if job_queue is None:
+        return await processor.process_batch(affirmations, run_id=f"{name or 'lot'}_{datetime.now():%Y%m%d_%H%M%S}")
+
+    from core.job_queue import wait_for_run, format_progress
+    run_id = await asyncio.to_thread(job_queue.create_run, affirmations, name)
+    processor.last_run_id = run_id  # Consommation inscrite par les workers (python -m core.usage_ledger report --run)
+    print(f"\nLot {run_id} déposé dans la file {job_queue.path}.")
+    print("Lancez un ou plusieurs workers (chacun avec sa clé API) : python -m core.job_queue worker")
+    print(f"Ctrl+C pour ne plus attendre ; résultats récupérables plus tard : python -m core.job_queue collect {run_id}")
+    await wait_for_run(job_queue, run_id, on_progress=lambda status: print(f"  {format_progress(status)}"))
+    return await asyncio.to_thread(job_queue.run_results, run_id)
 
 async def interactive_mode(processor: AffirmationProcessor) -> None:
     """
@@ -340,7 +571,7 @@ async def interactive_mode(processor: AffirmationProcessor) -> None:
     print("="*80)
     print("\nEntrez vos affirmations à vérifier une par une.")
     print("Entrez 'quit', 'exit' ou 'q' pour terminer.")
-    print("Entrez 'history' pour voir l'historique.")
+    print("Entrez 'history' (ou 'history 2', 'history 3'...) pour parcourir l'historique.")
     print("Entrez 'clear' pour effacer l'historique.")
 
     while True:
@@ -353,25 +584,45 @@ async def interactive_mode(processor: AffirmationProcessor) -> None:
             if user_input.lower() in ('quit', 'exit', 'q'):
                 break
 
-            if user_input.lower() == 'history':
-                history = processor.history_manager.get_history()
-                print("\nHISTORIQUE DES AFFIRMATIONS:")
-                for i, item in enumerate(history, 1):
+            command = user_input.lower().split()
+            if command[0] == 'history' and len(command) <= 2 and (len(command) == 1 or command[1].isdigit()):
+                # Pages du plus récent au plus ancien ; seule la page demandée est lue sur disque
+                page = int(command[1]) if len(command) == 2 else 1
+                history, total = await asyncio.to_thread(processor.history_manager.get_page, page)
+                page_count = max(1, -(-total // Config.HISTORY_PAGE_SIZE))
+                print(f"\nHISTORIQUE DES AFFIRMATIONS (page {page}/{page_count}, {total} au total):")
+                for i, item in enumerate(history, (page - 1) * Config.HISTORY_PAGE_SIZE + 1):
                     status = item.get("status", "unknown")
                     color = COLORS.get(status, COLORS['info'])
-                    print(f"{color}{i}. {item.get('affirmation', 'Inconnu')}{COLORS['reset']}")
+                    print(f"{color}{format_history_line(i, item)}{COLORS['reset']}")
+                if page < page_count:
+                    print(f"Page suivante : history {page + 1}")
                 continue
 
             if user_input.lower() == 'clear':
-                processor.history_manager.history.clear()
-                processor.history_manager.save_history()
+                await asyncio.to_thread(processor.history_manager.clear)
                 print("Historique effacé.")
                 continue
 
+            # Déjà vérifiée ? (fenêtre chaude en mémoire, sinon index de l'historique sur disque)
+            previous = await processor.history_manager.last_check(user_input)
+            if previous is not None:
+                previous_result = previous.get("result", {})
+                print(f"{COLORS['info']}Déjà vérifiée le {str(previous.get('timestamp', ''))[:16].replace('T', ' ')} "
+                      f"({previous_result.get('category') or previous.get('status', '?')}) : "
+                      f"{summarize_verdict(previous_result.get('analyse', previous.get('error_message', '')))}{COLORS['reset']}")
+
             # Correction : Traiter chaque affirmation individuellement
             print("\nTraitement de l'affirmation...")
-            result = await processor.process_affirmation(user_input)
-            display_results([{"id": 1, **result}]) # On l'affiche comme un batch d'un seul élément
+            # Affichage progressif : la catégorie dès la Phase 1, puis le verdict fragment par fragment
+            # Saisie interactive : un utilisateur attend la réponse, elle passe avant les lots
+            with scheduling(PRIORITY_LIVE):
+                result = await processor.process_affirmation(
+                    user_input,
+                    on_category=display_streamed_category,
+                    on_token=display_streamed_token
+                )
+            display_streamed_summary(result)
 
         except KeyboardInterrupt:
             print("\nInterrompu par l'utilisateur")
@@ -380,12 +631,13 @@ async def interactive_mode(processor: AffirmationProcessor) -> None:
             print(f"{COLORS['error']}Erreur: {str(e)}{COLORS['reset']}")
             continue
 
-async def batch_mode(processor: AffirmationProcessor) -> None:
+async def batch_mode(processor: AffirmationProcessor, job_queue: Optional["JobQueue"] = None) -> None:
     """
     Mode batch pour le fact-checking
 
     Args:
         processor: Instance de AffirmationProcessor
+        job_queue: File de travaux répartie (option --queue), optionnelle
     """
     print("\n" + "="*80)
     print("MODE BATCH".center(80))
@@ -407,8 +659,8 @@ async def batch_mode(processor: AffirmationProcessor) -> None:
             return
 
         print(f"\nTraitement de {len(affirmations)} affirmations...")
-        results = await processor.process_batch(affirmations)
-        display_results(results)
+        results = await run_batch(processor, affirmations, job_queue, name="batch")
+        display_results(results, processor.analyzer, processor.last_run_id)
 
         # Sauvegarde des résultats avec timestamp
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -419,18 +671,20 @@ async def batch_mode(processor: AffirmationProcessor) -> None:
     except Exception as e:
         print(f"{COLORS['error']}Erreur en mode batch: {str(e)}{COLORS['reset']}")
 
-async def file_mode(processor: AffirmationProcessor) -> None:
+async def file_mode(processor: AffirmationProcessor, job_queue: Optional["JobQueue"] = None) -> None:
     """
     Mode fichier pour traiter les affirmations depuis un fichier texte.
 
     Args:
         processor: Instance de AffirmationProcessor
+        job_queue: File de travaux répartie (option --queue), optionnelle
     """
     print("\n" + "="*80)
     print("MODE FICHIER".center(80))
     print("="*80)
     print("\nEntrez le chemin complet vers votre fichier d'affirmations (.txt).")
     print("Chaque ligne du fichier sera traitée comme une affirmation.")
+    print("Un fichier de sous-titres (.vtt/.srt) produit en plus une piste de verdicts alignée sur la vidéo.")
 
     try:
         file_path_str = input("\nChemin du fichier > ").strip()
@@ -440,21 +694,31 @@ async def file_mode(processor: AffirmationProcessor) -> None:
             print(f"{COLORS['error']}Erreur: Le fichier '{file_path}' n'a pas été trouvé ou n'est pas un fichier valide.{COLORS['reset']}")
             return
 
+        is_caption = file_path.suffix.lower() in (".vtt", ".srt")
         with open(file_path, 'r', encoding='utf-8') as f:
-            affirmations = [line.strip() for line in f if line.strip()]
+            if is_caption:
+                # Sous-titres : phrases horodatées, seules les plus vérifiables sont analysées
+                sentences = extract_claims(parse_vtt_timed(f.read()))
+                affirmations = [{"affirmation": s["text"], "start": s["start"], "end": s["end"]} for s in sentences]
+            else:
+                affirmations = [line.strip() for line in f if line.strip()]
 
         if not affirmations:
             print("Le fichier est vide ou ne contient aucune affirmation valide.")
             return
 
         print(f"\nTraitement de {len(affirmations)} affirmations depuis le fichier...")
-        results = await processor.process_batch(affirmations)
-        display_results(results)
+        results = await run_batch(processor, affirmations, job_queue, name=file_path.name)
+        display_results(results, processor.analyzer, processor.last_run_id)
 
         # Sauvegarde des résultats
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         result_path = result_dir / f"resultats_fichier_{file_path.stem}_{timestamp}.json"
         save_results_to_file(results, str(result_path))
+        if is_caption:
+            track_path = result_dir / f"verdicts_{file_path.stem}_{timestamp}.vtt"
+            count = await asyncio.to_thread(write_verdict_track, results, track_path)
+            print(f"Piste de verdicts ({count} cues) sauvegardée dans {track_path}")
 
     except Exception as e:
         print(f"{COLORS['error']}Erreur en mode fichier: {str(e)}{COLORS['reset']}")
@@ -473,7 +737,7 @@ async def default_mode(processor: AffirmationProcessor) -> None:
 
     try:
         results = await processor.process_batch(DEFAULT_AFFIRMATIONS)
-        display_results(results)
+        display_results(results, processor.analyzer, processor.last_run_id)
 
         # Sauvegarde des résultats
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -484,11 +748,207 @@ async def default_mode(processor: AffirmationProcessor) -> None:
     except Exception as e:
         print(f"{COLORS['error']}Erreur en mode par défaut: {str(e)}{COLORS['reset']}")
 
+def format_media_time(seconds: Optional[float]) -> str:
+    """
+    Formate une position dans la vidéo (secondes) en HH:MM:SS
+
+    Args:
+        seconds: Position en secondes (None si inconnue)
+
+    Returns:
+        str: Position formatée
+    """
+    if seconds is None:
+        return "--:--:--"
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+
+async def live_tail_mode(
+    processor: AffirmationProcessor,
+    file_path: Optional[str] = None,
+    poll_interval: float = 0.5,
+    idle_timeout: Optional[float] = None
+) -> None:
+    """
+    Mode live : suit un fichier VTT/SRT en cours d'écriture et vérifie chaque nouvelle phrase
+
+    Un producteur lit les nouvelles phrases du fichier et les place dans une file asyncio ;
+    un consommateur les analyse dans l'ordre. Pour chaque verdict, deux latences sont mesurées :
+    - "processing_s" : de la lecture de la phrase dans le fichier jusqu'au verdict ;
+    - "end_to_end_s" : du moment estimé où la phrase a été prononcée jusqu'au verdict. L'heure de
+      parole est estimée en ancrant la première phrase lue sur l'horloge murale (pertinent pour un direct).
+
+    Args:
+        processor: Instance de AffirmationProcessor
+        file_path: Fichier à suivre (demandé à l'utilisateur si absent)
+        poll_interval: Intervalle de scrutation du fichier en secondes
+        idle_timeout: Arrêt automatique après ce nombre de secondes sans nouvelles données
+    """
+    print("\n" + "="*80)
+    print("MODE LIVE (SUIVI DE TRANSCRIPTION)".center(80))
+    print("="*80)
+
+    if not file_path:
+        print("\nEntrez le chemin du fichier .vtt/.srt écrit par yt-dlp ou l'ASR.")
+        print("Ctrl+C pour arrêter le suivi.")
+        file_path = input("\nChemin du fichier > ").strip()
+
+    queue: asyncio.Queue = asyncio.Queue()
+    results: List[Dict[str, Any]] = []
+    # Piste de verdicts WebVTT écrite au fil de l'eau, à superposer à la vidéo ; ouverture et
+    # écritures hors de la boucle d'événements (thread d'écriture, dans l'ordre des verdicts)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    writer = get_background_writer()
+    track = await asyncio.to_thread(VerdictTrackWriter, result_dir / f"verdicts_live_{timestamp}.vtt")
+    # Contexte glissant : les dernières phrases prononcées, bornées en nombre et en tokens
+    context = RollingContext()
+    # Ancre (heure murale, position vidéo) de la première phrase, pour estimer l'heure de parole
+    anchor: Dict[str, float] = {}
+
+    async def producer() -> None:
+        async for sentence in follow_caption_file(file_path, poll_interval=poll_interval, idle_timeout=idle_timeout):
+            await queue.put(sentence)
+        await queue.put(None)  # Signal de fin pour le consommateur
+
+    async def consumer() -> None:
+        while True:
+            sentence = await queue.get()
+            if sentence is None:
+                break
+            # Les phrases trop courtes ou sans contenu vérifiable ne sont pas analysées, mais restent du contexte
+            if not validate_text(sentence["text"]) or score_check_worthiness(sentence["text"]) < Config.CLAIM_MIN_SCORE:
+                context.add(sentence["text"])
+                continue
+            if not anchor:
+                anchor.update(wall=sentence["detected_at"], media=sentence["end"] or 0.0)
+
+            # Direct : priorité maximale, échéance comptée depuis la lecture de la phrase (EDF entre phrases) ;
+            # à l'échéance, l'analyse se dégrade plutôt que de retarder les phrases suivantes
+            deadline = sentence["detected_at"] + Config.SCHEDULER_DEADLINE_LIVE_S
+            with scheduling(PRIORITY_LIVE, deadline=deadline):
+                result = await processor.process_affirmation(
+                    {"affirmation": sentence["text"], "start": sentence["start"], "end": sentence["end"]},
+                    history=context.get_context(),
+                    deadline=deadline
+                )
+            context.add(sentence["text"])
+            verdict_at = time.time()
+            spoken_at = anchor["wall"] + ((sentence["end"] or 0.0) - anchor["media"])
+            record = {
+                "id": len(results) + 1,
+                **result,
+                "start": sentence["start"],
+                "end": sentence["end"],
+                "lag": {
+                    "processing_s": round(verdict_at - sentence["detected_at"], 3),
+                    "end_to_end_s": round(verdict_at - spoken_at, 3),
+                    "queue_size": queue.qsize()
+                }
+            }
+            results.append(record)
+            writer.submit(functools.partial(track.write, record))
+
+            category = result.get("result", {}).get("category", "Non déterminée")
+            if result.get("result", {}).get("degradation", "full") != "full":
+                category += f" ({result['result']['degradation']})"
+            verdict = result.get("result", {}).get("analyse", result.get("error_message", ""))
+            color = COLORS['error'] if result.get("status") == "error" else COLORS['success']
+            print(f"\n{color}[{format_media_time(sentence['start'])}] {category}{COLORS['reset']} {sentence['text']}")
+            print(f"  → {verdict.splitlines()[0] if verdict else ''}")
+            print(f"  {COLORS['info']}Latence: {record['lag']['end_to_end_s']}s (traitement {record['lag']['processing_s']}s, file {record['lag']['queue_size']}){COLORS['reset']}")
+
+    try:
+        # Tous les appels du suivi sont inscrits au compte d'un même lot
+        with tracking_run(f"live_{timestamp}"):
+            await asyncio.gather(producer(), consumer())
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        print("\nSuivi interrompu par l'utilisateur")
+    except Exception as e:
+        print(f"{COLORS['error']}Erreur en mode live: {str(e)}{COLORS['reset']}")
+    finally:
+        writer.submit(track.close)
+    # Piste refermée et toutes ses cues écrites avant d'afficher le bilan
+    await asyncio.to_thread(writer.flush)
+
+    if results:
+        lags = [r["lag"]["end_to_end_s"] for r in results]
+        print(f"\n{len(results)} phrases vérifiées. Latence moyenne {sum(lags) / len(lags):.2f}s, maximale {max(lags):.2f}s")
+        print(f"Piste de verdicts ({track.count} cues) : {track.path}")
+        from core.client_registry import connection_stats
+        print(f"Connexions HTTP : {connection_stats()}")
+        print(f"Attente API : {format_wait_stats(processor.analyzer.scheduler.wait_stats())}")
+        levels = count_levels(results)
+        print("Paliers : " + ", ".join(f"{name} {count}" for name, count in levels.items()))
+        consumption = format_run_totals(f"live_{timestamp}", processor.analyzer.ledger)
+        if consumption:
+            print(f"Consommation : {consumption}")
+        result_path = result_dir / f"resultats_live_{timestamp}.json"
+        save_results_to_file(results, str(result_path))
+
 # =============================================
 # FONCTION PRINCIPALE
 # =============================================
 
-async def main() -> None:
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """
+    Analyse les arguments de la ligne de commande
+
+    Args:
+        argv: Arguments à analyser (par défaut : sys.argv)
+
+    Returns:
+        argparse.Namespace: Options choisies par l'utilisateur
+    """
+    parser = argparse.ArgumentParser(description="Fact-Checker critique (Code Citoyen)")
+    parser.add_argument(
+        "--analysis-mode",
+        choices=["two_phase", "fused"],
+        default=None,
+        help="Mode d'analyse : deux appels (classification puis analyse) ou un seul appel JSON fusionné"
+    )
+    parser.add_argument(
+        "--speculative",
+        action="store_true",
+        default=None,
+        help="Lance la Phase 2 en parallèle de la classification quand la catégorie est évidente (nécessite API_CONCURRENCY >= 2)"
+    )
+    parser.add_argument(
+        "--follow",
+        metavar="FICHIER",
+        default=None,
+        help="Mode live : suit un fichier .vtt/.srt en cours d'écriture et vérifie les nouvelles phrases"
+    )
+    parser.add_argument("--poll-interval", type=float, default=0.5, help="Intervalle de scrutation du fichier suivi (s)")
+    parser.add_argument("--idle-timeout", type=float, default=None, help="Arrête le suivi après N secondes sans nouvelles données")
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Mode service : expose l'analyse en HTTP (POST /check, /batch, /stream ; GET /health) au lieu du menu"
+    )
+    parser.add_argument("--host", default=Config.SERVICE_HOST, help="Adresse d'écoute du mode service")
+    parser.add_argument("--port", type=int, default=Config.SERVICE_PORT, help="Port d'écoute du mode service")
+    parser.add_argument(
+        "--claim-deadline",
+        type=float,
+        default=Config.CLAIM_DEADLINE_S,
+        metavar="SECONDES",
+        help="Échéance de chaque affirmation (0 : aucune) ; au-delà, l'analyse se dégrade (sans preuves, modèle économique, catégorie seule)"
+    )
+    parser.add_argument(
+        "--token-budget",
+        type=int,
+        default=Config.RUN_TOKEN_BUDGET,
+        metavar="TOKENS",
+        help="Budget de tokens par lot (0 : illimité) ; quand il s'épuise, l'analyse se dégrade par paliers"
+    )
+    parser.add_argument(
+        "--queue",
+        action="store_true",
+        help="Modes batch et fichier : dépose le lot dans la file répartie (python -m core.job_queue worker) au lieu de l'analyser ici"
+    )
+    return parser.parse_args(argv)
+
+async def main(args: Optional[argparse.Namespace] = None) -> None:
     """
     Fonction principale du script
 
@@ -497,15 +957,59 @@ async def main() -> None:
     2. Présente un menu à l'utilisateur
     3. Gère les différents modes de fonctionnement
     4. Capture les erreurs globales
+
+    Args:
+        args: Options de la ligne de commande (voir `parse_args`)
     """
+    args = args or parse_args([])
+    setup_runtime()
+    # Imports différés : la pile d'analyse (mistralai, httpx) n'est chargée qu'une fois les options lues
+    from core.analyse_critique import CritiqueAnalyzer
+    from core.client_registry import close_clients
+    job_queue = None
+    if args.queue:
+        from core.job_queue import JobQueue
+        job_queue = JobQueue()
     try:
         print("\n" + "="*80)
         print("FACT CHECKER - ANALYSE CRITIQUE".center(80))
         print("="*80 + "\n")
 
-        # Initialisation de l'analyseur et du processeur
-        analyzer = await CritiqueAnalyzer.create()  # Utilisation de la classe renommée
-        processor = AffirmationProcessor(analyzer=analyzer)
+        # Initialisation de l'analyseur en tâche de fond : l'import de mistralai (~0,7 s) se fait
+        # dans un thread pendant que le menu s'affiche et que l'utilisateur choisit un mode
+        analyzer_task = asyncio.create_task(CritiqueAnalyzer.create(
+            analysis_mode=args.analysis_mode,
+            speculative=args.speculative
+        ))  # Utilisation de la classe renommée
+        await asyncio.sleep(0)  # Laisse la tâche démarrer son thread avant le premier input() bloquant
+        processor: Optional[AffirmationProcessor] = None
+
+        async def get_processor() -> AffirmationProcessor:
+            """Attend l'analyseur (une seule fois) et crée le processeur."""
+            nonlocal processor
+            if processor is None:
+                processor = AffirmationProcessor(
+                    analyzer=await analyzer_task, deadline_s=args.claim_deadline, token_budget=args.token_budget
+                )
+            return processor
+
+        # Mode service : les requêtes HTTP remplacent le menu (Ctrl+C pour arrêter)
+        if args.serve:
+            from core.fact_check_service import FactCheckService
+            service = FactCheckService(await analyzer_task)
+            print(f"Service de fact-checking : http://{args.host}:{args.port} (Ctrl+C pour arrêter)")
+            try:
+                await service.serve_forever(args.host, args.port)
+            except asyncio.CancelledError:
+                print("\nService arrêté")
+            finally:
+                await service.close()
+            return
+
+        # Mode live demandé directement en ligne de commande : pas de menu
+        if args.follow:
+            await live_tail_mode(await get_processor(), args.follow, args.poll_interval, args.idle_timeout)
+            return
 
         # Menu principal
         while True:
@@ -514,19 +1018,22 @@ async def main() -> None:
             print("2. Mode batch (coller le texte) - Pour le traitement de plusieurs affirmations")
             print("3. Mode fichier (lire un .txt) - Pour les tests en masse")
             print("4. Mode par défaut - Avec affirmations prédéfinies")
-            print("5. Quitter")
+            print("5. Mode live (suivre un .vtt/.srt en cours d'écriture)")
+            print("6. Quitter")
 
-            choice = input("\nChoisissez une option (1-5): ").strip()
+            choice = input("\nChoisissez une option (1-6): ").strip()
 
             if choice == "1":
-                await interactive_mode(processor)
+                await interactive_mode(await get_processor())
             elif choice == "2":
-                await batch_mode(processor)
+                await batch_mode(await get_processor(), job_queue)
             elif choice == "3":
-                await file_mode(processor)
+                await file_mode(await get_processor(), job_queue)
             elif choice == "4":
-                await default_mode(processor)
+                await default_mode(await get_processor())
             elif choice == "5":
+                await live_tail_mode(await get_processor(), poll_interval=args.poll_interval, idle_timeout=args.idle_timeout)
+            elif choice == "6":
                 print("Fin du programme")
                 break
             else:
@@ -538,16 +1045,35 @@ async def main() -> None:
         logger.error(f"Erreur critique: {str(e)}", exc_info=True)
         print(f"{COLORS['error']}Erreur critique: {str(e)}{COLORS['reset']}")
         sys.exit(1)
+    finally:
+        # Quitter sans avoir choisi de mode : l'initialisation en cours est abandonnée
+        if not analyzer_task.done():
+            analyzer_task.cancel()
+        elif not analyzer_task.cancelled():
+            analyzer_task.exception()  # Marque une éventuelle erreur d'initialisation comme lue
+        # Les connexions partagées sont liées à la boucle d'événements : on les ferme avant sa fin
+        await close_clients()
+        if job_queue is not None:
+            job_queue.close()
+        # Résultats et historique en cours d'écriture : on attend qu'ils soient sur disque
+        await asyncio.to_thread(get_background_writer().flush)
 
 # =============================================
 # POINT D'ENTRÉE DU SCRIPT
 # =============================================
 
 if __name__ == "__main__":
+    # Options lues avant toute configuration : `--help` répond sans charger la pile d'analyse
+    cli_args = parse_args()
 # Configuration de readline pour une meilleure expérience utilisateur (non-Windows)
     if os.name == 'posix':
+        import readline
         readline.parse_and_bind('tab: complete')
         readline.parse_and_bind('set editing-mode vi')
 
     # Exécution asynchrone de la fonction principale
-    asyncio.run(main())
+    try:
+        asyncio.run(main(cli_args))
+    except KeyboardInterrupt:
+        # Ctrl+C pendant une attente asynchrone (mode service, mode live) : arrêt propre déjà fait par `main`
+        pass
@@ -9,23 +9,25 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from core.fact_checker import fact_check_affirmations
 from core.analyse_critique import fact_checker_batch_async, CritiqueAnalyzer
+from core.evidence import collect_evidence
+from core.client_registry import close_clients
+from core.claim_extraction import split_sentences_fr, extract_claims
+from core.utils import Config
 
-# --- MODULE 1 & 2 : SIMULATION DE L'EXTRACTION NLP ---
-def simuler_extraction_affirmations(texte_source: str) -> List[str]:
+# --- MODULE 1 & 2 : EXTRACTION NLP LOCALE ---
+def extraire_affirmations(texte_source: str, budget: int = Config.CLAIM_BUDGET) -> List[str]:
     """
-    Simule l'étape 1 (NLP) en extrayant des affirmations à vérifier.
-    Normalement, un modèle NLP ferait cette extraction.
+    Étape 1 (NLP) : extrait les affirmations à vérifier du texte source.
+    Le texte est découpé en phrases (règles françaises) puis seules les phrases
+    les plus vérifiables (chiffres, entités, lois, comparatifs) sont gardées.
+    Aucun appel réseau : tout tourne en local.
     """
-    print("\n--- Module 1 & 2 : Extraction NLP (Simulation) ---")
+    print("\n--- Module 1 & 2 : Extraction NLP (locale) ---")
     
-    # Affirmations extraites du texte (simulées)
-    affirmations = [
-        "Le chômage a baissé de 10% depuis 2022.",
-        "L'entreprise Total a investi 5 milliards d'euros en France l'année dernière.",
-        "La dette publique française a dépassé les 120% du PIB en 2025."
-    ]
+    phrases = split_sentences_fr(texte_source)
+    affirmations = extract_claims(phrases, budget=budget)
     
-    print(f"✅ {len(affirmations)} affirmations extraites et prêtes pour le Fact-Checking.")
+    print(f"✅ {len(affirmations)} affirmations extraites sur {len(phrases)} phrases et prêtes pour le Fact-Checking.")
     return affirmations
 
 # ----------------------------------------------------------------------
@@ -49,18 +51,22 @@ async def run_code_citoyen(texte_source: str):
         print("Initialisation du client...")
         analyzer = await CritiqueAnalyzer.create()
         
-        # 2. Extraction (Simulation des Modules 1 & 2)
-        affirmations_a_verifier = simuler_extraction_affirmations(texte_source)
+        # 2. Extraction (Modules 1 & 2)
+        affirmations_a_verifier = extraire_affirmations(texte_source)
         await asyncio.sleep(1)
     
         # 3. Fact-Checking (Module 4) - Recherche Google
         # Cette fonction n'est pas asynchrone, mais pourrait l'être
         resultats_fact_checker = fact_check_affirmations(affirmations_a_verifier)
+
+        # 3 bis. Téléchargement des pages et extraction des passages pertinents (en parallèle)
+        resultats_fact_checker = await collect_evidence(resultats_fact_checker)
         await asyncio.sleep(1)
     
         # 4. Analyse Critique par l'IA (Module 5)
-        # On utilise la fonction de batch de `analyse_critique.py`
-        rapports_finaux = await fact_checker_batch_async(analyzer, affirmations_a_verifier)
+        # On utilise la fonction de batch de `analyse_critique.py` : chaque affirmation
+        # porte ses passages de preuves, injectés dans la Phase 2
+        rapports_finaux = await fact_checker_batch_async(analyzer, resultats_fact_checker)
         await asyncio.sleep(1)
     
         # 5. Affichage du Rapport Final
@@ -83,11 +89,13 @@ async def run_code_citoyen(texte_source: str):
         print("#"*70)
     except Exception as e:
         print(f"Une erreur est survenue dans l'orchestrateur principal: {e}")
+    finally:
+        await close_clients()
 
 
 # --- EXÉCUTION ---
 if __name__ == '__main__':
-    # Le texte source que l'on veut analyser (contient les affirmations simulées)
+    # Le texte source que l'on veut analyser
     TEXTE_ARTICLE_SIMULE = """
     Un article prétend que le chômage a baissé de 10% depuis 2022. 
     Il affirme également que l'entreprise Total a investi 5 milliards d'euros en France l'année dernière. 
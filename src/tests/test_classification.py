@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests de la lecture de la catégorie de la Phase 1 (core/analyse_critique.py).
+
+Lancer depuis la racine du dépôt ou depuis src/ : python -m pytest -q tests/test_classification.py
+"""
+
+import asyncio
+
+import pytest
+
+from core.analyse_critique import match_category, parse_category
+from benchmarks.mock_llm import build_mock_analyzer
+
+CLAIM = "Le taux de chômage est de 7 % en France."
+
+@pytest.mark.parametrize("raw", [
+    '{"category": "STATISTIQUE"}',
+    '```json\n{"category": "STATISTIQUE"}\n```',
+    "[STATISTIQUE]",
+    "RÉPONSE UNIQUE : [ statistique ]",
+])
+def test_parse_category_exact(raw):
+    assert parse_category(raw, CLAIM) == ("STATISTIQUE", "exact")
+
+@pytest.mark.parametrize("raw, expected", [
+    ('{"category": "Santé"}', "CONSENSUS_SCIENCE"),            # alias, accent retiré
+    ('{"category": "juridiqué"}', "JURIDIQUE"),                # accent parasite
+    ("[NON_VERIFIABE]", "NON_VERIFIABLE"),                     # faute de frappe
+    ("[Consensus historique]", "CONSENSUS_HISTO"),             # alias à plusieurs mots
+    ("Catégorie : LOGIQUE.", "LOGIQUE"),                       # catégorie citée dans une phrase
+])
+def test_parse_category_fuzzy(raw, expected):
+    assert parse_category(raw, CLAIM) == (expected, "fuzzy")
+
+def test_parse_category_local_fallback():
+    assert parse_category('{"category": "XYZ"}', CLAIM) == ("STATISTIQUE", "fallback")
+    assert parse_category("", "Bonjour à tous !") == ("POLITESSE", "fallback")
+
+def test_match_category_unknown_label():
+    assert match_category("banane") is None
+    assert match_category("") is None
+
+@pytest.mark.parametrize("constrained, expected_raw", [
+    (True, '{"category": "STATISTIQUE"}'),
+    (False, "[STATISTIQUE]"),
+])
+def test_classification_with_mock_client(constrained, expected_raw):
+    analyzer = build_mock_analyzer(0.0, 2)
+    analyzer.constrained_classification = constrained
+    raw_responses = []
+    complete = analyzer.client.chat.complete_async
+
+    async def recording_complete(**kwargs):
+        response = await complete(**kwargs)
+        raw_responses.append(response.choices[0].message.content)
+        return response
+
+    analyzer.client.chat.complete_async = recording_complete
+    result = asyncio.run(analyzer.analyze(CLAIM))
+    assert raw_responses[0] == expected_raw
+    assert result["category"] == "STATISTIQUE"
+    assert analyzer.classification_stats == {"exact": 1, "fuzzy": 0, "fallback": 0}
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests du module de preuves web (core/evidence.py).
+
+Les pages sont servies par un serveur `http.server` local : aucun accès réseau.
+Lancer depuis src/ : python -m pytest -q tests/test_evidence.py
+"""
+
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from core.utils import Config
+from core.context_window import estimate_tokens
+from core.client_registry import build_async_http_client
+from core.evidence import EvidenceFetcher, extract_blocks, select_passages
+
+ARTICLE = (
+    "<html><head><title>Article</title><script>var x = 'script ignoré';</script></head><body>"
+    "<nav><p>Accueil Politique Économie Culture Sport Météo Contact Abonnement</p></nav>"
+    "<header><p>Le journal de référence depuis 1944, abonnez-vous dès maintenant en ligne</p></header>"
+    "<article><h1>Chômage</h1>"
+    "<p>Selon l'INSEE, le taux de chômage en France a baissé de 2,5 points depuis 2017.</p>"
+    "<p>Cette baisse concerne surtout les jeunes de moins de vingt-cinq ans et les seniors.</p>"
+    "</article>"
+    "<footer><p>Mentions légales, politique de confidentialité, gestion des cookies et plan du site</p></footer>"
+    "</body></html>"
+)
+BIG_PAGE_BYTES = 1_000_000
+
+# =============================================
+# SERVEUR DE PAGES DE TEST
+# =============================================
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    """Sert les pages de test et compte les requêtes simultanées sur /slow."""
+
+    active = 0
+    max_active = 0
+    lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass  # Pas de journal HTTP dans la sortie des tests
+
+    def _send(self, status, body, content_type="text/html; charset=utf-8", headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/article":
+            self._send(200, ARTICLE.encode("utf-8"))
+        elif self.path == "/redirect":
+            self._send(302, b"", headers={"Location": "/article"})
+        elif self.path == "/data.json":
+            self._send(200, b'{"chomage": 7.3}', content_type="application/json")
+        elif self.path == "/big":
+            self._send(200, b"<p>" + b"a" * BIG_PAGE_BYTES + b"</p>")
+        elif self.path.startswith("/slow"):
+            cls = type(self)
+            with cls.lock:
+                cls.active += 1
+                cls.max_active = max(cls.max_active, cls.active)
+            time.sleep(0.2)
+            with cls.lock:
+                cls.active -= 1
+            self._send(200, ARTICLE.encode("utf-8"))
+        else:
+            self._send(404, b"<p>introuvable</p>")
+
+@pytest.fixture(scope="module")
+def port():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FixtureHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server.server_address[1]
+    server.shutdown()
+    server.server_close()
+
+def _fetch_all(urls, per_domain=Config.EVIDENCE_PER_DOMAIN):
+    """Télécharge les URLs avec un client neuf (mêmes réglages que le client partagé)."""
+    async def run():
+        async with build_async_http_client(timeout=Config.EVIDENCE_FETCH_TIMEOUT, follow_redirects=True) as client:
+            fetcher = EvidenceFetcher(client=client, per_domain=per_domain)
+            pages = await asyncio.gather(*(fetcher.fetch(url) for url in urls))
+            return pages, fetcher.stats
+    return asyncio.run(run())
+
+# =============================================
+# TÉLÉCHARGEMENT
+# =============================================
+
+def test_fetch_follows_redirect(port):
+    (page,), stats = _fetch_all([f"http://127.0.0.1:{port}/redirect"])
+    assert page is not None and "taux de chômage" in page
+    assert stats == {"fetched": 1, "failed": 0}
+
+def test_fetch_404_returns_none(port):
+    (page,), stats = _fetch_all([f"http://127.0.0.1:{port}/absente"])
+    assert page is None
+    assert stats == {"fetched": 0, "failed": 1}
+
+def test_fetch_non_html_returns_none(port):
+    (page,), stats = _fetch_all([f"http://127.0.0.1:{port}/data.json"])
+    assert page is None
+    assert stats["failed"] == 1
+
+def test_fetch_stops_at_max_bytes(port, monkeypatch):
+    monkeypatch.setattr(Config, "EVIDENCE_MAX_BYTES", 1000)
+    (page,), stats = _fetch_all([f"http://127.0.0.1:{port}/big"])
+    assert page is not None and page.startswith("<p>aaa")
+    assert len(page) < BIG_PAGE_BYTES
+    assert stats["fetched"] == 1
+
+def test_fetch_limits_concurrency_per_domain(port):
+    _FixtureHandler.max_active = 0
+    _fetch_all([f"http://127.0.0.1:{port}/slow{i}" for i in range(6)], per_domain=2)
+    assert _FixtureHandler.max_active == 2
+
+    # "localhost" et "127.0.0.1" sont deux domaines distincts : chacun a sa propre limite
+    _FixtureHandler.max_active = 0
+    _fetch_all(
+        [f"http://127.0.0.1:{port}/slow{i}" for i in range(3)] + [f"http://localhost:{port}/slow{i}" for i in range(3)],
+        per_domain=1,
+    )
+    assert _FixtureHandler.max_active == 2
+
+# =============================================
+# EXTRACTION ET SÉLECTION
+# =============================================
+
+def test_extract_blocks_strips_boilerplate():
+    blocks = extract_blocks(ARTICLE)
+    assert blocks == [
+        "Selon l'INSEE, le taux de chômage en France a baissé de 2,5 points depuis 2017.",
+        "Cette baisse concerne surtout les jeunes de moins de vingt-cinq ans et les seniors.",
+    ]
+
+def test_select_passages_respects_token_budget():
+    claim = "Le taux de chômage en France a baissé depuis 2017 selon l'INSEE"
+    blocks = [f"Le taux de chômage en France a baissé depuis 2017, note {i} de l'INSEE sur l'emploi." * 3 for i in range(20)]
+    documents = [{"url": "http://exemple.fr/a", "blocks": blocks}]
+    budget = 3 * estimate_tokens(blocks[0]) + 5
+
+    passages = select_passages(claim, documents, token_budget=budget)
+    assert len(passages) == 3
+    assert sum(estimate_tokens(p["text"]) for p in passages) <= budget
+    assert select_passages(claim, documents, token_budget=0) == []
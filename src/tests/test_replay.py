@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Tests de l'enregistrement et du rejeu des appels API (core/replay.py).
+
+Le lot est enregistré avec le client simulé des benchmarks, puis rejoué depuis la cassette.
+Lancer depuis src/ : python -m pytest -q tests/test_replay.py
+"""
+
+import asyncio
+import functools
+
+import pytest
+
+import live_fact_checker
+from core.history_store import HistoryStore
+from core.replay import Cassette, RecordingMistralClient, ReplayMistralClient, ReplayMiss
+from benchmarks.mock_llm import MockMistralClient
+from benchmarks.replay_batch import run_batch
+
+CLAIMS = live_fact_checker.DEFAULT_AFFIRMATIONS[:4]
+
+@pytest.fixture
+def recorded(tmp_path, monkeypatch):
+    """Cassette d'un petit lot analysé par le client simulé, et les résultats obtenus."""
+    # Historique dans le dossier temporaire : le test ne touche pas aux données du dépôt
+    monkeypatch.setattr(live_fact_checker, "HistoryStore", functools.partial(HistoryStore, tmp_path / "history.db"))
+    monkeypatch.setattr(live_fact_checker, "result_dir", tmp_path)
+    cassette = Cassette(tmp_path / "cassette.json")
+    run = asyncio.run(run_batch(RecordingMistralClient(MockMistralClient(latency_s=0.0), cassette), CLAIMS, 2))
+    cassette.save()
+    return cassette.path, run["results"]
+
+def test_replay_reproduces_recorded_results(recorded):
+    path, expected = recorded
+    assert [r["status"] for r in expected] == ["success"] * len(CLAIMS)
+
+    cassette = Cassette.load(path)
+    run = asyncio.run(run_batch(ReplayMistralClient(cassette), CLAIMS, 2))
+    assert run["results"] == expected
+    assert cassette.stats["missed"] == 0
+    assert cassette.stats["replayed"] > 0
+
+def test_replay_misses_changed_prompt(recorded):
+    path, _ = recorded
+    client = ReplayMistralClient(Cassette.load(path))
+    messages = [{"role": "user", "content": "Prompt modifié depuis l'enregistrement"}]
+    with pytest.raises(ReplayMiss):
+        asyncio.run(client.chat.complete_async(model=live_fact_checker.Config.DEFAULT_MODEL, messages=messages))
+
+def test_replayed_batch_reports_changed_claim_as_error(recorded):
+    path, _ = recorded
+    cassette = Cassette.load(path)
+    changed = [CLAIMS[0] + " (modifiée)"] + CLAIMS[1:]
+    run = asyncio.run(run_batch(ReplayMistralClient(cassette), changed, 2))
+    assert run["results"][0]["status"] == "error"
+    assert cassette.stats["missed"] >= 1
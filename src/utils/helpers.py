@@ -2,6 +2,10 @@
 import re
 from typing import Any
 
+# Motif précompilé (même règle que core.text_normalization, sans dépendre du paquet core :
+# ce module reste importable depuis la racine du dépôt comme depuis src/)
+SPECIAL_CHARS_PATTERN = re.compile(r'[^\w\s.,;:!?\'"-]')
+
 def clean_text(text: str) -> str:
     """
     Nettoie un texte en supprimant les espaces superflus et les caractères spéciaux
@@ -15,13 +19,8 @@ def clean_text(text: str) -> str:
     if not text:
         return ""
 
-    # Suppression des espaces superflus
-    text = ' '.join(text.split())
-
-    # Suppression des caractères spéciaux (sauf ponctuation de base)
-    text = re.sub(r'[^\w\s.,;:!?\'"-]', '', text)
-
-    return text.strip()
+    # Suppression des espaces superflus, puis des caractères spéciaux (sauf ponctuation de base)
+    return SPECIAL_CHARS_PATTERN.sub('', ' '.join(text.split())).strip()
 
 def validate_text(text: str) -> bool:
     """